@@ -0,0 +1,5 @@
+import sys
+
+from mkdocs_editor_notes.cli import main
+
+sys.exit(main())
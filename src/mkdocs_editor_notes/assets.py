@@ -0,0 +1,31 @@
+"""Client-side stylesheet and script, emitted once per site under content-hashed names."""
+
+from functools import cache
+from pathlib import Path
+from typing import NamedTuple
+
+from mkdocs_editor_notes.cache import hash_text
+
+STATIC_DIR = Path(__file__).parent / "static"
+ASSET_HASH_LENGTH = 8
+
+
+class ClientAsset(NamedTuple):
+    """A static file and the site path it is emitted at, which changes whenever its content does."""
+
+    path: str
+    content: str
+
+
+def hashed_name(name: str, content: str) -> str:
+    """Insert a short content hash before the extension, so browsers can cache the file for as long as it exists."""
+    stem, _, suffix = name.rpartition(".")
+    return f"{stem}.{hash_text(content)[:ASSET_HASH_LENGTH]}.{suffix}"
+
+
+@cache
+def client_assets() -> tuple[ClientAsset, ClientAsset]:
+    """Load the stylesheet and the script, read from the package once per process."""
+    css = (STATIC_DIR / "editor-notes.css").read_text()
+    js = (STATIC_DIR / "editor-notes.js").read_text()
+    return ClientAsset(hashed_name("editor-notes.css", css), css), ClientAsset(hashed_name("editor-notes.js", js), js)
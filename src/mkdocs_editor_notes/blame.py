@@ -0,0 +1,210 @@
+"""Batched `git blame` of note definitions, cached by blob hash.
+
+Each source file that defines notes is blamed once with `git blame --porcelain`, and the files are blamed concurrently
+on a thread pool since the work happens in `git` subprocesses. The author of the line that starts each definition is
+recorded. Results for files whose content matches `HEAD` are cached under the file's git blob hash, so an unchanged file
+is never blamed again. Files with uncommitted changes are always blamed fresh, and their uncommitted definitions are
+left without an author.
+"""
+
+import hashlib
+import subprocess
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from mkdocs.plugins import get_plugin_logger
+
+from mkdocs_editor_notes.cache import dump_json, load_json
+from mkdocs_editor_notes.stream import iter_definitions
+
+log = get_plugin_logger(__name__)
+
+
+class BlameError(RuntimeError):
+    """Raised when git is unavailable or the sources are not inside a git work tree."""
+
+
+@dataclass(frozen=True)
+class BlameInfo:
+    author: str
+    author_time: int
+    commit: str
+
+
+FileBlame = dict[str, BlameInfo]
+# A file's blame as cached in JSON: note key to author, author time and commit
+CachedBlame = dict[str, list[str | int]]
+
+
+def run_git(args: list[str], cwd: Path) -> str:
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    except FileNotFoundError as err:
+        raise BlameError("git is not installed") from err
+    except subprocess.CalledProcessError as err:
+        raise BlameError(err.stderr.strip() or f"git {args[0]} failed") from err
+    return result.stdout
+
+
+def find_repo_root(path: Path) -> Path:
+    return Path(run_git(["rev-parse", "--show-toplevel"], cwd=path).strip())
+
+
+def head_blobs(repo_root: Path) -> dict[str, str]:
+    """Map each file tracked at `HEAD` (as a repo-relative posix path) to its blob hash, with a single git call."""
+    try:
+        listing = run_git(["ls-tree", "-r", "-z", "HEAD"], cwd=repo_root)
+    except BlameError:
+        # A repository without any commits yet
+        return {}
+    blobs: dict[str, str] = {}
+    for entry in listing.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        blobs[path] = meta.split()[2]
+    return blobs
+
+
+def blob_hash(data: bytes, algorithm: str = "sha1") -> str:
+    """Compute the hash git gives a blob with this content."""
+    return hashlib.new(algorithm, b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def parse_porcelain(output: str) -> FileBlame:
+    """Extract the blame of each note definition line from `git blame --porcelain` output.
+
+    The file is put back together from the blamed lines and scanned like a page, so lines that only look like
+    definitions inside fenced code are left out. Definitions on lines that are not committed yet have no author, so they
+    are left out too.
+
+    Returns:
+        Map of note key (`type:label`) to the blame of the line that starts its definition
+    """
+    commits: dict[str, dict[str, str]] = {}
+    lines: list[str] = []
+    line_commits: list[str] = []
+    commit = ""
+    for line in output.splitlines():
+        if line.startswith("\t"):
+            lines.append(line[1:])
+            line_commits.append(commit)
+            continue
+        field, _, value = line.partition(" ")
+        if len(field) in (40, 64) and value[:1].isdigit():
+            commit = field
+            commits.setdefault(commit, {})
+        elif field in ("author", "author-time"):
+            commits[commit][field] = value
+
+    blame: FileBlame = {}
+    for definition in iter_definitions(["\n".join(lines)]):
+        commit = line_commits[definition.line_number - 1]
+        if not commit.strip("0"):
+            continue
+        meta = commits[commit]
+        info = BlameInfo(author=meta["author"], author_time=int(meta["author-time"]), commit=commit)
+        blame.setdefault(f"{definition.note_type}:{definition.label}", info)
+    return blame
+
+
+def blame_file(repo_root: Path, relative_path: str) -> FileBlame:
+    try:
+        return parse_porcelain(run_git(["blame", "--porcelain", "--", relative_path], cwd=repo_root))
+    except BlameError as err:
+        log.debug(f"Could not blame {relative_path}: {err}")
+        return {}
+
+
+def group_by_repository(paths: list[Path]) -> dict[Path, dict[Path, str]]:
+    """Map the root of each git work tree to the files inside it, by their repo-relative posix path.
+
+    The root is looked up once per directory, so docs spread over several work trees (a vendored or symlinked docs
+    directory, for example) are each blamed in their own repository. Files outside any work tree are skipped with a
+    warning.
+
+    Raises:
+        BlameError: If none of the files is inside a git work tree, or git is unavailable
+    """
+    roots: dict[Path, Path | BlameError] = {}
+    repositories: dict[Path, dict[Path, str]] = {}
+    skipped: list[tuple[Path, BlameError]] = []
+    for path in paths:
+        if path.parent not in roots:
+            try:
+                roots[path.parent] = find_repo_root(path.parent).resolve()
+            except BlameError as err:
+                roots[path.parent] = err
+        root = roots[path.parent]
+        if isinstance(root, BlameError):
+            skipped.append((path, root))
+            continue
+        try:
+            repositories.setdefault(root, {})[path] = path.relative_to(root).as_posix()
+        except ValueError:
+            skipped.append((path, BlameError(f"{path} is not inside the git work tree at {root}")))
+
+    if skipped and not repositories:
+        raise skipped[0][1]
+    for path, reason in skipped:
+        log.warning(f"Skipping git blame for editor notes in {path}: {reason}")
+    return repositories
+
+
+def blame_definitions(
+    paths: Iterable[Path], cache_path: Path | None = None, max_workers: int | None = None
+) -> dict[Path, FileBlame]:
+    """Blame the note definitions in each file, reusing cached results for files that match `HEAD`.
+
+    Args:
+        paths: Source files that define notes, in one or more git work trees
+        cache_path: JSON file holding results by blob hash; entries not used in this call are dropped when it is saved
+        max_workers: Number of files blamed concurrently (defaults to the thread pool default)
+
+    Returns:
+        Map of each file to the blame of every note definition in it, leaving out files outside any git work tree
+
+    Raises:
+        BlameError: If git is unavailable or none of the files is in a git work tree
+    """
+    paths = sorted({path.resolve() for path in paths})
+    if not paths:
+        return {}
+
+    repositories = group_by_repository(paths)
+    cache: dict[str, CachedBlame] = load_json(cache_path, {}) if cache_path is not None else {}
+
+    results: dict[Path, FileBlame] = {}
+    used: dict[str, CachedBlame] = {}
+    pending: dict[Path, tuple[Path, str, str | None]] = {}
+    for repo_root, files in repositories.items():
+        committed = head_blobs(repo_root)
+        algorithm = "sha256" if any(len(blob) == 64 for blob in committed.values()) else "sha1"
+        for path, relative_path in files.items():
+            blob = blob_hash(path.read_bytes(), algorithm)
+            clean_blob = blob if committed.get(relative_path) == blob else None
+            if clean_blob is not None and clean_blob in cache:
+                used[clean_blob] = cache[clean_blob]
+                results[path] = {
+                    key: BlameInfo(str(author), int(author_time), str(commit))
+                    for key, (author, author_time, commit) in cache[clean_blob].items()
+                }
+            else:
+                pending[path] = (repo_root, relative_path, clean_blob)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        targets = list(pending.values())
+        blamed = executor.map(blame_file, [root for root, _, _ in targets], [relative for _, relative, _ in targets])
+        for (path, (_, _, clean_blob)), file_blame in zip(pending.items(), blamed):
+            results[path] = file_blame
+            if clean_blob is not None:
+                used[clean_blob] = {
+                    key: [info.author, info.author_time, info.commit] for key, info in file_blame.items()
+                }
+
+    if cache_path is not None:
+        dump_json(cache_path, used)
+    log.debug(f"Blamed {len(pending)} of {len(paths)} files with editor notes")
+    return results
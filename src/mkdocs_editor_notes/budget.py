@@ -0,0 +1,98 @@
+"""Per-page time budget for the regex engine, so one pathological page cannot stall the whole build."""
+
+import signal
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from enum import StrEnum, auto
+from types import FrameType
+
+
+class PageStage(StrEnum):
+    """Stages of `EditorNotesManager.process_page_markdown`, in order."""
+
+    CODE_BLOCKS = auto()
+    DEFINITIONS = auto()
+    REFERENCES = auto()
+    RESTORE = auto()
+
+
+class PageBudgetExceeded(Exception):
+    """Raised when a page goes over its time budget in a stage that can still be abandoned."""
+
+    stage: PageStage
+    elapsed: float
+
+    def __init__(self, stage: PageStage, elapsed: float):
+        super().__init__(f"Page went over its time budget in the {stage} stage after {elapsed:.2f}s")
+        self.stage = stage
+        self.elapsed = elapsed
+
+
+def can_interrupt() -> bool:
+    """Tell whether a running stage can be cut short: interval timers only exist on Unix, for the main thread."""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+class PageTimer:
+    """Times the stages of one page against a budget in seconds, or only times them if the budget is 0.
+
+    Interruptible stages only compute, so they can be abandoned: one that runs out of budget is cut short with a
+    `SIGALRM`, which the regex engine checks for even in the middle of a match. Where interval timers are not
+    available, the overrun is detected when the stage returns. Stages that record notes always run to completion and
+    are only timed.
+    """
+
+    budget: float
+    stages: dict[PageStage, float]
+    started: float
+
+    def __init__(self, budget: float = 0):
+        self.budget = budget
+        self.stages = {}
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def exceeded(self) -> bool:
+        return bool(self.budget) and self.elapsed > self.budget
+
+    @property
+    def slowest(self) -> PageStage | None:
+        return max(self.stages, key=lambda stage: self.stages[stage], default=None)
+
+    @contextmanager
+    def stage(self, stage: PageStage, interruptible: bool = False) -> Generator[None, None, None]:
+        """Time a stage, raising `PageBudgetExceeded` if it is interruptible and the page runs out of budget."""
+        interruptible = interruptible and bool(self.budget)
+        if interruptible and self.exceeded:
+            raise PageBudgetExceeded(stage, self.elapsed)
+
+        alarm = interruptible and can_interrupt()
+        previous_handler = None
+        if alarm:
+
+            def on_alarm(_signum: int, _frame: FrameType | None) -> None:
+                raise PageBudgetExceeded(stage, self.elapsed)
+
+            previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.budget - self.elapsed)
+
+        stage_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            try:
+                if alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            finally:
+                if alarm:
+                    signal.signal(signal.SIGALRM, previous_handler)
+                self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - stage_started
+
+        if interruptible and self.exceeded:
+            raise PageBudgetExceeded(stage, self.elapsed)
@@ -0,0 +1,85 @@
+"""Helpers for content hashing and the small JSON files kept in the plugin cache directory."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_file(path: Path) -> str:
+    return hash_bytes(path.read_bytes())
+
+
+def load_json(path: Path, default: Any) -> Any:
+    """Load a JSON cache file, falling back to the default if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def dump_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, separators=(",", ":"), sort_keys=True))
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write the data unless the file already holds exactly this content, leaving its modification time alone.
+
+    Returns:
+        True if the file was written
+    """
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+class OutputManifest:
+    """Content hash and modification time of each generated file, carried from one build to the next.
+
+    MkDocs rewrites every output file on each build (and a clean build deletes them first), which makes deploy sync
+    tools and CDNs treat them as changed. Settling a file after it is written restores the modification time it had in
+    the previous build when its content hash is unchanged, so only files whose content really changed look new.
+    """
+
+    path: Path
+    previous: dict[str, dict[str, Any]]
+    current: dict[str, dict[str, Any]]
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.previous = load_json(path, {})
+        self.current = {}
+
+    def settle(self, path: Path, key: str) -> bool:
+        """Record a generated file, restoring its previous modification time if its content is unchanged.
+
+        Args:
+            path: The generated file
+            key: Stable name for the file in the manifest, such as its path relative to the site directory
+
+        Returns:
+            True if the content changed since the previous build (or the file is new)
+        """
+        content_hash = hash_file(path)
+        previous = self.previous.get(key)
+        changed = previous is None or previous["hash"] != content_hash
+        if previous is not None and not changed:
+            os.utime(path, ns=(previous["mtime_ns"], previous["mtime_ns"]))
+        self.current[key] = dict(hash=content_hash, mtime_ns=path.stat().st_mtime_ns)
+        return changed
+
+    def save(self) -> None:
+        """Persist the manifest with only the files recorded in this build."""
+        dump_json(self.path, self.current)
@@ -0,0 +1,103 @@
+"""Command line tools for working with editor notes and note shards outside of an MkDocs build."""
+
+import argparse
+import sys
+from pathlib import Path
+
+from mkdocs_editor_notes.constants import DEFAULT_CUSTOM_EMOJI, FIXED_NOTE_TYPES
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.shard import merge_shards, write_shard
+from mkdocs_editor_notes.stream import iter_definitions, iter_file_chunks
+
+
+def get_emoji(note_type: str) -> str:
+    return FIXED_NOTE_TYPES.get(note_type, DEFAULT_CUSTOM_EMOJI)
+
+
+def merge(args: argparse.Namespace) -> int:
+    result = merge_shards(args.shards)
+
+    for key, shard_names in result.duplicates.items():
+        print(f"Duplicate note key '{key}' in shards: {', '.join(shard_names)}", file=sys.stderr)
+
+    if args.shard is not None:
+        write_shard(args.shard, args.name, result.notes)
+
+    manager = EditorNotesManager()
+    for note in result.notes:
+        manager.add(note)
+    markdown = manager.build_aggregator_markdown(get_emoji)
+
+    if args.output is None:
+        print(markdown)
+    else:
+        args.output.write_text(markdown)
+
+    return 1 if args.strict and result.duplicates else 0
+
+
+def scan_notes(docs_dir: Path, use_directory_urls: bool = True) -> list[EditorNote]:
+    """Collect the note definitions from every markdown file under a docs directory.
+
+    Each file is scanned from a memory map by the streaming engine, so even very large pages are never read whole.
+    """
+    from mkdocs.structure.files import File
+
+    notes: list[EditorNote] = []
+    for path in sorted(docs_dir.rglob("*.md")):
+        src_uri = path.relative_to(docs_dir).as_posix()
+        url = File(src_uri, str(docs_dir), "", use_directory_urls).url
+        for definition in iter_definitions(iter_file_chunks(path)):
+            notes.append(
+                EditorNote(
+                    note_type=definition.note_type,
+                    label=definition.label,
+                    text=definition.text,
+                    source_page=Path(src_uri),
+                    source_url=url,
+                )
+            )
+    return notes
+
+
+def scan(args: argparse.Namespace) -> int:
+    notes = scan_notes(args.docs_dir, use_directory_urls=not args.no_directory_urls)
+
+    if args.shard is not None:
+        write_shard(args.shard, args.name or args.docs_dir.name, notes, prefix=args.prefix)
+
+    for note in notes:
+        print(f"{note.source_page.as_posix()}: [^{note.note_type}:{note.label}]")
+
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mkdocs-editor-notes", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge note shards into one combined aggregator page")
+    merge_parser.add_argument("shards", nargs="+", type=Path, help="Shard files written with the emit_shard option")
+    merge_parser.add_argument("-o", "--output", type=Path, help="Write the aggregator markdown here instead of stdout")
+    merge_parser.add_argument("--shard", type=Path, help="Also write the merged notes as a single combined shard")
+    merge_parser.add_argument("--name", default="merged", help="Name of the combined shard")
+    merge_parser.add_argument("--strict", action="store_true", help="Exit with an error if any key is duplicated")
+    merge_parser.set_defaults(handler=merge)
+
+    scan_parser = subparsers.add_parser("scan", help="Scan a docs directory for note definitions without building it")
+    scan_parser.add_argument("docs_dir", type=Path, help="The MkDocs docs directory to scan")
+    scan_parser.add_argument("--shard", type=Path, help="Write the notes found as a shard file")
+    scan_parser.add_argument("--name", help="Name of the shard (defaults to the docs directory name)")
+    scan_parser.add_argument("--prefix", default="", help="Sub-path prepended to each note's source page and URL")
+    scan_parser.add_argument(
+        "--no-directory-urls", action="store_true", help="Build note links for a site with use_directory_urls off"
+    )
+    scan_parser.set_defaults(handler=scan)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
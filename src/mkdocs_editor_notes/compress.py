@@ -0,0 +1,101 @@
+"""Pre-compression of the files emitted by the plugin for static hosts that serve precompressed siblings."""
+
+import gzip
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import ModuleType
+
+from mkdocs.plugins import get_plugin_logger
+
+from mkdocs_editor_notes.cache import dump_json, hash_file, load_json
+
+log = get_plugin_logger(__name__)
+
+
+def import_brotli() -> ModuleType | None:
+    """Import the brotli bindings, or their cffi port, whichever is installed first."""
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+brotli = import_brotli()
+
+
+def sibling_suffixes() -> list[str]:
+    """List the compressed sibling suffixes that can be produced in this environment."""
+    return [".gz", ".br"] if brotli is not None else [".gz"]
+
+
+def compress_file(path: str) -> list[str]:
+    """Write compressed siblings next to a file.
+
+    This is a module-level function so it can be sent to worker processes.
+
+    Args:
+        path: Absolute path of the file to compress
+
+    Returns:
+        Paths of the compressed siblings that were written
+    """
+    data = Path(path).read_bytes()
+    written: list[str] = []
+
+    gz_path = f"{path}.gz"
+    Path(gz_path).write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    if brotli is not None:
+        br_path = f"{path}.br"
+        Path(br_path).write_bytes(brotli.compress(data))
+        written.append(br_path)
+
+    return written
+
+
+def precompress(paths: list[Path], manifest_path: Path, max_workers: int | None = None) -> list[Path]:
+    """Compress the given files across a process pool, skipping any that are unchanged since the last build.
+
+    A file is skipped when its content hash matches the one recorded in the manifest and all of its compressed siblings
+    still exist (a clean build wipes them, so they must be rewritten even when the content is unchanged).
+
+    Args:
+        paths: Files to compress
+        manifest_path: JSON file recording the content hash of each file at its last compression
+        max_workers: Upper bound on the number of worker processes
+
+    Returns:
+        The files that were compressed
+    """
+    manifest: dict[str, str] = load_json(manifest_path, {})
+    suffixes = sibling_suffixes()
+    pending: list[Path] = []
+
+    for path in paths:
+        if not path.exists():
+            continue
+        content_hash = hash_file(path)
+        siblings_exist = all(path.with_name(f"{path.name}{suffix}").exists() for suffix in suffixes)
+        if manifest.get(str(path)) == content_hash and siblings_exist:
+            continue
+        manifest[str(path)] = content_hash
+        pending.append(path)
+
+    workers = min(len(pending), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(compress_file, [str(path) for path in pending]))
+    else:
+        for path in pending:
+            compress_file(str(path))
+
+    if pending:
+        log.info(f"Pre-compressed {len(pending)} of {len(paths)} editor notes output files")
+
+    dump_json(manifest_path, manifest)
+    return pending
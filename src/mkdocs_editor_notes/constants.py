@@ -1,4 +1,5 @@
 import re
+from enum import StrEnum, auto
 
 FIXED_NOTE_TYPES = {
     "todo": "✅",
@@ -9,6 +10,9 @@ FIXED_NOTE_TYPES = {
 
 DEFAULT_CUSTOM_EMOJI = "❗"
 
+AGGREGATOR_INTRO = "# Editor Notes\n\nThis page aggregates all editor notes found throughout the documentation."
+CHANGES_HEADING = "## Changes since the previous build"
+
 
 # Matches: [^type:label]: note text (can span multiple lines)
 NOTE_DEF_PATTERN = re.compile(
@@ -42,4 +46,39 @@ NOTE_REF_PATTERN = re.compile(
 )
 
 
+# Matches either a note definition (exactly as NOTE_DEF_PATTERN) or a reference, for removing both in one pass
+NOTE_STRIP_PATTERN = re.compile(
+    r"""
+    ^\[\^[a-z]+:[a-z0-9\-_]+\]:\s*.*?(?=\n\s*\n|\n\[\^|\Z)    # Definition
+    |\[\^[a-z]+:[a-z0-9\-_]+\]                                  # Reference
+    """,
+    re.MULTILINE | re.DOTALL | re.VERBOSE,
+)
+
+
 CODE_BLOCK_PATTERN = re.compile(r"(```[\s\S]*?```|~~~[\s\S]*?~~~)", re.MULTILINE)
+
+
+# Words indexed for client-side filtering on the aggregator page
+SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+SEARCH_INDEX_FILE = "editor-notes-index.json"
+
+# Rendered note text fetched by the markers on first hover
+NOTE_PREVIEWS_FILE = "editor-notes-previews.json"
+
+# Notes added, edited and resolved since the previous build
+NOTE_CHANGES_FILE = "editor-notes-changes.json"
+
+# Characters read at a time by the streaming engine
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Comma separated profile modes (or `all`) to capture on top of the `profile` option
+PROFILE_ENV_VAR = "EDITOR_NOTES_PROFILE"
+
+
+class ProfileMode(StrEnum):
+    """Kinds of measurement that can be captured around each hook."""
+
+    CPROFILE = auto()
+    TRACEMALLOC = auto()
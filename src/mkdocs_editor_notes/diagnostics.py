@@ -0,0 +1,78 @@
+"""Build-wide collection of note problems, reported together once every page has been processed."""
+
+from dataclasses import dataclass, field
+from typing import override
+
+
+@dataclass(frozen=True, slots=True)
+class NoteLocation:
+    """Where a note was defined or referenced: a source page (or shard name) and an optional line number."""
+
+    page: str
+    line: int | None = None
+
+    @override
+    def __str__(self) -> str:
+        return self.page if self.line is None else f"{self.page}:{self.line}"
+
+
+@dataclass
+class NoteDiagnostics:
+    """Indexes of note definitions and references by note key.
+
+    Attributes:
+        definitions: Where each note key was first defined on a page of this build
+        referenced: Every note key that was referenced anywhere
+        undefined: References to keys that were not defined when the referencing page was processed
+        duplicates: Every definition of each key that was defined more than once (the first one wins)
+    """
+
+    definitions: dict[str, NoteLocation] = field(default_factory=dict)
+    referenced: set[str] = field(default_factory=set)
+    undefined: dict[str, list[NoteLocation]] = field(default_factory=dict)
+    duplicates: dict[str, list[NoteLocation]] = field(default_factory=dict)
+
+    def add_definition(self, key: str, location: NoteLocation) -> None:
+        self.definitions.setdefault(key, location)
+
+    def add_duplicate(self, key: str, first: NoteLocation, location: NoteLocation) -> None:
+        self.duplicates.setdefault(key, [first]).append(location)
+
+    def add_reference(self, key: str, location: NoteLocation, defined: bool) -> None:
+        self.referenced.add(key)
+        if not defined:
+            self.undefined.setdefault(key, []).append(location)
+
+    @property
+    def unused(self) -> list[str]:
+        """Keys defined on a page of this build but never referenced."""
+        return sorted(self.definitions.keys() - self.referenced)
+
+    @property
+    def problem_count(self) -> int:
+        return len(self.undefined) + len(self.unused) + len(self.duplicates)
+
+    @property
+    def warning_count(self) -> int:
+        """Problems that break links or drop notes: undefined references and duplicate keys, but not unused notes."""
+        return len(self.undefined) + len(self.duplicates)
+
+    def format_report(self) -> str:
+        """Format the undefined references and duplicate keys as one report, grouped by kind and sorted by key."""
+        lines = [f"Editor notes found {self.warning_count} problem(s):"]
+        if self.undefined:
+            lines.append(f"  Undefined note references ({len(self.undefined)}):")
+            for key, locations in sorted(self.undefined.items()):
+                lines.append(f"    [^{key}] at {', '.join(map(str, locations))}")
+        if self.duplicates:
+            lines.append(f"  Duplicate note definitions ({len(self.duplicates)}):")
+            for key, locations in sorted(self.duplicates.items()):
+                lines.append(f"    [^{key}] defined at {', '.join(map(str, locations))} (the first one is kept)")
+        return "\n".join(lines)
+
+    def format_unused(self) -> str:
+        """Format the notes that are defined but never referenced, sorted by key."""
+        lines = [f"Editor notes found {len(self.unused)} unused note definition(s):"]
+        for key in self.unused:
+            lines.append(f"  [^{key}] defined at {self.definitions[key]}")
+        return "\n".join(lines)
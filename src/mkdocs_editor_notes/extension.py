@@ -0,0 +1,178 @@
+"""Python-Markdown extension that handles editor notes during the Markdown parse itself.
+
+Instead of rewriting the raw page text, a block processor removes note definitions and an inline processor replaces
+note references while Python-Markdown builds the page. Code is excluded by the Markdown parser itself: fenced code is
+stashed before blocks are parsed, and indented code and code spans are handled by processors that run first. The
+extension can be used on its own in any Python-Markdown pipeline:
+
+    markdown.markdown(text, extensions=["editor_notes"])
+
+By default the definitions are collected in the `editor_notes` attribute of the `Markdown` instance (a dictionary of
+note text keyed by `type:label`, also returned by `collected_notes`) and references are removed. The `definitions` and
+`references` options replace that behavior with callbacks.
+"""
+
+import re
+import xml.etree.ElementTree as etree
+from collections.abc import Callable, Mapping
+from typing import Any, override
+
+from markdown import Markdown
+from markdown.blockparser import BlockParser
+from markdown.blockprocessors import BlockProcessor
+from markdown.extensions import Extension
+from markdown.inlinepatterns import InlineProcessor
+
+DefinitionCallback = Callable[[str, str, str], None]
+ReferenceCallback = Callable[[re.Match[str]], str]
+
+# Same syntax as NOTE_DEF_PATTERN and NOTE_REF_PATTERN, without the verbose flag Python-Markdown does not pass on
+DEFINITION_START_PATTERN = re.compile(r"^\[\^(?P<type>[a-z]+):(?P<label>[a-z0-9\-_]+)\]:", re.MULTILINE)
+REFERENCE_PATTERN = r"\[\^(?P<type>[a-z]+):(?P<label>[a-z0-9\-_]+)\]"
+STASH_PLACEHOLDER_PATTERN = re.compile("\x02wzxhzdk:(\\d+)\x03")
+
+# Attribute of the `Markdown` instance that holds the collected definitions
+NOTES_ATTRIBUTE = "editor_notes"
+
+# Before link reference definitions (15) and footnotes (17) which would otherwise claim note definitions, after
+# indented code (80) and ATX headings (70)
+DEFINITION_PRIORITY = 65
+# After code spans (190), before footnote references (175)
+REFERENCE_PRIORITY = 185
+
+
+class NoteDefinitionProcessor(BlockProcessor):
+    """Removes note definitions from the blocks they start in.
+
+    A definition runs until the end of its block (a blank line) or the next line that starts with `[^`. A definition
+    with no text on its own line takes its text from the following block, as the regex engine does. A fenced code block
+    written right below a definition belongs to it: the fenced code preprocessor turns it into a block of its own that
+    is exactly a stash placeholder, while a fence after a blank line keeps an extra leading newline.
+    """
+
+    extension: "EditorNotesExtension"
+
+    def __init__(self, parser: BlockParser, extension: "EditorNotesExtension"):
+        super().__init__(parser)
+        self.extension = extension
+
+    @override
+    def test(self, parent: etree.Element, block: str) -> bool:
+        return DEFINITION_START_PATTERN.search(block) is not None
+
+    @override
+    def run(self, parent: etree.Element, blocks: list[str]) -> bool:
+        block = blocks.pop(0)
+        match = DEFINITION_START_PATTERN.search(block)
+        if match is None:
+            blocks.insert(0, block)
+            return False
+        end = block.find("\n[^", match.end())
+        text = block[match.end() : end if end >= 0 else len(block)].strip()
+        if end >= 0:
+            # Whatever follows (another definition, or a footnote) is parsed as a block of its own
+            blocks.insert(0, block[end + 1 :])
+        else:
+            if not text and blocks:
+                text = self.take_following_text(blocks)
+            while blocks and STASH_PLACEHOLDER_PATTERN.fullmatch(blocks[0]):
+                text = f"{text}\n{blocks.pop(0)}".strip()
+        self.extension.define(match.group("type"), match.group("label"), self.unstash(text))
+
+        before = block[: match.start()].rstrip("\n")
+        if before:
+            blocks.insert(0, before)
+        return True
+
+    @staticmethod
+    def take_following_text(blocks: list[str]) -> str:
+        following = blocks.pop(0)
+        end = following.find("\n[^")
+        if end < 0:
+            return following.strip()
+        blocks.insert(0, following[end + 1 :])
+        return following[:end].strip()
+
+    def unstash(self, text: str) -> str:
+        """Put back the code blocks that Python-Markdown stashed before parsing, as their rendered HTML."""
+        raw_html = self.parser.md.htmlStash.rawHtmlBlocks
+        return STASH_PLACEHOLDER_PATTERN.sub(lambda match: str(raw_html[int(match.group(1))]), text)
+
+
+class NoteReferenceProcessor(InlineProcessor):
+    """Replaces note references with the HTML returned by the extension's reference callback."""
+
+    extension: "EditorNotesExtension"
+
+    def __init__(self, pattern: str, md: Markdown, extension: "EditorNotesExtension"):
+        super().__init__(pattern, md)
+        self.extension = extension
+
+    # The stubs declare the same override of `Pattern.handleMatch`, and silence it the same way
+    @override
+    def handleMatch(  # type: ignore[override]
+        self, m: re.Match[str], data: str
+    ) -> tuple[etree.Element | str | None, int | None, int | None]:
+        html = self.extension.reference(m)
+        return (self.md.htmlStash.store(html) if html else ""), m.start(0), m.end(0)
+
+
+class EditorNotesExtension(Extension):
+    """Handle editor note definitions and references in the Markdown parse."""
+
+    config: Mapping[str, list[Any]]
+    md: Markdown | None
+    notes: dict[str, str]
+
+    def __init__(self, **kwargs: Any):
+        # The defaults are callables too: Python-Markdown would coerce options with a None default to booleans
+        self.config = {
+            "definitions": [self.collect, "Called with the type, label and text of each note definition"],
+            "references": [remove_reference, "Called with each note reference match, returns the HTML to replace it"],
+        }
+        self.md = None
+        self.notes = {}
+        super().__init__(**kwargs)
+
+    @override
+    def extendMarkdown(self, md: Markdown) -> None:
+        self.md = md
+        md.registerExtension(self)
+        self.reset()
+        md.parser.blockprocessors.register(
+            NoteDefinitionProcessor(md.parser, self), "editor_note_definition", DEFINITION_PRIORITY
+        )
+        md.inlinePatterns.register(
+            NoteReferenceProcessor(REFERENCE_PATTERN, md, self), "editor_note_reference", REFERENCE_PRIORITY
+        )
+
+    def reset(self) -> None:
+        self.notes = {}
+        if self.md is not None:
+            setattr(self.md, NOTES_ATTRIBUTE, self.notes)
+
+    def collect(self, note_type: str, label: str, text: str) -> None:
+        """Keep the first definition of each note, for the `Markdown` instance."""
+        self.notes.setdefault(f"{note_type}:{label}", text)
+
+    def define(self, note_type: str, label: str, text: str) -> None:
+        callback: DefinitionCallback = self.getConfig("definitions")
+        callback(note_type, label, text)
+
+    def reference(self, match: re.Match[str]) -> str:
+        callback: ReferenceCallback = self.getConfig("references")
+        return callback(match)
+
+
+def remove_reference(_match: re.Match[str]) -> str:
+    return ""
+
+
+def collected_notes(md: Markdown) -> dict[str, str]:
+    """Return the note definitions collected by the extension in the last document `md` converted."""
+    notes: dict[str, str] = getattr(md, NOTES_ATTRIBUTE, {})
+    return notes
+
+
+def makeExtension(**kwargs: Any) -> EditorNotesExtension:
+    return EditorNotesExtension(**kwargs)
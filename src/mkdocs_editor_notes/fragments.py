@@ -0,0 +1,61 @@
+"""In-memory cache of rendered aggregator fragments, reused across `mkdocs serve` rebuilds."""
+
+import json
+from collections.abc import Callable
+
+from mkdocs_editor_notes.cache import hash_text
+from mkdocs_editor_notes.note import EditorNote
+
+FragmentKey = tuple[str, str]
+
+
+class AggregatorFragments:
+    """Rendered HTML for each (note type, source page) group of aggregator entries.
+
+    Each fragment is stored with a fingerprint of the notes it was rendered from, so after a page edit only the groups
+    whose notes actually changed are rendered again, and the aggregator is put back together by concatenation. Groups
+    that are no longer part of a build are pruned once it has been assembled.
+    """
+
+    fragments: dict[FragmentKey, tuple[str, str]]
+    used: set[FragmentKey]
+    renders: int
+
+    def __init__(self):
+        self.fragments = {}
+        self.used = set()
+        self.renders = 0
+
+    @staticmethod
+    def fingerprint(notes: list[EditorNote], salt: str = "") -> str:
+        return hash_text(salt + json.dumps([note.to_dict() for note in notes], sort_keys=True))
+
+    def render(
+        self, key: FragmentKey, notes: list[EditorNote], render_entry: Callable[[EditorNote], str], salt: str = ""
+    ) -> str:
+        """Return the HTML for one group of notes, rendering it only if the notes changed since it was cached.
+
+        Args:
+            key: The (note type, source page) of the group
+            notes: The group's notes, in aggregator order
+            render_entry: Renders the HTML for a single note
+            salt: Extra fingerprint input for anything else the HTML depends on, such as the Markdown configuration
+        """
+        self.used.add(key)
+        fingerprint = self.fingerprint(notes, salt)
+        cached = self.fragments.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        self.renders += 1
+        html = "\n\n".join(render_entry(note) for note in notes)
+        self.fragments[key] = (fingerprint, html)
+        return html
+
+    def start(self) -> None:
+        """Begin assembling the aggregator for a new build."""
+        self.used = set()
+        self.renders = 0
+
+    def prune(self) -> None:
+        """Drop the fragments of groups that were not part of the current build."""
+        self.fragments = {key: value for key, value in self.fragments.items() if key in self.used}
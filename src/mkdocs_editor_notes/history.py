@@ -0,0 +1,76 @@
+"""Snapshots of the notes of a build, and the diff between the snapshots of two builds."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from mkdocs_editor_notes.cache import dump_json, hash_text, load_json
+from mkdocs_editor_notes.note import EditorNote
+
+# A note key and a short hash of its text; a snapshot is a list of these sorted by key
+SnapshotEntry = tuple[str, str]
+
+CONTENT_HASH_LENGTH = 16
+
+
+def build_snapshot(notes: Iterable[tuple[str, EditorNote]]) -> list[SnapshotEntry]:
+    """Snapshot keyed notes as their keys and content hashes, sorted by key."""
+    return sorted((key, hash_text(note.text)[:CONTENT_HASH_LENGTH]) for key, note in notes)
+
+
+def load_snapshot(path: Path) -> list[SnapshotEntry] | None:
+    """Load the snapshot saved by a previous build, or None if there is none."""
+    entries: list[list[str]] | None = load_json(path, None)
+    if not isinstance(entries, list):
+        return None
+    return [(key, content_hash) for key, content_hash in entries]
+
+
+def save_snapshot(path: Path, snapshot: list[SnapshotEntry]) -> None:
+    dump_json(path, snapshot)
+
+
+@dataclass
+class NoteDiff:
+    """Keys of the notes that changed between two builds, each list sorted.
+
+    Attributes:
+        added: Notes that were not in the previous build
+        edited: Notes whose text changed
+        resolved: Notes of the previous build that are gone
+    """
+
+    added: list[str] = field(default_factory=list)
+    edited: list[str] = field(default_factory=list)
+    resolved: list[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.edited or self.resolved)
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(added=self.added, edited=self.edited, resolved=self.resolved)
+
+
+def diff_snapshots(previous: list[SnapshotEntry], current: list[SnapshotEntry]) -> NoteDiff:
+    """Compare two snapshots in one linear merge over their sorted keys, without loading any note text."""
+    diff = NoteDiff()
+    old_index = new_index = 0
+    while old_index < len(previous) and new_index < len(current):
+        old_key, old_hash = previous[old_index]
+        new_key, new_hash = current[new_index]
+        if old_key == new_key:
+            if old_hash != new_hash:
+                diff.edited.append(new_key)
+            old_index += 1
+            new_index += 1
+        elif old_key < new_key:
+            diff.resolved.append(old_key)
+            old_index += 1
+        else:
+            diff.added.append(new_key)
+            new_index += 1
+    diff.resolved.extend(key for key, _ in previous[old_index:])
+    diff.added.extend(key for key, _ in current[new_index:])
+    return diff
@@ -0,0 +1,116 @@
+"""Translated pages, and the note extraction results their language builds share."""
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+from mkdocs_editor_notes.cache import hash_text
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.parser import SourceMap
+
+# Type, label, text and line of a note definition, without the page it was found on
+NoteDefinition = tuple[str, str, str, int]
+ExtractionKey = tuple[str, str]
+
+
+class PageLanguage(NamedTuple):
+    """The page a translated page is a translation of, and its language ("" for an untranslated page)."""
+
+    source: str
+    language: str
+
+
+def split_language(src_uri: str, languages: Sequence[str]) -> PageLanguage:
+    """Recognize a translated page by a language folder (`fr/guide.md`) or a language suffix (`guide.fr.md`).
+
+    Args:
+        src_uri: The page path relative to the docs directory
+        languages: The language codes used by the site
+    """
+    folder, slash, rest = src_uri.partition("/")
+    if slash and folder in languages:
+        return PageLanguage(rest, folder)
+    stem, dot, extension = src_uri.rpartition(".")
+    base, language_dot, language = stem.rpartition(".")
+    if dot and language_dot and language in languages:
+        return PageLanguage(f"{base}.{extension}", language)
+    return PageLanguage(src_uri, "")
+
+
+@dataclass(frozen=True, slots=True)
+class PageExtraction:
+    """What the regex engine finds in a page before any of it is tied to the page's URL.
+
+    Attributes:
+        markdown: The page with code blocks protected and note definitions removed
+        code_blocks: The protected code blocks
+        definitions: The note definitions, in page order
+        source_map: Locates positions of the markdown in the page
+    """
+
+    markdown: str
+    code_blocks: tuple[str, ...]
+    definitions: tuple[NoteDefinition, ...]
+    source_map: SourceMap
+
+    def notes(self, source_page: Path, source_url: str) -> Iterator[EditorNote]:
+        """Build the notes defined on the page, for the page being processed."""
+        for note_type, label, text, line_number in self.definitions:
+            yield EditorNote(
+                note_type=note_type,
+                label=label,
+                text=text,
+                source_page=source_page,
+                source_url=source_url,
+                line_number=line_number,
+            )
+
+
+class ExtractionCache:
+    """Extraction results shared by the language builds of a site, keyed by page content.
+
+    An i18n plugin builds the site once per language, and each build processes a page per source page: a translation,
+    or the source page itself where the translation is missing. Results are grouped by source page, and each source page
+    keeps one result per listed language plus one for the untranslated page, so the cache stays bounded however long
+    `mkdocs serve` runs, whether or not the default language is listed.
+    """
+
+    variants: int
+    pages: dict[str, dict[str, PageExtraction]]
+    languages: list[str]
+    lookups: int
+    hits: int
+
+    def __init__(self, languages: Sequence[str]):
+        self.languages = list(languages)
+        self.variants = len(self.languages) + 1
+        self.pages = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def key(self, src_uri: str, markdown: str) -> ExtractionKey:
+        return split_language(src_uri, self.languages).source, hash_text(markdown)
+
+    def get(self, key: ExtractionKey) -> PageExtraction | None:
+        source, content_hash = key
+        self.lookups += 1
+        variants = self.pages.get(source, {})
+        extraction = variants.pop(content_hash, None)
+        if extraction is not None:
+            self.hits += 1
+            # Put back as the most recently used
+            variants[content_hash] = extraction
+        return extraction
+
+    def put(self, key: ExtractionKey, extraction: PageExtraction) -> None:
+        source, content_hash = key
+        variants = self.pages.setdefault(source, {})
+        variants[content_hash] = extraction
+        while len(variants) > self.variants:
+            del variants[next(iter(variants))]
+
+    def start(self) -> None:
+        """Begin counting lookups for a new language build."""
+        self.lookups = 0
+        self.hits = 0
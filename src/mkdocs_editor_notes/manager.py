@@ -1,199 +1,174 @@
 import re
-from collections.abc import Callable, Generator
-from enum import StrEnum, auto
+import sys
+from collections.abc import Callable, Generator, Iterator
 from pathlib import Path
-from typing import Any, assert_never
-
-import snick
-from markdown import Markdown
-from mkdocs.plugins import get_plugin_logger
-from mkdocs.structure.files import File, Files
-from mkdocs.structure.pages import Page
-
-from mkdocs_editor_notes.constants import CODE_BLOCK_PATTERN, NOTE_DEF_PATTERN, NOTE_REF_PATTERN
+from typing import TYPE_CHECKING, Final
+
+from mkdocs_editor_notes import parser
+from mkdocs_editor_notes.budget import PageStage, PageTimer
+from mkdocs_editor_notes.constants import (
+    AGGREGATOR_INTRO,
+    CHANGES_HEADING,
+    NOTE_DEF_PATTERN,
+    NOTE_REF_PATTERN,
+    STREAM_CHUNK_SIZE,
+)
+from mkdocs_editor_notes.diagnostics import NoteDiagnostics, NoteLocation
+from mkdocs_editor_notes.fragments import AggregatorFragments
+from mkdocs_editor_notes.i18n import ExtractionCache, PageExtraction
 from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.occurrences import OccurrenceTable
+from mkdocs_editor_notes.parser import LineType, SourceMap
+from mkdocs_editor_notes.render import NoteTextRenderer
+from mkdocs_editor_notes.search_index import NoteSearchIndex
+from mkdocs_editor_notes.store import MemoryNoteStore, NoteStore
 
-log = get_plugin_logger(__name__)
-
-MdxConfigs = dict[str, dict[str, Any]]
-
+if TYPE_CHECKING:
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure.files import Files
+    from mkdocs.structure.pages import Page
 
-class LineType(StrEnum):
-    """Types of markdown lines for anchor placement."""
+    from mkdocs_editor_notes.history import NoteDiff, SnapshotEntry
+    from mkdocs_editor_notes.view import NoteIndexView
 
-    HEADING = auto()
-    UNORDERED_LIST = auto()
-    ORDERED_LIST = auto()
-    REGULAR = auto()
+__all__ = ["EditorNotesManager", "LineType"]
 
 
 class EditorNotesManager:
     """Manager for collecting, parsing, and aggregating editor notes."""
 
-    notes_map: dict[str, EditorNote]
-    type_map: dict[str, set[str]]
-    aggregator_page: Page | None
-
-    def __init__(self):
-        self.notes_map = {}
-        self.type_map = {}
+    store: NoteStore
+    text_renderer: NoteTextRenderer
+    fragments: AggregatorFragments
+    diagnostics: NoteDiagnostics
+    occurrences: OccurrenceTable
+    extractions: ExtractionCache | None
+    changes: "NoteDiff | None"
+    aggregator_page: "Page | None"
+
+    def __init__(
+        self,
+        store: NoteStore | None = None,
+        text_renderer: NoteTextRenderer | None = None,
+        fragments: AggregatorFragments | None = None,
+        extractions: ExtractionCache | None = None,
+    ):
+        self.store = store if store is not None else MemoryNoteStore()
+        self.text_renderer = text_renderer if text_renderer is not None else NoteTextRenderer()
+        self.fragments = fragments if fragments is not None else AggregatorFragments()
+        self.diagnostics = NoteDiagnostics()
+        self.occurrences = OccurrenceTable()
+        self.extractions = extractions
+        self.changes = None
         self.aggregator_page = None
 
     def __iter__(self) -> Generator[EditorNote, None, None]:
-        yield from self.notes_map.values()
-
-    @staticmethod
-    def key(note_type: str, note_label: str) -> str:
-        return f"{note_type}:{note_label}"
-
-    @staticmethod
-    def classify_line(line: str) -> LineType:
-        """Classify a markdown line by its type for anchor placement.
-
-        Args:
-            line: The markdown line to classify
-
-        Returns:
-            LineType enum indicating the line type
-        """
-        stripped = line.lstrip()
-
-        match stripped:
-            case "":
-                return LineType.REGULAR
-            case str() if stripped.startswith("#"):
-                return LineType.HEADING
-            case str() if stripped.startswith(("-", "*", "+")):
-                return LineType.UNORDERED_LIST
-            case str() if stripped[0].isdigit() and "." in stripped[:4]:
-                return LineType.ORDERED_LIST
-            case _:
-                return LineType.REGULAR
-
-    @staticmethod
-    def insert_anchor_in_heading(line: str, anchor_span: str) -> str:
-        """Insert anchor span after heading markers in a markdown heading.
-
-        Args:
-            line: The markdown line (e.g., "## My Heading[^note]")
-            anchor_span: The HTML span to insert (e.g., '<span id="ref-note-id"></span>')
-
-        Returns:
-            Modified line with anchor placed after heading markers
-        """
-        stripped = line.lstrip()
-        heading_markers = ""
-        remaining = stripped
-        while remaining.startswith("#"):
-            heading_markers += "#"
-            remaining = remaining[1:]
-        leading_space = line[: len(line) - len(stripped)]
-        return f"{leading_space}{heading_markers}{anchor_span}{remaining}"
-
-    @staticmethod
-    def insert_anchor_in_unordered_list(line: str, anchor_span: str) -> str:
-        """Insert anchor span after list marker in an unordered list item.
-
-        Args:
-            line: The markdown line (e.g., "- Item text[^note]")
-            anchor_span: The HTML span to insert
-
-        Returns:
-            Modified line with anchor placed after list marker
-        """
-        stripped = line.lstrip()
-        list_marker = stripped[0]
-        remaining = stripped[1:].lstrip()
-        leading_space = line[: len(line) - len(stripped)]
-        return f"{leading_space}{list_marker} {anchor_span}{remaining}"
-
-    @staticmethod
-    def insert_anchor_in_ordered_list(line: str, anchor_span: str) -> str:
-        """Insert anchor span after number and period in an ordered list item.
+        yield from self.store
 
-        Args:
-            line: The markdown line (e.g., "1. Item text[^note]")
-            anchor_span: The HTML span to insert
-
-        Returns:
-            Modified line with anchor placed after number and period, or fallback to beginning
-        """
-        stripped = line.lstrip()
-        dot_pos = stripped.find(".")
-        if dot_pos > 0:
-            list_marker = stripped[: dot_pos + 1]
-            remaining = stripped[dot_pos + 1 :].lstrip()
-            leading_space = line[: len(line) - len(stripped)]
-            return f"{leading_space}{list_marker} {anchor_span}{remaining}"
-        else:
-            # Fallback if no period found
-            return f"{anchor_span}{line}"
-
-    @staticmethod
-    def insert_anchor_at_beginning(line: str, anchor_span: str) -> str:
-        """Insert anchor span at the beginning of a regular line.
-
-        Args:
-            line: The markdown line
-            anchor_span: The HTML span to insert
+    @property
+    def notes_map(self) -> dict[str, EditorNote]:
+        return self.store.notes_map
 
-        Returns:
-            Modified line with anchor at beginning
-        """
-        return f"{anchor_span}{line}"
+    @property
+    def type_map(self) -> dict[str, set[str]]:
+        return self.store.type_map
 
     @staticmethod
-    def insert_anchor_in_line(line: str, anchor_span: str) -> str:
-        """Insert anchor span in a line based on its markdown type.
-
-        Uses structural pattern matching to handle different line types appropriately.
-
-        Args:
-            line: The markdown line
-            anchor_span: The HTML span to insert
-
-        Returns:
-            Modified line with anchor placed appropriately for the line type
-        """
-        line_type = EditorNotesManager.classify_line(line)
-
-        match line_type:
-            case LineType.HEADING:
-                return EditorNotesManager.insert_anchor_in_heading(line, anchor_span)
-            case LineType.UNORDERED_LIST:
-                return EditorNotesManager.insert_anchor_in_unordered_list(line, anchor_span)
-            case LineType.ORDERED_LIST:
-                return EditorNotesManager.insert_anchor_in_ordered_list(line, anchor_span)
-            case LineType.REGULAR:
-                return EditorNotesManager.insert_anchor_at_beginning(line, anchor_span)
-            case _:
-                assert_never(line_type)
+    def key(note_type: str, note_label: str) -> str:
+        # Interned so the store and the diagnostics share one copy of each key, however many references it has
+        return sys.intern(f"{note_type}:{note_label}")
+
+    classify_line: Final = staticmethod(parser.classify_line)
+    insert_anchor_in_heading: Final = staticmethod(parser.insert_anchor_in_heading)
+    insert_anchor_in_unordered_list: Final = staticmethod(parser.insert_anchor_in_unordered_list)
+    insert_anchor_in_ordered_list: Final = staticmethod(parser.insert_anchor_in_ordered_list)
+    insert_anchor_at_beginning: Final = staticmethod(parser.insert_anchor_at_beginning)
+    insert_anchor_in_line: Final = staticmethod(parser.insert_anchor_in_line)
+    protect_code_blocks: Final = staticmethod(parser.protect_code_blocks)
+    restore_code_blocks: Final = staticmethod(parser.restore_code_blocks)
 
     @property
     def empty(self) -> bool:
-        return len(self.notes_map) == 0
+        return len(self.store) == 0
 
     @property
     def types(self) -> Generator[str, None, None]:
-        yield from self.type_map.keys()
+        yield from self.store.types()
 
     def add(self, note: EditorNote):
         note_key = self.key(note.note_type, note.label)
-        if note_key in self.notes_map:
+        if note_key in self.store:
+            import snick
+
             raise ValueError(
                 snick.conjoin(
                     f"Note with key '{note_key}' already exists. ",
                     "Each note must have a unique combination of type and label.",
                 )
             )
-        self.notes_map[note_key] = note
-        self.type_map.setdefault(note.note_type, set()).add(note_key)
+        self.store.add(note_key, note)
+
+    @staticmethod
+    def sort_key(note: EditorNote) -> tuple[str, str, int, str]:
+        """Order notes by type, then by where they are defined, independently of page processing order."""
+        return (note.note_type, note.source_page.as_posix(), note.line_number, note.label)
+
+    def sorted_notes(self) -> list[EditorNote]:
+        """Return every note in aggregator order."""
+        return sorted(self.store, key=self.sort_key)
+
+    def build_search_index(self) -> NoteSearchIndex:
+        """Build the client-side search index over every note, in aggregator order so that its ids are stable."""
+        search_index = NoteSearchIndex()
+        for note in self.sorted_notes():
+            search_index.add(note)
+        return search_index
+
+    def build_note_previews(self) -> dict[str, str]:
+        """Map the key of every note to its rendered text, for the marker popovers."""
+        return {
+            self.key(note.note_type, note.label): self.text_renderer.render(note.text) for note in self.sorted_notes()
+        }
+
+    def build_snapshot(self) -> list["SnapshotEntry"]:
+        """Snapshot the key and content hash of every note, for comparison with the next build."""
+        from mkdocs_editor_notes.history import build_snapshot
+
+        return build_snapshot((self.key(note.note_type, note.label), note) for note in self.store)
+
+    def index_view(self) -> "NoteIndexView":
+        """Build a read-only view of the collected notes for other plugins, without copying them."""
+        from mkdocs_editor_notes.view import NoteIndexView
+
+        return NoteIndexView(self.store, self.occurrences, self.diagnostics)
 
     def get(self, note_type: str, note_label: str) -> EditorNote | None:
         note_key = self.key(note_type, note_label)
-        return self.notes_map.get(note_key)
+        return self.store.get(note_key)
 
-    def parse_note_definitions(self, markdown: str, page: Page) -> None:
+    def define(self, note: EditorNote, line_number: int | None) -> bool:
+        """
+        Add a note defined on a page, recording a duplicate definition instead of failing on it.
+
+        Args:
+            note: The note that was defined
+            line_number: Line of the page where the definition starts, if known
+
+        Returns:
+            True if the note was added, False if its key was already defined (the first definition wins)
+        """
+        note_key = self.key(note.note_type, note.label)
+        location = NoteLocation(note.source_page.as_posix(), line_number)
+        existing = self.store.get(note_key)
+        if existing is not None:
+            first = self.diagnostics.definitions.get(note_key, NoteLocation(existing.source_page.as_posix()))
+            self.diagnostics.add_duplicate(note_key, first, location)
+            return False
+        self.add(note)
+        self.diagnostics.add_definition(note_key, location)
+        return True
+
+    def parse_note_definitions(self, markdown: str, page: "Page", code_blocks: list[str] | None = None) -> None:
         """
         Parse note definitions from markdown and add them to the manager.
 
@@ -202,23 +177,54 @@ class EditorNotesManager:
         Args:
             markdown: The markdown content to parse
             page: The MkDocs page being processed
+            code_blocks: Code blocks protected in the markdown, restored into any note text that contains them
         """
+        for note, line_number in self.scan_note_definitions(markdown, page, code_blocks):
+            self.define(note, line_number)
+
+    def scan_note_definitions(
+        self,
+        markdown: str,
+        page: "Page",
+        code_blocks: list[str] | None = None,
+        source_map: SourceMap | None = None,
+    ) -> Generator[tuple[EditorNote, int], None, None]:
+        """
+        Find the note definitions in markdown without adding them to the manager.
+
+        Args:
+            markdown: The markdown content to parse
+            page: The MkDocs page being processed
+            code_blocks: Code blocks protected in the markdown, restored into any note text that contains them
+            source_map: Locates positions of the markdown in the page; lines are counted in the markdown if omitted
+
+        Yields:
+            Each note with the line its definition starts on
+        """
+        source_page = Path(page.file.src_uri)
+        line_number = 1
+        position = 0
         for match in NOTE_DEF_PATTERN.finditer(markdown):
-            note_type = match.group("type")
+            note_type = sys.intern(match.group("type"))
             note_label = match.group("label")
-            note_text = match.group("text").strip()
+            note_text = self.restore_code_blocks(match.group("text").strip(), code_blocks or [])
+            if source_map is not None:
+                line_number, _ = source_map.locate(match.start())
+            else:
+                line_number += markdown.count("\n", position, match.start())
+                position = match.start()
 
             note = EditorNote(
                 note_type=note_type,
                 label=note_label,
                 text=note_text,
-                source_page=Path(page.file.src_uri),
+                source_page=source_page,
                 source_url=page.url or "",
+                line_number=line_number,
             )
+            yield note, line_number
 
-            self.add(note)
-
-    def parse_note_references(self, markdown: str, page: Page) -> str:
+    def parse_note_references(self, markdown: str, page: "Page", source_map: SourceMap | None = None) -> str:
         """
         Parse note references from markdown and insert anchor spans.
 
@@ -226,42 +232,106 @@ class EditorNotesManager:
 
         This method:
         1. Finds all note references in the markdown
-        2. Updates the line_number for each referenced note
-        3. Inserts anchor spans at the reference locations
-        4. Logs warnings for undefined references
+        2. Records each reference to a defined note in the occurrence table
+        3. Inserts a unique anchor span for each of those references
+        4. Records every reference, including undefined ones, in the diagnostics
 
         Args:
             markdown: The markdown content to parse
             page: The MkDocs page being processed
+            source_map: Locates positions of the markdown in the page; positions are taken as they are in the markdown
+                if omitted
 
         Returns:
             Updated markdown with anchor spans inserted
         """
         lines = markdown.split("\n")
+        line_start = 0
         for line_number, line in enumerate(lines):
-            ref_match = NOTE_REF_PATTERN.search(line)
-            if not ref_match:
-                continue
+            locate = source_map.line_locator(line_start) if source_map is not None else None
+            lines[line_number] = self.annotate_reference_line(line, line_number, page, locate)
+            line_start += len(line) + 1
+
+        return "\n".join(lines)
+
+    def annotate_reference_line(
+        self,
+        line: str,
+        line_number: int,
+        page: "Page",
+        locate: Callable[[int], tuple[int, int]] | None = None,
+    ) -> str:
+        """
+        Record the note references on a line and insert an anchor span for each one that is defined.
 
-            note_type = ref_match.group("type")
-            note_label = ref_match.group("label")
-            note: EditorNote | None = self.get(note_type, note_label)
+        Every occurrence of a note gets its own anchor id, so the aggregator can link to each reference site. The
+        anchors are placed together where the line's structure allows it, in the order of the references.
 
-            if note:
-                # WARN: this might be approximate based on the position in the file
-                note.line_number = line_number + 1
+        Args:
+            line: The line of markdown (with code blocks protected)
+            line_number: Zero-based position of the line in the markdown
+            page: The MkDocs page being processed
+            locate: Maps a position on the line to the line and column (both one-based) it came from in the page, for
+                markdown that was rewritten before; positions are taken as they are on the line if omitted
 
-                anchor_span = f'<span id="{note.ref_id}"></span>'
-                lines[line_number] = self.insert_anchor_in_line(line, anchor_span)
+        Returns:
+            The line with anchor spans inserted, or unchanged if it references no defined note
+        """
+        anchor_spans: list[str] = []
+        for ref_match in NOTE_REF_PATTERN.finditer(line):
+            note_key = self.key(ref_match.group("type"), ref_match.group("label"))
+            note: EditorNote | None = self.store.get(note_key)
+            if locate is not None:
+                source_line, source_column = locate(ref_match.start())
             else:
-                log.warning(
-                    f"Undefined note reference '[^{note_type}:{note_label}]' in {page.file.src_uri}:{line_number + 1}"
-                )
+                source_line, source_column = line_number + 1, ref_match.start() + 1
+            location = NoteLocation(page.file.src_uri, source_line)
+            self.diagnostics.add_reference(note_key, location, defined=note is not None)
+            if note is None:
+                continue
+            index = self.occurrences.add(note_key, page.file.src_uri, page.url or "", source_line, source_column)
+            anchor_spans.append(f'<span id="{note.occurrence_ref_id(index)}"></span>')
+
+        if not anchor_spans:
+            return line
+        return self.insert_anchor_in_line(line, "".join(anchor_spans))
+
+    def replace_reference(
+        self,
+        match: re.Match[str],
+        page: "Page",
+        ref_replacer: Callable[[re.Match[str]], str] | str,
+    ) -> str:
+        """
+        Record a note reference found by the Markdown extension engine and build the HTML that replaces it.
 
-        return "\n".join(lines)
+        The extension sees references inline, without their source line, so each reference is recorded without a
+        position and its anchor span is placed right before it.
+
+        Args:
+            match: The reference match, with `type` and `label` groups
+            page: The MkDocs page being rendered
+            ref_replacer: Function to build the marker for a reference, or empty string to remove references
+
+        Returns:
+            HTML for the reference, or an empty string if there is nothing to show
+        """
+        note_key = self.key(match.group("type"), match.group("label"))
+        note = self.store.get(note_key)
+        self.diagnostics.add_reference(note_key, NoteLocation(page.file.src_uri), defined=note is not None)
+        if note is None:
+            return ""
+
+        index = self.occurrences.add(note_key, page.file.src_uri, page.url or "")
+        marker = ref_replacer(match) if callable(ref_replacer) else ref_replacer
+        return f'<span id="{note.occurrence_ref_id(index)}"></span>{marker}'
 
     def process_page_markdown(
-        self, markdown: str, page: Page, ref_replacer: Callable[[re.Match[str]], str] | str
+        self,
+        markdown: str,
+        page: "Page",
+        ref_replacer: Callable[[re.Match[str]], str] | str,
+        timer: PageTimer | None = None,
     ) -> str:
         """
         Process a page's markdown to extract and replace editor notes.
@@ -274,26 +344,106 @@ class EditorNotesManager:
         5. Replaces note references with formatted links (if ref_replacer is a function)
         6. Restores protected code blocks
 
+        Each step is timed as a `PageStage` by the timer. Code blocks and definitions are only scanned (the notes are
+        added once both are done), so if the timer's budget runs out during those stages, `PageBudgetExceeded` is
+        raised and the manager is left as it was.
+
+        With an extraction cache, the result of those two stages is looked up by page content first, so a page that
+        another language build already processed with the same content skips them.
+
         Args:
             markdown: The markdown content to process
             page: The MkDocs page being processed
             ref_replacer: Function to replace note references with formatted links,
                          or empty string to remove references without replacement
+            timer: Times the stages against a per-page budget; stages are timed without a budget if omitted
 
         Returns:
             Processed markdown with notes extracted and references replaced
         """
-        code_blocks: list[str] = []
-        markdown = self.protect_code_blocks(markdown, code_blocks)
-        self.parse_note_definitions(markdown, page)
-        markdown = NOTE_DEF_PATTERN.sub("", markdown)
-        markdown = re.sub(r"\n\n\n+", "\n\n", markdown)
-        markdown = self.parse_note_references(markdown, page)
-        markdown = NOTE_REF_PATTERN.sub(ref_replacer, markdown)
-        markdown = self.restore_code_blocks(markdown, code_blocks)
+        timer = timer if timer is not None else PageTimer()
+        if self.extractions is None:
+            extraction = self.extract_page(markdown, page, timer)
+        else:
+            cache_key = self.extractions.key(page.file.src_uri, markdown)
+            cached = self.extractions.get(cache_key)
+            if cached is None:
+                extraction = self.extract_page(markdown, page, timer)
+                self.extractions.put(cache_key, extraction)
+            else:
+                extraction = cached
+        with timer.stage(PageStage.REFERENCES):
+            for note in extraction.notes(Path(page.file.src_uri), page.url or ""):
+                self.define(note, note.line_number)
+            markdown = self.parse_note_references(extraction.markdown, page, extraction.source_map)
+            markdown = NOTE_REF_PATTERN.sub(ref_replacer, markdown)
+        with timer.stage(PageStage.RESTORE):
+            markdown = self.restore_code_blocks(markdown, extraction.code_blocks)
         return markdown
 
-    def is_aggregator_page(self, page: Page, aggregator_page_path: str) -> bool:
+    def extract_page(self, markdown: str, page: "Page", timer: PageTimer) -> PageExtraction:
+        """Protect code blocks and find definitions: the stages of `process_page_markdown` that only scan the page."""
+        code_blocks: list[str] = []
+        source_map = SourceMap(markdown)
+        with timer.stage(PageStage.CODE_BLOCKS, interruptible=True):
+            markdown = self.protect_code_blocks(markdown, code_blocks, source_map)
+        with timer.stage(PageStage.DEFINITIONS, interruptible=True):
+            definitions = tuple(
+                (note.note_type, note.label, note.text, line_number)
+                for note, line_number in self.scan_note_definitions(markdown, page, code_blocks, source_map)
+            )
+            markdown = source_map.sub(NOTE_DEF_PATTERN, "", markdown)
+            markdown = source_map.sub(parser.BLANK_RUN_PATTERN, "\n\n", markdown)
+        return PageExtraction(markdown, tuple(code_blocks), definitions, source_map)
+
+    def process_page_markdown_streaming(
+        self,
+        markdown: str,
+        page: "Page",
+        ref_replacer: Callable[[re.Match[str]], str] | str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> str:
+        """
+        Process a page's markdown like `process_page_markdown`, but in bounded chunks.
+
+        The page is read twice through the streaming engine: once to collect the note definitions (so references
+        may precede them) and once to rewrite each line. Only the output pieces are held alongside the original,
+        instead of a full copy of the page for every step of the pipeline.
+
+        Args:
+            markdown: The markdown content to process
+            page: The MkDocs page being processed
+            ref_replacer: Function to replace note references with formatted links,
+                         or empty string to remove references without replacement
+            chunk_size: Number of characters read from the page at a time
+
+        Returns:
+            Processed markdown with notes extracted and references replaced
+        """
+        from mkdocs_editor_notes import stream
+
+        source_page = Path(page.file.src_uri)
+        for definition in stream.iter_definitions(stream.iter_text_chunks(markdown, chunk_size)):
+            note = EditorNote(
+                note_type=sys.intern(definition.note_type),
+                label=definition.label,
+                text=definition.text,
+                source_page=source_page,
+                source_url=page.url or "",
+                line_number=definition.line_number,
+            )
+            self.define(note, definition.line_number)
+
+        def rewrite_lines() -> Generator[str, None, None]:
+            lines = stream.iter_output_lines(stream.iter_text_chunks(markdown, chunk_size))
+            for line_number, line in enumerate(lines):
+                text = self.annotate_reference_line(line.text, line_number, page, line.locate)
+                text = NOTE_REF_PATTERN.sub(ref_replacer, text)
+                yield line.restore(text)
+
+        return stream.join_lines(rewrite_lines())
+
+    def is_aggregator_page(self, page: "Page", aggregator_page_path: str) -> bool:
         """
         Check if the given page is the aggregator page.
 
@@ -306,68 +456,151 @@ class EditorNotesManager:
         """
         return page.file.src_uri == aggregator_page_path
 
-    def handle_aggregator_page(self, page: Page) -> str:
+    def handle_aggregator_page(self, page: "Page", emoji_getter: Callable[[str], str]) -> str:
         """
         Handle processing of the aggregator page itself.
 
-        Stores a reference to the aggregator page for later regeneration
-        and returns placeholder content.
+        The aggregator page is the last page MkDocs processes, so every note is known by now and the page is built with
+        its final content. It is converted to HTML once, by MkDocs, like any other page.
 
         Args:
             page: The aggregator page being processed
+            emoji_getter: Function to get emoji for a note type (note_type: str) -> str
 
         Returns:
-            Placeholder markdown content for the aggregator page
+            Markdown content for the aggregator page
         """
         self.aggregator_page = page
-        return "# Editor Notes\n\nGenerating..."
+        return self.build_aggregator_markdown(emoji_getter)
 
     @staticmethod
-    def ensure_aggregator_file(docs_dir: str, aggregator_page: str) -> None:
+    def add_aggregator_to_files(files: "Files", config: "MkDocsConfig", aggregator_page: str) -> None:
         """
-        Ensure the aggregator file exists with placeholder content.
+        Add the aggregator page to the MkDocs files collection as a generated file, unless the docs provide one.
 
-        Creates the aggregator markdown file if it doesn't exist yet.
-        This is needed so MkDocs can discover and process the file.
+        The generated file holds its content in memory, so nothing is written to the docs directory.
 
         Args:
-            docs_dir: The MkDocs docs directory path
+            files: MkDocs Files collection to add to
+            config: The MkDocs config
             aggregator_page: The aggregator page path relative to docs_dir
         """
-        file_path = Path(docs_dir) / aggregator_page
-        if not file_path.exists():
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text("# Editor Notes\n\nLoading...\n")
+        if files.get_file_from_path(aggregator_page) is not None:
+            return
+
+        from mkdocs.structure.files import File
+
+        files.append(File.generated(config, aggregator_page, content=AGGREGATOR_INTRO))
 
     @staticmethod
-    def add_aggregator_to_files(
-        files: Files, aggregator_page: str, docs_dir: str, site_dir: str, use_directory_urls: bool
-    ) -> None:
+    def move_aggregator_last(files: "Files", aggregator_page: str) -> None:
         """
-        Add the aggregator file to MkDocs files collection if not already present.
+        Move the aggregator page to the end of the files collection.
 
-        Mkdocs may auto-discover the file, but this ensures it's included.
+        MkDocs processes pages in the order of the files collection, so the aggregator page is processed after every
+        page whose notes it lists. The navigation is built before this is called, so the page keeps its place there.
 
         Args:
-            files: MkDocs Files collection to add to
+            files: MkDocs Files collection holding the aggregator page
             aggregator_page: The aggregator page path relative to docs_dir
-            docs_dir: The MkDocs docs directory path
-            site_dir: The MkDocs site directory path
-            use_directory_urls: Whether MkDocs uses directory URLs
-        """
-        if not any(f.src_uri == aggregator_page for f in files):
-            aggregator_file = File(
-                path=aggregator_page,
-                src_dir=docs_dir,
-                dest_dir=site_dir,
-                use_directory_urls=use_directory_urls,
-            )
-            files.append(aggregator_file)
+        """
+        file = files.get_file_from_path(aggregator_page)
+        if file is None:
+            return
+        files.remove(file)
+        files.append(file)
+
+    def build_aggregator_entry(self, note: EditorNote) -> str:
+        """
+        Build the HTML block for a single note on the aggregator page.
+
+        The note text is rendered as Markdown by the memoized text renderer. Its HTML is placed as-is (only the first
+        line is indented) so that preformatted content keeps its whitespace. If the note has git blame metadata, its
+        author and date are shown next to the source link.
+
+        The heading links to the first reference to the note. A note referenced more than once also lists every
+        reference site, each linking to its own anchor.
+
+        Args:
+            note: The note to render
+
+        Returns:
+            HTML for the note entry
+        """
+        import html
+
+        import snick
+
+        text_html = self.text_renderer.render(note.text)
+        occurrences = self.occurrences.get(self.key(note.note_type, note.label))
+        links = [
+            f'<a href="../{occurrence.url}#{note.occurrence_ref_id(index)}">{occurrence}</a>'
+            for index, occurrence in enumerate(occurrences)
+        ]
+        if links:
+            source_link = links[0]
+        else:
+            location = f"{note.source_page}:{note.line_number}" if note.line_number else f"{note.source_page}"
+            source_link = f'<a href="{note.ref_url}">{location}</a>'
+        meta = ""
+        if note.author:
+            meta = f' <span class="editor-note-meta">{html.escape(note.author)}, {note.authored_date}</span>'
+        header = snick.dedent(
+            f"""
+            <div class="editor-note-entry">
+                <span id="{note.agg_id}"></span>
+                <h4>
+                    {note.label} ({source_link}){meta}
+                </h4>
+            """
+        )
+        references = ""
+        if len(links) > 1:
+            items = "".join(f"\n        <li>{link}</li>" for link in links)
+            references = f'\n    <ul class="editor-note-references">{items}\n    </ul>'
+        return f"{header}\n    {text_html}{references}\n</div>"
+
+    def occurrence_salt(self, notes: list[EditorNote]) -> str:
+        """Describe where a group of notes is referenced, since their aggregator entries link to every reference."""
+        return repr([self.occurrences.get(self.key(note.note_type, note.label)) for note in notes])
+
+    def aggregator_sections(self, emoji_getter: Callable[[str], str]) -> Iterator[tuple[str, list[str]]]:
+        """
+        Yield the Markdown heading of each note type on the aggregator page, with the HTML of its groups of entries.
+
+        Types are listed alphabetically and the notes of each type are ordered by `sort_key`, so the page only changes
+        when the notes do. The entries of each (type, source page) group come from the fragment cache, so only groups
+        whose notes changed since the previous build are rendered again.
+
+        Args:
+            emoji_getter: Function to get emoji for a note type (note_type: str) -> str
+        """
+        from itertools import groupby
+
+        self.fragments.start()
+        for note_type in sorted(self.types):
+            notes = sorted(self.store.by_type(note_type), key=self.sort_key)
+            groups: list[str] = []
+            for source_page, group in groupby(notes, key=lambda note: note.source_page.as_posix()):
+                group_notes = list(group)
+                groups.append(
+                    self.fragments.render(
+                        (note_type, source_page),
+                        group_notes,
+                        self.build_aggregator_entry,
+                        salt=self.text_renderer.config_hash + self.occurrence_salt(group_notes),
+                    )
+                )
+            yield f"## {emoji_getter(note_type)} {note_type}", groups
+        self.fragments.prune()
 
     def build_aggregator_markdown(self, emoji_getter: Callable[[str], str]) -> str:
         """
         Build the markdown content for the aggregator page.
 
+        The headings are Markdown, so they reach the table of contents and the search index like those of any other
+        page. The entries are HTML blocks, which Markdown passes through as they are.
+
         Args:
             emoji_getter: Function to get emoji for a note type (note_type: str) -> str
 
@@ -377,60 +610,89 @@ class EditorNotesManager:
         if self.empty:
             return ""
 
-        md_parts = snick.Conjoiner()
-        md_parts.add(
-            """
-            # Editor Notes
+        parts = [AGGREGATOR_INTRO]
+        if self.changes is not None and not self.changes.empty:
+            parts.append(f"{CHANGES_HEADING}\n\n{self.build_changes_list(self.changes)}")
+        for heading, groups in self.aggregator_sections(emoji_getter):
+            parts.append(f"\n{heading}\n\n" + "\n\n".join(groups))
+        return "\n\n".join(parts)
 
-            This page aggregates all editor notes found throughout the documentation.
-            """,
-        )
+    def build_changes_list(self, changes: "NoteDiff") -> str:
+        """
+        Build the list of the notes changed since the previous build.
 
-        for note_type in sorted(self.types):
-            emoji = emoji_getter(note_type)
-            md_parts.add(f"## {emoji} {note_type}", blanks_before=2)
-
-            for note in self:
-                if note.note_type != note_type:
-                    continue
-                md_parts.add(
-                    f"""
-                    <div class="editor-note-entry">
-                        <span id="{note.agg_id}"></span>
-                        <h4>
-                            {note.label} (<a href="{note.ref_url}">{note.source_page}:{note.line_number}</a>)
-                        </h4>
-                        <p>{note.text}</p>
-                    </div>
-                    """,
-                    blanks_before=1,
-                )
+        Added and edited notes link to their entries below. Resolved notes are gone, so only their keys are listed.
+
+        Args:
+            changes: The diff against the previous build's snapshot
+
+        Returns:
+            HTML list of the changes
+        """
+        items: list[str] = []
+        for kind, keys in [("Added", changes.added), ("Edited", changes.edited), ("Resolved", changes.resolved)]:
+            if not keys:
+                continue
+            if kind == "Resolved":
+                names = ", ".join(f"<code>{key}</code>" for key in keys)
+            else:
+                names = ", ".join(f'<a href="#agg-{key.replace(":", "-", 1)}">{key}</a>' for key in keys)
+            items.append(f"    <li>{kind} ({len(keys)}): {names}</li>")
+        return "\n".join(['<ul class="editor-notes-changes">', *items, "</ul>"])
+
+    def build_changes_html(self, changes: "NoteDiff") -> str:
+        """
+        Build the section of the aggregator page that lists the notes changed since the previous build.
+
+        Args:
+            changes: The diff against the previous build's snapshot
+
+        Returns:
+            HTML for the changes section
+        """
+        return f"{self.text_renderer.render(CHANGES_HEADING)}\n{self.build_changes_list(changes)}"
+
+    def build_aggregator_html(self, emoji_getter: Callable[[str], str]) -> str:
+        """
+        Assemble the HTML for the aggregator page from cached fragments.
+
+        This is only needed when the aggregator page could not be built in-band, after every other page. The entries
+        are already HTML, so only the intro and the type headings go through Markdown, via the memoized text renderer.
+
+        Args:
+            emoji_getter: Function to get emoji for a note type (note_type: str) -> str
+
+        Returns:
+            Complete HTML for the aggregator page
+        """
+        if self.empty:
+            return ""
 
-        return str(md_parts)
+        parts = [self.text_renderer.render(AGGREGATOR_INTRO)]
+        if self.changes is not None and not self.changes.empty:
+            parts.append(self.build_changes_html(self.changes))
+        for heading, groups in self.aggregator_sections(emoji_getter):
+            parts.append(self.text_renderer.render(heading))
+            parts.extend(groups)
+        return "\n".join(parts)
 
-    def regenerate_aggregator_content(
-        self, emoji_getter: Callable[[str], str], markdown_extensions: list[str], mdx_configs: MdxConfigs
-    ) -> None:
+    def regenerate_aggregator_content(self, emoji_getter: Callable[[str], str]) -> None:
         """
-        Regenerate the aggregator page content after all pages are processed.
+        Replace the rendered content of the aggregator page with HTML built from all collected notes.
 
-        This method should be called after all pages have been processed to
-        generate the final aggregator page content with all collected notes.
+        This is the fallback for builds where pages were processed after the aggregator page, for example because
+        another plugin reordered the files, so the content built in-band missed some notes.
 
         Args:
             emoji_getter: Function to get emoji for a note type (note_type: str) -> str
-            markdown_extensions: List of MkDocs markdown extensions
-            mdx_configs: MkDocs extension configurations
         """
         if self.aggregator_page is None:
             return
 
-        markdown = self.build_aggregator_markdown(emoji_getter)
-        md = Markdown(extensions=markdown_extensions, extension_configs=mdx_configs)
-        self.aggregator_page.content = md.convert(markdown)  # type: ignore
+        self.aggregator_page.content = self.build_aggregator_html(emoji_getter)
 
     @staticmethod
-    def get_aggregator_url(current_page: Page, aggregator_page: str) -> str:
+    def get_aggregator_url(current_page: "Page", aggregator_page: str) -> str:
         """
         Calculate the relative URL from current page to the aggregator page.
 
@@ -458,41 +720,3 @@ class EditorNotesManager:
             rel_prefix = ""
 
         return f"{rel_prefix}{aggregator_url}"
-
-    @staticmethod
-    def protect_code_blocks(markdown: str, code_blocks: list[str]) -> str:
-        """
-        Protect code blocks by replacing them with placeholders.
-
-        This prevents note patterns from being detected inside code blocks.
-
-        Args:
-            markdown: The markdown content to process
-            code_blocks: List to store protected code blocks (modified in place)
-
-        Returns:
-            Markdown with code blocks replaced by placeholders
-        """
-
-        def save_code_block(match: re.Match[str]) -> str:
-            code_blocks.append(match.group(0))
-            return f"<<<CODE_BLOCK_{len(code_blocks) - 1}>>>"
-
-        return CODE_BLOCK_PATTERN.sub(save_code_block, markdown)
-
-    @staticmethod
-    def restore_code_blocks(markdown: str, code_blocks: list[str]) -> str:
-        """
-        Restore code blocks from placeholders.
-
-        Args:
-            markdown: The markdown content with placeholders
-            code_blocks: List of protected code blocks to restore
-
-        Returns:
-            Markdown with code blocks restored
-        """
-        for i, code_block in enumerate(code_blocks):
-            markdown = markdown.replace(f"<<<CODE_BLOCK_{i}>>>", code_block)
-
-        return markdown
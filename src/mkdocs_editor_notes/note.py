@@ -1,8 +1,10 @@
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class EditorNote:
     note_type: str
     label: str
@@ -10,16 +12,43 @@ class EditorNote:
     source_page: Path
     source_url: str = ""
     line_number: int = 0
+    author: str = ""
+    author_time: int = 0
 
     def __post_init__(self):
         """Ensure source_url always ends with a slash if non-empty."""
         if self.source_url and not self.source_url.endswith("/"):
             self.source_url = f"{self.source_url}/"
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EditorNote":
+        """Build a note from the plain dictionary produced by `to_dict()`."""
+        fields: dict[str, Any] = {**data, "source_page": Path(data["source_page"])}
+        return cls(**fields)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the note to a JSON-friendly dictionary."""
+        return dict(
+            note_type=self.note_type,
+            label=self.label,
+            text=self.text,
+            source_page=self.source_page.as_posix(),
+            source_url=self.source_url,
+            line_number=self.line_number,
+            author=self.author,
+            author_time=self.author_time,
+        )
+
     @property
     def ref_id(self) -> str:
         return f"ref-{self.note_type}-{self.label}"
 
+    def occurrence_ref_id(self, index: int) -> str:
+        """Anchor id of the reference with this index; note types have no digits, so ids never collide."""
+        if index == 0:
+            return self.ref_id
+        return f"ref-{index + 1}-{self.note_type}-{self.label}"
+
     @property
     def ref_url(self) -> str:
         if self.source_url:
@@ -31,6 +60,13 @@ class EditorNote:
     def agg_id(self) -> str:
         return f"agg-{self.note_type}-{self.label}"
 
+    @property
+    def authored_date(self) -> str:
+        """The date the note was written (from git blame) in ISO format, or an empty string if unknown."""
+        if not self.author_time:
+            return ""
+        return datetime.fromtimestamp(self.author_time, tz=UTC).date().isoformat()
+
     @property
     def hover_text(self) -> str:
         return f"{self.note_type}: {self.label}"
@@ -0,0 +1,111 @@
+"""Table of every place each note is referenced, kept compact for notes referenced thousands of times."""
+
+from array import array
+from collections.abc import Iterator
+from typing import NamedTuple, override
+
+# Marks the first occurrence of a note in `row_previous`
+NO_ROW = 0xFFFFFFFF
+
+
+class NoteOccurrence(NamedTuple):
+    """One reference to a note: the page it is on, and its line and column when they are known (0 otherwise)."""
+
+    page: str
+    url: str
+    line: int
+    column: int
+
+    @override
+    def __str__(self) -> str:
+        if not self.line:
+            return self.page
+        if not self.column:
+            return f"{self.page}:{self.line}"
+        return f"{self.page}:{self.line}:{self.column}"
+
+
+class OccurrenceTable:
+    """Occurrences of every note, in the order they were recorded.
+
+    Instead of one object per reference, the occurrences of every note are rows in a few shared columns of unsigned
+    integers, with pages stored once and referred to by id. The rows of a note are chained through `row_previous`,
+    so a note only costs the position of its latest row, and each reference costs 20 bytes however many times its
+    note is referenced. `NoteOccurrence` tuples are only built when a note's occurrences are read back.
+    """
+
+    pages: list[str]
+    urls: list[str]
+    page_ids: dict[str, int]
+    last_rows: dict[str, int]
+    row_pages: array[int]
+    row_lines: array[int]
+    row_columns: array[int]
+    row_previous: array[int]
+    row_ordinals: array[int]
+
+    def __init__(self):
+        self.pages = []
+        self.urls = []
+        self.page_ids = {}
+        self.last_rows = {}
+        self.row_pages = array("I")
+        self.row_lines = array("I")
+        self.row_columns = array("I")
+        self.row_previous = array("I")
+        self.row_ordinals = array("I")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.last_rows
+
+    def __len__(self) -> int:
+        return len(self.row_ordinals)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys of the referenced notes."""
+        return iter(self.last_rows)
+
+    def add(self, key: str, page: str, url: str, line: int = 0, column: int = 0) -> int:
+        """Record a reference to a note.
+
+        Args:
+            key: The note key
+            page: Source path of the page the reference is on
+            url: URL of that page
+            line: One-based line of the reference, or 0 if unknown
+            column: One-based column of the reference, or 0 if unknown
+
+        Returns:
+            The index of this occurrence among the note's occurrences
+        """
+        page_id = self.page_ids.get(page)
+        if page_id is None:
+            page_id = self.page_ids[page] = len(self.pages)
+            self.pages.append(page)
+            self.urls.append(url)
+        previous = self.last_rows.get(key, NO_ROW)
+        ordinal = 0 if previous == NO_ROW else self.row_ordinals[previous] + 1
+        self.last_rows[key] = len(self.row_ordinals)
+        self.row_pages.append(page_id)
+        self.row_lines.append(line)
+        self.row_columns.append(column)
+        self.row_previous.append(previous)
+        self.row_ordinals.append(ordinal)
+        return ordinal
+
+    def count(self, key: str) -> int:
+        row = self.last_rows.get(key)
+        return 0 if row is None else self.row_ordinals[row] + 1
+
+    def get(self, key: str) -> list[NoteOccurrence]:
+        """Return the occurrences of a note, in the order they were recorded."""
+        occurrences: list[NoteOccurrence] = []
+        row = self.last_rows.get(key, NO_ROW)
+        while row != NO_ROW:
+            page_id = self.row_pages[row]
+            occurrences.append(
+                NoteOccurrence(self.pages[page_id], self.urls[page_id], self.row_lines[row], self.row_columns[row])
+            )
+            row = self.row_previous[row]
+        occurrences.reverse()
+        return occurrences
@@ -0,0 +1,282 @@
+"""Lightweight parsing core for editor note markdown.
+
+This module depends only on the standard library so it can be imported cheaply by the plugin, the CLI and other
+Markdown pipelines without pulling in MkDocs.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
+from enum import StrEnum, auto
+from typing import assert_never
+
+from mkdocs_editor_notes.constants import CODE_BLOCK_PATTERN, NOTE_STRIP_PATTERN
+
+PLACEHOLDER_PATTERN = re.compile(r"<<<CODE_BLOCK_(\d+)>>>")
+BLANK_RUN_PATTERN = re.compile(r"\n\n\n+")
+
+NEWLINE_PATTERN = re.compile(r"\n")
+
+
+class LineType(StrEnum):
+    """Types of markdown lines for anchor placement."""
+
+    HEADING = auto()
+    UNORDERED_LIST = auto()
+    ORDERED_LIST = auto()
+    REGULAR = auto()
+
+
+def classify_line(line: str) -> LineType:
+    """Classify a markdown line by its type for anchor placement.
+
+    Args:
+        line: The markdown line to classify
+
+    Returns:
+        LineType enum indicating the line type
+    """
+    stripped = line.lstrip()
+
+    match stripped:
+        case "":
+            return LineType.REGULAR
+        case str() if stripped.startswith("#"):
+            return LineType.HEADING
+        case str() if stripped.startswith(("-", "*", "+")):
+            return LineType.UNORDERED_LIST
+        case str() if stripped[0].isdigit() and "." in stripped[:4]:
+            return LineType.ORDERED_LIST
+        case _:
+            return LineType.REGULAR
+
+
+def insert_anchor_in_heading(line: str, anchor_span: str) -> str:
+    """Insert anchor span after heading markers in a markdown heading.
+
+    Args:
+        line: The markdown line (e.g., "## My Heading[^note]")
+        anchor_span: The HTML span to insert (e.g., '<span id="ref-note-id"></span>')
+
+    Returns:
+        Modified line with anchor placed after heading markers
+    """
+    stripped = line.lstrip()
+    heading_markers = ""
+    remaining = stripped
+    while remaining.startswith("#"):
+        heading_markers += "#"
+        remaining = remaining[1:]
+    leading_space = line[: len(line) - len(stripped)]
+    return f"{leading_space}{heading_markers}{anchor_span}{remaining}"
+
+
+def insert_anchor_in_unordered_list(line: str, anchor_span: str) -> str:
+    """Insert anchor span after list marker in an unordered list item.
+
+    Args:
+        line: The markdown line (e.g., "- Item text[^note]")
+        anchor_span: The HTML span to insert
+
+    Returns:
+        Modified line with anchor placed after list marker
+    """
+    stripped = line.lstrip()
+    list_marker = stripped[0]
+    remaining = stripped[1:].lstrip()
+    leading_space = line[: len(line) - len(stripped)]
+    return f"{leading_space}{list_marker} {anchor_span}{remaining}"
+
+
+def insert_anchor_in_ordered_list(line: str, anchor_span: str) -> str:
+    """Insert anchor span after number and period in an ordered list item.
+
+    Args:
+        line: The markdown line (e.g., "1. Item text[^note]")
+        anchor_span: The HTML span to insert
+
+    Returns:
+        Modified line with anchor placed after number and period, or fallback to beginning
+    """
+    stripped = line.lstrip()
+    dot_pos = stripped.find(".")
+    if dot_pos > 0:
+        list_marker = stripped[: dot_pos + 1]
+        remaining = stripped[dot_pos + 1 :].lstrip()
+        leading_space = line[: len(line) - len(stripped)]
+        return f"{leading_space}{list_marker} {anchor_span}{remaining}"
+    else:
+        # Fallback if no period found
+        return f"{anchor_span}{line}"
+
+
+def insert_anchor_at_beginning(line: str, anchor_span: str) -> str:
+    """Insert anchor span at the beginning of a regular line.
+
+    Args:
+        line: The markdown line
+        anchor_span: The HTML span to insert
+
+    Returns:
+        Modified line with anchor at beginning
+    """
+    return f"{anchor_span}{line}"
+
+
+def insert_anchor_in_line(line: str, anchor_span: str) -> str:
+    """Insert anchor span in a line based on its markdown type.
+
+    Uses structural pattern matching to handle different line types appropriately.
+
+    Args:
+        line: The markdown line
+        anchor_span: The HTML span to insert
+
+    Returns:
+        Modified line with anchor placed appropriately for the line type
+    """
+    line_type = classify_line(line)
+
+    match line_type:
+        case LineType.HEADING:
+            return insert_anchor_in_heading(line, anchor_span)
+        case LineType.UNORDERED_LIST:
+            return insert_anchor_in_unordered_list(line, anchor_span)
+        case LineType.ORDERED_LIST:
+            return insert_anchor_in_ordered_list(line, anchor_span)
+        case LineType.REGULAR:
+            return insert_anchor_at_beginning(line, anchor_span)
+        case _:
+            assert_never(line_type)
+
+
+class SourceMap:
+    """
+    Map positions in rewritten markdown back to the line and column they came from in the page.
+
+    Each rewrite applied through `sub` records the spans it replaced, so a position in the final markdown is traced
+    back through every rewrite, latest first. Text outside the replaced spans is only shifted. Offsets are kept in
+    arrays, so a large page costs a few machine words per line and per replaced span.
+    """
+
+    line_starts: array[int]
+    stages: list[tuple[array[int], array[int], array[int], array[int]]]
+
+    def __init__(self, source: str):
+        self.line_starts = array("I", [0])
+        self.line_starts.extend(match.end() for match in NEWLINE_PATTERN.finditer(source))
+        self.stages = []
+
+    def sub(self, pattern: re.Pattern[str], replacement: Callable[[re.Match[str]], str] | str, text: str) -> str:
+        """Rewrite text like `pattern.sub`, recording the replaced spans (`replacement` is used literally if a str)."""
+        out_starts, out_ends, in_starts, in_ends = array("I"), array("I"), array("I"), array("I")
+        shift = 0
+
+        def record(match: re.Match[str]) -> str:
+            nonlocal shift
+            new = replacement if isinstance(replacement, str) else replacement(match)
+            start, end = match.span()
+            out_starts.append(start + shift)
+            out_ends.append(start + shift + len(new))
+            in_starts.append(start)
+            in_ends.append(end)
+            shift += len(new) - (end - start)
+            return new
+
+        text = pattern.sub(record, text)
+        self.stages.append((out_starts, out_ends, in_starts, in_ends))
+        return text
+
+    def source_offset(self, offset: int) -> int:
+        """Trace an offset in the rewritten markdown back to the page."""
+        for out_starts, out_ends, in_starts, in_ends in reversed(self.stages):
+            index = bisect_right(out_starts, offset) - 1
+            if index < 0:
+                continue
+            if offset < out_ends[index]:
+                offset = in_starts[index] + min(offset - out_starts[index], in_ends[index] - in_starts[index])
+            else:
+                offset = in_ends[index] + offset - out_ends[index]
+        return offset
+
+    def locate(self, offset: int) -> tuple[int, int]:
+        """Find the line and column (both one-based) in the page of an offset in the rewritten markdown."""
+        offset = self.source_offset(offset)
+        line_number = bisect_right(self.line_starts, offset)
+        return line_number, offset - self.line_starts[line_number - 1] + 1
+
+    def line_locator(self, line_start: int) -> Callable[[int], tuple[int, int]]:
+        """Locate positions on the line of the rewritten markdown that starts at offset `line_start`."""
+        return lambda position: self.locate(line_start + position)
+
+
+def protect_code_blocks(markdown: str, code_blocks: list[str], source_map: SourceMap | None = None) -> str:
+    """
+    Protect code blocks by replacing them with placeholders.
+
+    This prevents note patterns from being detected inside code blocks.
+
+    Args:
+        markdown: The markdown content to process
+        code_blocks: List to store protected code blocks (modified in place)
+        source_map: Records the replaced code blocks, to locate positions of the protected markdown in the page
+
+    Returns:
+        Markdown with code blocks replaced by placeholders
+    """
+
+    def save_code_block(match: re.Match[str]) -> str:
+        code_blocks.append(match.group(0))
+        return f"<<<CODE_BLOCK_{len(code_blocks) - 1}>>>"
+
+    if source_map is not None:
+        return source_map.sub(CODE_BLOCK_PATTERN, save_code_block, markdown)
+    return CODE_BLOCK_PATTERN.sub(save_code_block, markdown)
+
+
+def restore_code_blocks(markdown: str, code_blocks: Sequence[str]) -> str:
+    """
+    Restore code blocks from placeholders.
+
+    Every placeholder is replaced in a single pass, so a page with many code blocks is not rescanned once per block.
+    Text that only looks like a placeholder, with no matching code block, is left as is.
+
+    Args:
+        markdown: The markdown content with placeholders
+        code_blocks: List of protected code blocks to restore
+
+    Returns:
+        Markdown with code blocks restored
+    """
+    if not code_blocks:
+        return markdown
+
+    def restore_code_block(match: re.Match[str]) -> str:
+        index = int(match.group(1))
+        return code_blocks[index] if index < len(code_blocks) else match.group(0)
+
+    return PLACEHOLDER_PATTERN.sub(restore_code_block, markdown)
+
+
+def strip_notes(markdown: str) -> str:
+    """
+    Remove every note definition and reference from markdown, leaving code blocks untouched.
+
+    This is the whole of the plugin's work in strip mode: no notes are collected and no anchors are inserted, so
+    definitions and references are removed together in one pass. Pages without notes are returned as is.
+
+    Args:
+        markdown: The markdown content to process
+
+    Returns:
+        Markdown without editor notes
+    """
+    if "[^" not in markdown:
+        return markdown
+
+    code_blocks: list[str] = []
+    markdown = protect_code_blocks(markdown, code_blocks)
+    markdown = NOTE_STRIP_PATTERN.sub("", markdown)
+    markdown = BLANK_RUN_PATTERN.sub("\n\n", markdown)
+    return restore_code_blocks(markdown, code_blocks)
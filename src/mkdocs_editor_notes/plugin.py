@@ -1,46 +1,368 @@
 """MkDocs plugin for aggregating editor notes."""
 
+import json
+import os
 import re
+import sys
+from enum import StrEnum, auto
 from pathlib import Path
-from typing import Any, Callable, cast, override
+from typing import TYPE_CHECKING, Any, Callable, cast, override
 
-import snick
-from jinja2 import Environment
 from mkdocs.config import config_options
-from mkdocs.config.base import Config
+from mkdocs.config.base import Config, ConfigErrors, ConfigWarnings
 from mkdocs.config.config_options import Type
 from mkdocs.config.defaults import MkDocsConfig
-from mkdocs.plugins import BasePlugin, get_plugin_logger
-from mkdocs.structure.files import Files
+from mkdocs.exceptions import PluginError
+from mkdocs.plugins import EVENTS, BasePlugin, event_priority, get_plugin_logger
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
+from mkdocs.utils import get_relative_url
 
+from mkdocs_editor_notes import parser
+from mkdocs_editor_notes.assets import client_assets
+from mkdocs_editor_notes.budget import PageBudgetExceeded, PageTimer
+from mkdocs_editor_notes.cache import OutputManifest, write_if_changed
 from mkdocs_editor_notes.constants import (
     DEFAULT_CUSTOM_EMOJI,
     FIXED_NOTE_TYPES,
+    NOTE_CHANGES_FILE,
+    NOTE_PREVIEWS_FILE,
+    PROFILE_ENV_VAR,
+    SEARCH_INDEX_FILE,
+    ProfileMode,
 )
+from mkdocs_editor_notes.diagnostics import NoteLocation
+from mkdocs_editor_notes.fragments import AggregatorFragments
+from mkdocs_editor_notes.i18n import ExtractionCache
 from mkdocs_editor_notes.manager import EditorNotesManager
 from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.render import NoteTextRenderer
+from mkdocs_editor_notes.store import MemoryNoteStore, NoteStore, SqliteNoteStore, StoreKind
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+    from mkdocs.structure.nav import Navigation
+
+    from mkdocs_editor_notes.history import SnapshotEntry
+    from mkdocs_editor_notes.profiling import HookProfiler
+    from mkdocs_editor_notes.view import NoteIndexView
 
 log = get_plugin_logger(__name__)
 
 MdxConfigs = dict[str, dict[str, Any]]
+NoteIndexCallback = Callable[["NoteIndexView"], None]
+
+
+class PluginMode(StrEnum):
+    """What the plugin does with the notes it finds."""
+
+    FULL = auto()
+    STRIP = auto()
+
+
+class ParseEngine(StrEnum):
+    """How notes are found in each page."""
+
+    REGEX = auto()
+    MARKDOWN = auto()
 
 
 class EditorNotesPluginConfig(Config):
+    mode: config_options.Choice[str] = config_options.Choice(tuple(PluginMode), default=PluginMode.FULL)
+    engine: config_options.Choice[str] = config_options.Choice(tuple(ParseEngine), default=ParseEngine.REGEX)
     show_markers: Type[bool] = config_options.Type(bool, default=False)
     note_type_emojis: Type[dict[str, str]] = config_options.Type(dict, default={})
     aggregator_page: Type[str] = config_options.Type(str, default="editor-notes.md")
     highlight_duration: Type[int] = config_options.Type(int, default=3000)
     highlight_fade_duration: Type[int] = config_options.Type(int, default=2000)
+    note_store: config_options.Choice[str] = config_options.Choice(tuple(StoreKind), default=StoreKind.MEMORY)
+    cache_dir: Type[str] = config_options.Type(str, default=".cache/editor-notes")
+    build_cache: Type[bool] = config_options.Type(bool, default=False)
+    search_index: Type[bool] = config_options.Type(bool, default=True)
+    note_previews: Type[bool] = config_options.Type(bool, default=False)
+    note_changes: Type[bool] = config_options.Type(bool, default=False)
+    precompress: Type[bool] = config_options.Type(bool, default=False)
+    streaming_threshold: Type[int] = config_options.Type(int, default=0)
+    page_time_budget: Type[int | float] = config_options.Type((int, float), default=0)
+    strict: Type[bool] = config_options.Type(bool, default=False)
+    git_blame: Type[bool] = config_options.Type(bool, default=False)
+    emit_shard: config_options.Optional[str] = config_options.Optional(config_options.Type(str))
+    shard_name: config_options.Optional[str] = config_options.Optional(config_options.Type(str))
+    shard_prefix: Type[str] = config_options.Type(str, default="")
+    merge_shards: config_options.ListOfItems[str] = config_options.ListOfItems(config_options.Type(str), default=[])
+    languages: config_options.ListOfItems[str] = config_options.ListOfItems(config_options.Type(str), default=[])
+    profile: config_options.ListOfItems[str] = config_options.ListOfItems(
+        config_options.Choice(tuple(ProfileMode)), default=[]
+    )
 
 
 class EditorNotesPlugin(BasePlugin[EditorNotesPluginConfig]):
     config: EditorNotesPluginConfig
     note_manager: EditorNotesManager
+    aggregator_fragments: AggregatorFragments
+    note_extractions: ExtractionCache | None
+    emitted_files: list[Path]
+    current_page: Page | None
+    current_source_page: Path
+    current_replacer: Callable[[re.Match[str]], str] | str
+    note_snapshot: "list[SnapshotEntry] | None"
+    notes_collected: bool
+    late_pages: list[Path]
+    note_index: "NoteIndexView | None"
+    note_index_callbacks: list[NoteIndexCallback]
 
     def __init__(self) -> None:
         super().__init__()
         self.note_manager = EditorNotesManager()
+        self.aggregator_fragments = AggregatorFragments()
+        self.note_extractions = None
+        self.emitted_files = []
+        self.current_page = None
+        self.current_source_page = Path()
+        self.current_replacer = ""
+        self.note_snapshot = None
+        self.notes_collected = False
+        self.late_pages = []
+        self.note_index = None
+        self.note_index_callbacks = []
+
+    @override
+    def load_config(
+        self, options: dict[str, Any], config_file_path: str | None = None
+    ) -> tuple[ConfigErrors, ConfigWarnings]:
+        """Load the plugin config and set up the hooks MkDocs should register for it.
+
+        In strip mode every hook except `on_page_markdown` is unhooked, and that one is replaced by a single removal
+        pass. If requested, every remaining hook is then wrapped with the profiler. Profiling is enabled by the
+        `profile` option or the `EDITOR_NOTES_PROFILE` environment variable (a comma separated list of modes, or
+        `all`). Hooks are set up here because MkDocs registers them right after loading the config, so a build never
+        goes through a hook (or a wrapper) it does not need at all.
+        """
+        self.reset_hooks()
+        errors, warnings = super().load_config(options, config_file_path)
+        if not errors and self.config.mode == PluginMode.STRIP:
+            self.enable_strip_mode()
+        modes = {ProfileMode(mode) for mode in self.config.profile}
+        if os.environ.get(PROFILE_ENV_VAR):
+            from mkdocs_editor_notes.profiling import modes_from_env
+
+            try:
+                modes |= modes_from_env()
+            except ValueError as err:
+                warnings.append(("profile", f"Ignoring invalid profile mode from the environment: {err}"))
+        if modes and not errors:
+            self.enable_profiling(modes)
+        return errors, warnings
+
+    def hook_names(self) -> list[str]:
+        return [name for name in dir(type(self)) if name.startswith("on_") and name[3:] in EVENTS]
+
+    def reset_hooks(self) -> None:
+        """Drop hooks set up by a previous config load, since MkDocs reuses this instance across serve rebuilds."""
+        for hook_name in self.hook_names():
+            vars(self).pop(hook_name, None)
+
+    def enable_strip_mode(self) -> None:
+        """Unhook everything but `on_page_markdown`, which then only removes notes from each page."""
+        for hook_name in self.hook_names():
+            setattr(self, hook_name, None)
+        setattr(self, "on_page_markdown", self.strip_page_markdown)
+
+    def strip_page_markdown(self, markdown: str, **_: object) -> str:
+        return parser.strip_notes(markdown)
+
+    def enable_profiling(self, modes: set[ProfileMode]) -> "HookProfiler":
+        from mkdocs_editor_notes.profiling import HookProfiler
+
+        profiler = HookProfiler(modes, self.get_cache_dir() / "profile")
+        for hook_name in self.hook_names():
+            hook = getattr(self, hook_name)
+            if hook is None:
+                continue
+            setattr(self, hook_name, profiler.wrap(hook_name, hook, finalize=hook_name == "on_post_build"))
+        return profiler
+
+    def get_config_dir(self) -> Path:
+        """Find the directory holding mkdocs.yml, which anchors all relative paths in the plugin config."""
+        config_file_path = self.config.config_file_path
+        return Path(config_file_path).parent if config_file_path else Path.cwd()
+
+    def get_cache_dir(self) -> Path:
+        return self.get_config_dir() / self.config.cache_dir
+
+    def diff_note_history(self) -> None:
+        """Compare this build's notes with the snapshot saved by the previous build, for the changes section."""
+        if not self.config.note_changes:
+            return
+
+        from mkdocs_editor_notes.history import diff_snapshots, load_snapshot
+
+        self.note_snapshot = self.note_manager.build_snapshot()
+        previous = load_snapshot(self.get_cache_dir() / "snapshot.json")
+        if previous is None:
+            log.debug("No snapshot from a previous build, so no note changes are shown")
+            return
+        self.note_manager.changes = diff_snapshots(previous, self.note_snapshot)
+
+    def save_note_history(self, site_dir: Path) -> None:
+        """Emit the diff file and save this build's snapshot for the next build to compare against."""
+        if self.note_snapshot is None:
+            return
+
+        from mkdocs_editor_notes.history import save_snapshot
+
+        changes = self.note_manager.changes
+        if changes is not None:
+            changes_path = site_dir / NOTE_CHANGES_FILE
+            write_if_changed(changes_path, json.dumps(changes.to_dict(), separators=(",", ":")).encode("utf-8"))
+            self.emitted_files.append(changes_path)
+        save_snapshot(self.get_cache_dir() / "snapshot.json", self.note_snapshot)
+        self.note_snapshot = None
+
+    def blame_notes(self, config: MkDocsConfig, pages: list[Path] | None = None) -> None:
+        """Attach the author and date of each note definition from `git blame` of its source file.
+
+        Args:
+            config: The MkDocs config
+            pages: Only blame the notes defined on these source pages, instead of every note
+        """
+        if not self.config.git_blame or self.note_manager.empty:
+            return
+
+        from mkdocs_editor_notes.blame import BlameError, blame_definitions
+
+        docs_dir = Path(config.docs_dir)
+        if pages is None:
+            notes = list(self.note_manager)
+        else:
+            notes = [note for page in pages for note in self.note_manager.store.by_page(page)]
+        if not notes:
+            return
+        sources = {(docs_dir / note.source_page).resolve() for note in notes}
+        try:
+            blamed = blame_definitions(
+                [path for path in sources if path.is_file()], cache_path=self.get_cache_dir() / "blame.json"
+            )
+        except BlameError as err:
+            log.warning(f"Skipping git blame for editor notes: {err}")
+            return
+
+        for note in notes:
+            key = self.note_manager.key(note.note_type, note.label)
+            info = blamed.get((docs_dir / note.source_page).resolve(), {}).get(key)
+            if info is None:
+                continue
+            note.author = info.author
+            note.author_time = info.author_time
+            self.note_manager.store.update(key, note)
+
+    def emit_shard(self, config: MkDocsConfig) -> None:
+        if self.config.emit_shard is None:
+            return
+
+        from mkdocs_editor_notes.shard import write_shard
+
+        shard_path = self.get_config_dir() / self.config.emit_shard
+        shard_name = self.config.shard_name or config.site_name
+        count = write_shard(shard_path, shard_name, self.note_manager, prefix=self.config.shard_prefix)
+        log.info(f"Wrote {count} editor notes to shard '{shard_name}' at {shard_path}")
+
+    def merge_shard_notes(self) -> None:
+        """Merge notes from the configured shard files into this build's notes."""
+        if not self.config.merge_shards:
+            return
+
+        from mkdocs_editor_notes.shard import merge_shards
+
+        config_dir = self.get_config_dir()
+        shard_paths = [path for pattern in self.config.merge_shards for path in sorted(config_dir.glob(pattern))]
+        result = merge_shards(shard_paths)
+        diagnostics = self.note_manager.diagnostics
+
+        for note in result.notes:
+            key = self.note_manager.key(note.note_type, note.label)
+            shard_locations = [NoteLocation(f"shard '{name}'") for name in result.duplicates.get(key, [])]
+            if key in self.note_manager.store:
+                first = diagnostics.definitions.get(key, NoteLocation("this build"))
+                for location in shard_locations or [NoteLocation(note.source_page.as_posix(), note.line_number)]:
+                    diagnostics.add_duplicate(key, first, location)
+                continue
+            for location in shard_locations[1:]:
+                diagnostics.add_duplicate(key, shard_locations[0], location)
+            self.note_manager.add(note)
+
+    def settle_outputs(self, paths: list[Path], site_dir: Path) -> None:
+        """Record generated files in the output manifest so unchanged ones keep their previous modification time."""
+        if not self.config.build_cache:
+            return
+        manifest = OutputManifest(self.get_cache_dir() / "outputs.json")
+        changed = [
+            path for path in paths if path.exists() and manifest.settle(path, path.relative_to(site_dir).as_posix())
+        ]
+        manifest.save()
+        log.debug(f"{len(changed)} of {len(paths)} editor notes output files changed")
+
+    def collect_notes(self, config: MkDocsConfig) -> None:
+        """Complete this build's notes once every page is processed: blame them, exchange shards and diff them.
+
+        This runs when MkDocs reaches the aggregator page, which is processed last, so the page is built with its final
+        content. Builds without an aggregator page run it from `on_env` instead.
+        """
+        if self.notes_collected:
+            return
+        self.notes_collected = True
+        self.blame_notes(config)
+        self.emit_shard(config)
+        self.merge_shard_notes()
+        self.diff_note_history()
+
+    def get_note_extractions(self) -> ExtractionCache | None:
+        """Get the extraction cache shared by the language builds of the site, if the site has several languages.
+
+        An i18n plugin runs a build for each language with the same plugin instance, so the cache outlives each build.
+        """
+        languages = self.config.languages
+        if not languages:
+            self.note_extractions = None
+        elif self.note_extractions is None or self.note_extractions.languages != languages:
+            self.note_extractions = ExtractionCache(languages)
+        else:
+            self.note_extractions.start()
+        return self.note_extractions
+
+    def subscribe(self, callback: NoteIndexCallback) -> None:
+        """Have `callback` called with a read-only view of the notes of every build, once they are all collected.
+
+        Other plugins register from their own hooks, typically `on_config`, and may register on every build: a callback
+        is only kept once.
+        """
+        if callback not in self.note_index_callbacks:
+            self.note_index_callbacks.append(callback)
+
+    def publish_note_index(self) -> None:
+        """Expose the collected notes as `note_index` and hand them to every subscribed callback."""
+        self.note_index = self.note_manager.index_view()
+        for callback in self.note_index_callbacks:
+            callback(self.note_index)
+
+    def report_diagnostics(self) -> None:
+        """Log the note problems found during the build as one grouped warning, and unused notes at info level.
+
+        Defining a note without referencing it is valid, so unused notes never fail a `mkdocs build --strict`. They only
+        fail the build through the plugin's own `strict` option.
+        """
+        diagnostics = self.note_manager.diagnostics
+        if diagnostics.warning_count:
+            log.warning(diagnostics.format_report())
+        if diagnostics.unused:
+            log.info(diagnostics.format_unused())
+
+    def make_store(self) -> NoteStore:
+        match StoreKind(self.config.note_store):
+            case StoreKind.MEMORY:
+                return MemoryNoteStore()
+            case StoreKind.SQLITE:
+                return SqliteNoteStore(self.get_cache_dir() / "notes.db")
 
     def is_fixed_type(self, note_type: str) -> bool:
         return note_type in FIXED_NOTE_TYPES
@@ -52,6 +374,8 @@ class EditorNotesPlugin(BasePlugin[EditorNotesPluginConfig]):
         if not self.config.show_markers:
             return ""
 
+        import snick
+
         aggregator_url = EditorNotesManager.get_aggregator_url(current_page, self.config.aggregator_page)
 
         def replacer(match: re.Match[str]):
@@ -60,12 +384,14 @@ class EditorNotesPlugin(BasePlugin[EditorNotesPluginConfig]):
 
             note: EditorNote | None = self.note_manager.get(note_type, note_label)
             if note:
+                # The preview text itself lives in the shared previews file, the marker only names its note
+                data_note = f' data-note="{note_type}:{note_label}"' if self.config.note_previews else ""
                 # Use single-line HTML to avoid breaking headings and other inline contexts
                 # (unwrap removes newlines but preserves readability in source)
                 return snick.unwrap(
                     f"""
                     <sup class="editor-note-marker">
-                        <a href="{aggregator_url}#{note.agg_id}" title="{note.hover_text}">
+                        <a href="{aggregator_url}#{note.agg_id}" title="{note.hover_text}"{data_note}>
                             {self.get_emoji(note_type)}
                         </a>
                     </sup>
@@ -76,73 +402,184 @@ class EditorNotesPlugin(BasePlugin[EditorNotesPluginConfig]):
 
         return replacer
 
+    @override
+    def on_startup(self, *, command: str, dirty: bool) -> None:
+        """Keep this plugin instance across `mkdocs serve` rebuilds.
+
+        MkDocs only reuses the instance of plugins that define this hook, and reusing it keeps the rendered aggregator
+        fragments in memory, so a rebuild only renders the fragments of the notes that changed.
+        """
+
+    @override
+    def on_config(self, config: MkDocsConfig) -> MkDocsConfig:
+        """Start each build with a fresh note manager backed by the configured store."""
+        text_renderer = NoteTextRenderer(
+            list(config.markdown_extensions),
+            cast(MdxConfigs, config.mdx_configs),
+            cache_path=self.get_cache_dir() / "rendered-notes.json" if self.config.build_cache else None,
+        )
+        self.note_manager = EditorNotesManager(
+            self.make_store(), text_renderer, self.aggregator_fragments, self.get_note_extractions()
+        )
+        self.emitted_files = []
+        self.notes_collected = False
+        self.late_pages = []
+        self.note_index = None
+
+        if self.config.engine == ParseEngine.MARKDOWN:
+            from mkdocs_editor_notes.extension import EditorNotesExtension
+
+            # Note text on the aggregator page is rendered without it, from the copy of the list taken above. The option
+            # is typed as a list of names, but Python-Markdown takes extension instances from it as well
+            extension = EditorNotesExtension(
+                definitions=self.define_rendered_note, references=self.replace_rendered_reference
+            )
+            config.markdown_extensions.append(extension)  # type: ignore[arg-type]  # pyright: ignore[reportArgumentType]
+        return config
+
+    def define_rendered_note(self, note_type: str, label: str, text: str) -> None:
+        """Add a note definition found by the Markdown extension engine in the page being rendered."""
+        page = self.current_page
+        if page is None:
+            return
+        note = EditorNote(
+            note_type=sys.intern(note_type),
+            label=label,
+            text=text,
+            source_page=self.current_source_page,
+            source_url=page.url or "",
+        )
+        self.note_manager.define(note, None)
+
+    def replace_rendered_reference(self, match: re.Match[str]) -> str:
+        """Build the HTML for a note reference found by the Markdown extension engine in the page being rendered."""
+        if self.current_page is None:
+            return ""
+        return self.note_manager.replace_reference(match, self.current_page, self.current_replacer)
+
     @override
     def on_files(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
         self, files: Files, config: MkDocsConfig
     ) -> Files:
-        """Add aggregator page to the files collection."""
-        EditorNotesManager.ensure_aggregator_file(config.docs_dir, self.config.aggregator_page)
-        EditorNotesManager.add_aggregator_to_files(
-            files,
-            self.config.aggregator_page,
-            config.docs_dir,
-            config.site_dir,
-            config.use_directory_urls,
-        )
-
+        """Add the aggregator page and the client assets to the files collection."""
+        EditorNotesManager.add_aggregator_to_files(files, config, self.config.aggregator_page)
+        for asset in client_assets():
+            files.append(File.generated(config, asset.path, content=asset.content))
         return files
 
+    @event_priority(-100)
+    @override
+    def on_nav(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
+        self, nav: "Navigation", config: MkDocsConfig, files: Files
+    ) -> "Navigation":
+        """Hold back the aggregator page until every other page is processed, after other plugins changed the files."""
+        EditorNotesManager.move_aggregator_last(files, self.config.aggregator_page)
+        return nav
+
     @override
     def on_page_markdown(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
         self, markdown: str, page: Page, config: MkDocsConfig, files: Files
     ) -> str | None:
         if self.note_manager.is_aggregator_page(page, self.config.aggregator_page):
-            return self.note_manager.handle_aggregator_page(page)
+            self.current_page = None
+            self.collect_notes(config)
+            return self.note_manager.handle_aggregator_page(page, self.get_emoji)
+        if self.note_manager.aggregator_page is not None:
+            self.late_pages.append(Path(page.file.src_uri))
+
+        if self.config.engine == ParseEngine.MARKDOWN:
+            # Notes are handled by the Markdown extension when MkDocs renders the page, right after this hook
+            self.current_page = page
+            self.current_source_page = Path(page.file.src_uri)
+            self.current_replacer = self.get_ref_replacer(page)
+            return markdown
+
+        threshold = self.config.streaming_threshold
+        if threshold and len(markdown) >= threshold:
+            return self.note_manager.process_page_markdown_streaming(markdown, page, self.get_ref_replacer(page))
+
+        if not self.config.page_time_budget:
+            return self.note_manager.process_page_markdown(markdown, page, self.get_ref_replacer(page))
+        return self.process_page_within_budget(markdown, page)
 
-        return self.note_manager.process_page_markdown(markdown, page, self.get_ref_replacer(page))
+    def process_page_within_budget(self, markdown: str, page: Page) -> str:
+        """Process a page with the regex engine, falling back to the streaming engine if it runs out of time.
+
+        The stages that only scan the page are abandoned as soon as the budget runs out, and the page is processed
+        again by the streaming engine, which reads it line by line in linear time. A page that goes over budget in a
+        later stage is finished as is.
+        """
+        budget = self.config.page_time_budget
+        timer = PageTimer(budget)
+        try:
+            output = self.note_manager.process_page_markdown(markdown, page, self.get_ref_replacer(page), timer)
+        except PageBudgetExceeded as err:
+            log.warning(
+                (
+                    f"{page.file.src_uri} ({len(markdown)} characters) went over the {budget}s page time budget in "
+                    f"the {err.stage} stage, processing it again with the streaming engine"
+                )
+            )
+            return self.note_manager.process_page_markdown_streaming(markdown, page, self.get_ref_replacer(page))
+        if timer.exceeded:
+            log.warning(
+                (
+                    f"{page.file.src_uri} ({len(markdown)} characters) took {timer.elapsed:.2f}s, over the {budget}s "
+                    f"page time budget, mostly in the {timer.slowest} stage"
+                )
+            )
+        return output
 
     @override
     def on_env(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
-        self, env: Environment, config: MkDocsConfig, files: Files
-    ) -> Environment:
-        """After all pages are processed, regenerate aggregator page."""
-        self.note_manager.regenerate_aggregator_content(
-            self.get_emoji,
-            config.markdown_extensions,
-            cast(MdxConfigs, config.mdx_configs),
-        )
+        self, env: "Environment", config: MkDocsConfig, files: Files
+    ) -> "Environment":
+        """After all pages are processed, report note problems and publish the notes to other plugins.
+
+        If a page was processed after the aggregator page, its notes are blamed and diffed here and the aggregator page
+        is rendered again to include them. The shard emitted and the shards merged when the aggregator was built are
+        not revisited, so they miss those notes.
+        """
+        self.collect_notes(config)
+        self.report_diagnostics()
+        if self.late_pages:
+            pages = ", ".join(page.as_posix() for page in self.late_pages)
+            log.info(f"Pages were processed after the editor notes aggregator page, so it is rendered again: {pages}")
+            if self.config.emit_shard is not None or self.config.merge_shards:
+                log.info(f"The shard emitted and the shards merged for this build miss the notes of: {pages}")
+            self.blame_notes(config, self.late_pages)
+            self.diff_note_history()
+            self.note_manager.regenerate_aggregator_content(self.get_emoji)
+        self.publish_note_index()
+        extractions = self.note_extractions
+        if extractions is not None:
+            log.debug(f"Reused the extracted notes of {extractions.hits} of {extractions.lookups} pages")
         return env
 
     @override
     def on_post_page(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
         self, output: str, page: Page, config: MkDocsConfig
     ) -> str:
-        """Inject CSS and JavaScript."""
-
-        static_dir = Path(__file__).parent / "static"
-        css_file = static_dir / "editor-notes.css"
-        js_file = static_dir / "editor-notes.js"
+        """Link the client assets and inject the site-wide client configuration.
 
-        css_content = css_file.read_text()
-        js_content = js_file.read_text()
+        The stylesheet and script are separate files with content-hashed names, so browsers fetch them once for the
+        whole site. The configuration is the same on every page: data file paths are relative to the site root, where
+        the script resolves them against its own URL.
+        """
+        import snick
 
+        css, js = client_assets()
+        client_config = dict(
+            highlightDuration=self.config.highlight_duration,
+            highlightFadeDuration=self.config.highlight_fade_duration,
+            searchIndexUrl=SEARCH_INDEX_FILE if self.config.search_index else None,
+            notePreviewsUrl=NOTE_PREVIEWS_FILE if self.config.note_previews else None,
+        )
         inject_content = snick.dedent(
             f"""
-            <style>
-            {css_content}
-            </style>
-
-            <script>
-            // Editor Notes Configuration
-            window.EDITOR_NOTES_CONFIG = {{
-                highlightDuration: {self.config.highlight_duration},
-                highlightFadeDuration: {self.config.highlight_fade_duration}
-            }};
-            </script>
-
-            <script>
-            {js_content}
-            </script>
+            <link rel="stylesheet" href="{get_relative_url(css.path, page.url)}">
+            <script>window.EDITOR_NOTES_CONFIG = {json.dumps(client_config)};</script>
+            <script src="{get_relative_url(js.path, page.url)}" defer></script>
             """
         )
 
@@ -150,3 +587,54 @@ class EditorNotesPlugin(BasePlugin[EditorNotesPluginConfig]):
             output = output.replace("</head>", f"{inject_content}</head>")
 
         return output
+
+    @override
+    def on_post_build(  # pyright: ignore[reportIncompatibleMethodOverride] - MkDocs uses dynamic hook discovery
+        self, config: MkDocsConfig
+    ) -> None:
+        """Persist the note index and emit the search index, note previews and note changes once the build is complete.
+
+        Every generated file is recorded in the output manifest, so files whose content did not change keep their
+        modification time from the previous build.
+
+        In strict mode, the build fails here if any note problems were reported, after every page has been written.
+        """
+        if self.note_manager.aggregator_page is not None:
+            self.emitted_files.append(Path(self.note_manager.aggregator_page.file.abs_dest_path))
+        self.emitted_files.extend(Path(config.site_dir) / asset.path for asset in client_assets())
+
+        if self.config.search_index and not self.note_manager.empty:
+            search_index_path = Path(config.site_dir) / SEARCH_INDEX_FILE
+            write_if_changed(search_index_path, self.note_manager.build_search_index().dumps().encode("utf-8"))
+            self.emitted_files.append(search_index_path)
+
+        if self.config.note_previews and not self.note_manager.empty:
+            previews_path = Path(config.site_dir) / NOTE_PREVIEWS_FILE
+            previews = json.dumps(self.note_manager.build_note_previews(), separators=(",", ":"), sort_keys=True)
+            write_if_changed(previews_path, previews.encode("utf-8"))
+            self.emitted_files.append(previews_path)
+
+        self.save_note_history(Path(config.site_dir))
+
+        outputs = list(self.emitted_files)
+        if self.config.precompress:
+            from mkdocs_editor_notes.compress import precompress, sibling_suffixes
+
+            precompress(self.emitted_files, self.get_cache_dir() / "precompress.json")
+            outputs.extend(
+                path.with_name(f"{path.name}{suffix}") for path in self.emitted_files for suffix in sibling_suffixes()
+            )
+
+        self.settle_outputs(outputs, Path(config.site_dir))
+
+        self.note_manager.text_renderer.save()
+        self.note_manager.store.close()
+
+        problem_count = self.note_manager.diagnostics.problem_count
+        if self.config.strict and problem_count:
+            raise PluginError(f"Editor notes found {problem_count} problem(s) and the strict option is enabled")
+
+    @override
+    def on_build_error(self, *, error: Exception) -> None:
+        """Close the note store when the build fails before `on_post_build` could."""
+        self.note_manager.store.close()
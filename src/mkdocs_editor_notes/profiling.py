@@ -0,0 +1,161 @@
+"""Opt-in cProfile and tracemalloc capture around the plugin's MkDocs hooks."""
+
+import functools
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from mkdocs.plugins import get_plugin_logger
+
+from mkdocs_editor_notes.constants import PROFILE_ENV_VAR, ProfileMode
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+log = get_plugin_logger(__name__)
+
+TOP_ALLOCATIONS = 25
+
+
+def parse_modes(values: Iterable[str]) -> set[ProfileMode]:
+    """Parse profile mode names, accepting `all` as a shortcut for every mode.
+
+    Raises:
+        ValueError: If a name is not a known profile mode
+    """
+    modes: set[ProfileMode] = set()
+    for value in values:
+        value = value.strip().lower()
+        if not value:
+            continue
+        if value == "all":
+            modes.update(ProfileMode)
+        else:
+            modes.add(ProfileMode(value))
+    return modes
+
+
+def modes_from_env() -> set[ProfileMode]:
+    return parse_modes(os.environ.get(PROFILE_ENV_VAR, "").split(","))
+
+
+@dataclass
+class HookStats:
+    """Measurements accumulated over every call of one hook."""
+
+    calls: int = 0
+    profile: "cProfile.Profile | None" = None
+    peak_bytes: int = 0
+    allocations: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+class HookProfiler:
+    """Wraps plugin hooks to record a cProfile profile and/or tracemalloc allocation summary for each hook.
+
+    Profiling is entirely absent unless enabled: hooks are only wrapped when at least one mode is requested, so a
+    normal build calls the original methods directly.
+    """
+
+    modes: set[ProfileMode]
+    reports_dir: Path
+    stats: dict[str, HookStats]
+    started_tracing: bool
+
+    def __init__(self, modes: set[ProfileMode], reports_dir: Path):
+        self.modes = modes
+        self.reports_dir = reports_dir
+        self.stats = {}
+        self.started_tracing = False
+
+    def wrap(self, hook_name: str, hook: Callable[..., Any], finalize: bool = False) -> Callable[..., Any]:
+        """Wrap one hook so each call is measured.
+
+        Args:
+            hook_name: Name used for the hook's report files
+            hook: The bound hook method to wrap
+            finalize: Write all reports after each call of this hook (use for the last hook of a build)
+        """
+        import cProfile
+        import tracemalloc
+
+        stats = self.stats.setdefault(hook_name, HookStats())
+
+        @functools.wraps(hook)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            stats.calls += 1
+            before: "tracemalloc.Snapshot | None" = None
+            if ProfileMode.TRACEMALLOC in self.modes:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self.started_tracing = True
+                tracemalloc.reset_peak()
+                before = tracemalloc.take_snapshot()
+            if ProfileMode.CPROFILE in self.modes:
+                stats.profile = stats.profile or cProfile.Profile()
+                stats.profile.enable()
+            try:
+                return hook(*args, **kwargs)
+            finally:
+                if stats.profile is not None:
+                    stats.profile.disable()
+                if before is not None:
+                    self.record_allocations(stats, before)
+                if finalize:
+                    self.write_reports()
+
+        return wrapper
+
+    @staticmethod
+    def record_allocations(stats: HookStats, before: "tracemalloc.Snapshot") -> None:
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        stats.peak_bytes = max(stats.peak_bytes, peak)
+        after = tracemalloc.take_snapshot()
+        for diff in after.compare_to(before, "lineno"):
+            if diff.size_diff <= 0:
+                continue
+            location = str(diff.traceback[0])
+            size, count = stats.allocations.get(location, (0, 0))
+            stats.allocations[location] = (size + diff.size_diff, count + diff.count_diff)
+
+    def write_reports(self) -> list[Path]:
+        """Write a `.prof` file and an allocation summary for each hook that was called.
+
+        Returns:
+            The report files that were written
+        """
+        import tracemalloc
+
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+        for hook_name, stats in self.stats.items():
+            if stats.calls == 0:
+                continue
+            if stats.profile is not None:
+                prof_path = self.reports_dir / f"{hook_name}.prof"
+                stats.profile.dump_stats(prof_path)
+                written.append(prof_path)
+            if ProfileMode.TRACEMALLOC in self.modes:
+                summary_path = self.reports_dir / f"{hook_name}.tracemalloc.txt"
+                summary_path.write_text(self.format_allocations(hook_name, stats))
+                written.append(summary_path)
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        log.info(f"Wrote {len(written)} editor notes profiling reports to {self.reports_dir}")
+        return written
+
+    @staticmethod
+    def format_allocations(hook_name: str, stats: HookStats) -> str:
+        lines = [
+            f"{hook_name}: {stats.calls} calls, peak {stats.peak_bytes / 1024:.1f} KiB traced",
+            f"Top {TOP_ALLOCATIONS} allocation sites (net growth summed over all calls):",
+        ]
+        top = sorted(stats.allocations.items(), key=lambda item: item[1][0], reverse=True)[:TOP_ALLOCATIONS]
+        for location, (size, count) in top:
+            lines.append(f"{size / 1024:10.1f} KiB {count:8d} blocks  {location}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,80 @@
+"""Memoized Markdown rendering of note bodies for the aggregator page."""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from mkdocs_editor_notes.cache import dump_json, hash_text, load_json
+
+if TYPE_CHECKING:
+    from markdown import Markdown
+
+MdxConfigs = dict[str, dict[str, Any]]
+
+
+class NoteTextRenderer:
+    """Renders note text to HTML through a single reusable Markdown converter.
+
+    Results are memoized by a hash of the note text plus the extension configuration, and the memo table can be
+    persisted between builds so only new or edited notes pay for a conversion. Entries that were not used during a
+    build are dropped when the table is saved, which keeps it from growing without bound.
+    """
+
+    extensions: list[Any]
+    extension_configs: MdxConfigs
+    cache_path: Path | None
+    config_hash: str
+    memo: dict[str, str]
+    used: set[str]
+    misses: int
+    _markdown: "Markdown | None"
+
+    def __init__(
+        self,
+        extensions: list[Any] | None = None,
+        extension_configs: MdxConfigs | None = None,
+        cache_path: Path | None = None,
+    ):
+        self.extensions = extensions or []
+        self.extension_configs = extension_configs or {}
+        self.cache_path = cache_path
+        self.config_hash = hash_text(
+            json.dumps([self.extensions, self.extension_configs], sort_keys=True, default=self.describe)
+        )
+        self.memo = load_json(cache_path, {}) if cache_path is not None else {}
+        self.used = set()
+        self.misses = 0
+        self._markdown = None
+
+    @staticmethod
+    def describe(value: Any) -> str:
+        # Extension instances and callables have no stable repr, so identify them by type
+        return f"{type(value).__module__}.{type(value).__qualname__}"
+
+    @property
+    def markdown(self) -> "Markdown":
+        """The shared converter, created on first use so the Markdown package is only imported when needed."""
+        if self._markdown is None:
+            from markdown import Markdown
+
+            self._markdown = Markdown(extensions=self.extensions, extension_configs=self.extension_configs)
+        return self._markdown
+
+    def key(self, text: str) -> str:
+        return hash_text(f"{self.config_hash}\0{text}")
+
+    def render(self, text: str) -> str:
+        key = self.key(text)
+        self.used.add(key)
+        html = self.memo.get(key)
+        if html is None:
+            self.misses += 1
+            html = self.markdown.reset().convert(text)
+            self.memo[key] = html
+        return html
+
+    def save(self) -> None:
+        """Persist the memo table, keeping only the entries used in this build."""
+        if self.cache_path is None:
+            return
+        dump_json(self.cache_path, {key: html for key, html in self.memo.items() if key in self.used})
@@ -0,0 +1,56 @@
+"""Compact inverted index used by the aggregator page to filter notes in the browser."""
+
+import json
+from typing import Any
+
+from mkdocs_editor_notes.constants import SEARCH_TOKEN_PATTERN
+from mkdocs_editor_notes.note import EditorNote
+
+
+class NoteSearchIndex:
+    """Inverted index over note type, label, source page and text tokens.
+
+    Each note is assigned a small integer id when it is added. Postings map each facet value or token to the ids of the
+    notes that contain it, so the client can filter by intersecting lists instead of searching the DOM.
+    """
+
+    entries: list[str]
+    types: dict[str, list[int]]
+    pages: dict[str, list[int]]
+    tokens: dict[str, list[int]]
+
+    def __init__(self):
+        self.entries = []
+        self.types = {}
+        self.pages = {}
+        self.tokens = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def tokenize(text: str) -> set[str]:
+        return set(SEARCH_TOKEN_PATTERN.findall(text.lower()))
+
+    def add(self, note: EditorNote) -> None:
+        note_id = len(self.entries)
+        page = note.source_page.as_posix()
+        self.entries.append(note.agg_id)
+        self.types.setdefault(note.note_type, []).append(note_id)
+        self.pages.setdefault(page, []).append(note_id)
+
+        words = self.tokenize(f"{note.note_type} {note.label} {page} {note.text}")
+        for token in sorted(words):
+            self.tokens.setdefault(token, []).append(note_id)
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(
+            entries=self.entries,
+            types=self.types,
+            pages=self.pages,
+            tokens=self.tokens,
+        )
+
+    def dumps(self) -> str:
+        """Serialize the index as compact JSON for the client script."""
+        return json.dumps(self.to_dict(), separators=(",", ":"), sort_keys=True)
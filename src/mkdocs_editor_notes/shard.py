@@ -0,0 +1,109 @@
+"""Serialized note shards for combining notes collected by separate MkDocs builds.
+
+A shard is a JSON Lines file: a header line naming the shard, followed by one note per line sorted by note key. Because
+every shard is sorted, any number of shards can be combined with a streaming k-way merge that never holds more than one
+note per shard in memory while merging, and duplicate keys show up as adjacent entries.
+"""
+
+import heapq
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from pathlib import Path, PurePosixPath
+
+from mkdocs_editor_notes.cache import write_if_changed
+from mkdocs_editor_notes.note import EditorNote
+
+SHARD_VERSION = 1
+
+
+@dataclass
+class ShardEntry:
+    key: str
+    shard: str
+    note: EditorNote
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging several shards.
+
+    Attributes:
+        notes: The merged notes in key order; the first shard (in argument order) wins for a duplicated key
+        duplicates: Map of each duplicated key to the names of every shard that defines it
+    """
+
+    notes: list[EditorNote] = field(default_factory=list)
+    duplicates: dict[str, list[str]] = field(default_factory=dict)
+
+
+def note_key(note: EditorNote) -> str:
+    return f"{note.note_type}:{note.label}"
+
+
+def prefix_note(note: EditorNote, prefix: str) -> EditorNote:
+    """Relocate a note under a sub-path so it links correctly from a combined aggregator."""
+    if not prefix:
+        return note
+    prefix = prefix.strip("/")
+    return replace(
+        note,
+        source_page=Path(PurePosixPath(prefix) / note.source_page.as_posix()),
+        source_url=f"{prefix}/{note.source_url}",
+    )
+
+
+def write_shard(path: Path, name: str, notes: Iterable[EditorNote], prefix: str = "") -> int:
+    """Write notes to a shard file, sorted by key, leaving the file untouched if its content would not change.
+
+    Args:
+        path: Destination shard file
+        name: Name that identifies this shard in merge reports
+        notes: The notes to write
+        prefix: Optional sub-path prepended to each note's source page and URL
+
+    Returns:
+        The number of notes written
+    """
+    ordered = sorted((prefix_note(note, prefix) for note in notes), key=note_key)
+    lines = [json.dumps(dict(shard=name, version=SHARD_VERSION))]
+    lines.extend(json.dumps(dict(key=note_key(note), note=note.to_dict())) for note in ordered)
+    write_if_changed(path, "".join(f"{line}\n" for line in lines).encode("utf-8"))
+    return len(ordered)
+
+
+def read_shard(path: Path) -> Iterator[ShardEntry]:
+    """Stream the entries of a shard file in key order.
+
+    Raises:
+        ValueError: If the file is not a shard written by a compatible version
+    """
+    with path.open() as file:
+        header = json.loads(file.readline() or "{}")
+        if header.get("version") != SHARD_VERSION:
+            raise ValueError(f"{path} is not a version {SHARD_VERSION} editor notes shard")
+        name = header["shard"]
+        for line in file:
+            entry = json.loads(line)
+            yield ShardEntry(key=entry["key"], shard=name, note=EditorNote.from_dict(entry["note"]))
+
+
+def _keyed_entries(entries: Iterator[ShardEntry], position: int) -> Iterator[tuple[str, int, ShardEntry]]:
+    # The shard position breaks ties between equal keys so that earlier shards win
+    for entry in entries:
+        yield entry.key, position, entry
+
+
+def merge_shards(paths: Iterable[Path]) -> MergeResult:
+    """K-way merge the given shards into one key-ordered list of notes, collecting cross-shard duplicate keys."""
+    result = MergeResult()
+    streams = [_keyed_entries(read_shard(path), position) for position, path in enumerate(paths)]
+    previous: ShardEntry | None = None
+    for _, _, entry in heapq.merge(*streams):
+        if previous is not None and entry.key == previous.key:
+            shards = result.duplicates.setdefault(entry.key, [previous.shard])
+            shards.append(entry.shard)
+            continue
+        result.notes.append(entry.note)
+        previous = entry
+    return result
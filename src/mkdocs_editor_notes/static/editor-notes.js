@@ -1,48 +1,246 @@
-function clearAllHighlights() {
-    document.querySelectorAll('.editor-note-highlight').forEach(el => {
-        el.classList.remove('editor-note-highlight');
-        el.classList.remove('editor-note-highlight-fade');
-    });
+// Loaded once per site as a cached file. Event listeners are delegated from the document, so they keep working when a
+// theme swaps the page content in place (mkdocs-material's instant navigation), and per-page setup runs on each load.
+
+const CONFIG = window.EDITOR_NOTES_CONFIG || {};
+
+// The data files sit next to this script at the site root
+const SITE_ROOT = document.currentScript ? document.currentScript.src : window.location.href;
+
+function siteUrl(path) {
+    return new URL(path, SITE_ROOT).href;
+}
+
+const jsonFiles = new Map();
+
+// Each data file is shared by every page, so it is fetched at most once
+function loadJson(path) {
+    if (!jsonFiles.has(path)) {
+        jsonFiles.set(path, fetch(siteUrl(path)).then(response => response.json()));
+    }
+    return jsonFiles.get(path);
+}
+
+document.documentElement.style.setProperty('--editor-note-highlight-duration', `${CONFIG.highlightDuration ?? 3000}ms`);
+document.documentElement.style.setProperty('--editor-note-fade-duration', `${CONFIG.highlightFadeDuration ?? 2000}ms`);
+if (CONFIG.notePreviewsUrl) {
+    document.documentElement.classList.add('editor-notes-previews');
+}
+
+// Highlighting: the fade is a CSS animation, and only the one highlighted element is ever tracked
+
+let highlighted = null;
+
+function clearHighlight() {
+    highlighted?.classList.remove('editor-note-highlight');
+    highlighted = null;
 }
 
 function highlightTarget() {
-    clearAllHighlights();
+    clearHighlight();
 
-    const hash = window.location.hash;
-    if (!hash) return;
+    const id = decodeURIComponent(window.location.hash.slice(1));
+    if (!id) return;
 
-    const target = document.querySelector(hash);
+    const target = document.getElementById(id);
     if (!target) {
-        console.warn(`[editor-notes] Target element not found for hash: ${hash}`);
+        console.warn(`[editor-notes] Target element not found for hash: #${id}`);
         return;
     }
 
     let elementToHighlight = null;
-
-    const config = window.EDITOR_NOTES_CONFIG || {};
-    const HIGHLIGHT_DURATION = config.highlightDuration || 3000; // Stay at full color for 3 seconds
-    const FADE_DURATION = config.highlightFadeDuration || 2000; // Fade for 2 seconds
-
-    if (target.id.startsWith('ref-')) {
+    if (id.startsWith('ref-')) {
         elementToHighlight = target.parentElement;
-    } else if (target.id.startsWith('agg-')) {
+    } else if (id.startsWith('agg-')) {
         elementToHighlight = target.closest('.editor-note-entry');
-    } else {
-        console.warn(`[editor-notes] Unrecognized target ID format: ${target.id} (expected 'ref-*' or 'agg-*')`);
     }
+    if (!elementToHighlight) return;
 
-    if (elementToHighlight) {
-        elementToHighlight.classList.add('editor-note-highlight');
-        setTimeout(() => {
-            elementToHighlight.classList.add('editor-note-highlight-fade');
-        }, HIGHLIGHT_DURATION);
-        setTimeout(() => {
-            elementToHighlight.classList.remove('editor-note-highlight');
-            elementToHighlight.classList.remove('editor-note-highlight-fade');
-        }, HIGHLIGHT_DURATION + FADE_DURATION);
-        target.scrollIntoView({ behavior: 'smooth', block: 'center' });
-    }
+    // Reading the layout between removing and adding the class restarts the animation on the same element
+    elementToHighlight.classList.remove('editor-note-highlight');
+    void elementToHighlight.offsetWidth;
+    elementToHighlight.classList.add('editor-note-highlight');
+    highlighted = elementToHighlight;
+    target.scrollIntoView({ behavior: 'smooth', block: 'center' });
 }
 
-window.addEventListener('load', highlightTarget);
 window.addEventListener('hashchange', highlightTarget);
+
+document.addEventListener('animationend', event => {
+    if (event.target === highlighted && event.animationName === 'editor-note-highlight-fade') clearHighlight();
+});
+
+// Following a link to the hash already in the address bar fires no hashchange, so highlight it again
+document.addEventListener('click', event => {
+    const link = event.target.closest?.('a[href*="#"]');
+    if (link && link.hash && link.href === window.location.href) highlightTarget();
+});
+
+// Note previews: one popover for the site, shown from delegated hover and focus events
+
+let popover = null;
+let activeMarker = null;
+
+function previewMarker(event) {
+    return CONFIG.notePreviewsUrl ? event.target.closest?.('.editor-note-marker a[data-note]') : null;
+}
+
+async function showPreview(marker) {
+    activeMarker = marker;
+    let previews;
+    try {
+        previews = await loadJson(CONFIG.notePreviewsUrl);
+    } catch (error) {
+        console.warn(`[editor-notes] Could not load note previews from ${CONFIG.notePreviewsUrl}: ${error}`);
+        return;
+    }
+    const html = previews[marker.dataset.note];
+    if (activeMarker !== marker || !html) return;
+
+    if (!popover) {
+        popover = document.createElement('div');
+        popover.className = 'editor-note-popover';
+        popover.setAttribute('role', 'tooltip');
+    }
+    if (!popover.isConnected) document.body.append(popover);
+
+    const rect = marker.getBoundingClientRect();
+    popover.innerHTML = `<strong>${marker.title}</strong>${html}`;
+    popover.style.top = `${window.scrollY + rect.bottom + 4}px`;
+    popover.style.left = `${window.scrollX + rect.left}px`;
+    popover.hidden = false;
+}
+
+function hidePreview(event) {
+    if (!previewMarker(event)) return;
+    activeMarker = null;
+    if (popover) popover.hidden = true;
+}
+
+document.addEventListener('mouseover', event => {
+    const marker = previewMarker(event);
+    if (marker && marker !== activeMarker) showPreview(marker);
+});
+document.addEventListener('focusin', event => {
+    const marker = previewMarker(event);
+    if (marker) showPreview(marker);
+});
+document.addEventListener('mouseout', hidePreview);
+document.addEventListener('focusout', hidePreview);
+
+// Filtering on the aggregator page, from the prebuilt notes index
+
+function tokenize(text) {
+    return text.toLowerCase().match(/[a-z0-9]+/g) || [];
+}
+
+function intersect(left, right) {
+    return new Set([...left].filter(id => right.has(id)));
+}
+
+async function setupNotesFilter() {
+    if (!CONFIG.searchIndexUrl) return;
+
+    const firstHeading = document.querySelector('.editor-note-entry')?.parentElement.querySelector('h2');
+    if (!firstHeading || firstHeading.parentElement.querySelector('.editor-notes-filter')) return;
+
+    let index;
+    try {
+        index = await loadJson(CONFIG.searchIndexUrl);
+    } catch (error) {
+        console.warn(`[editor-notes] Could not load notes index from ${CONFIG.searchIndexUrl}: ${error}`);
+        return;
+    }
+
+    const allIds = new Set(index.entries.map((_, id) => id));
+    const tokenKeys = Object.keys(index.tokens);
+    const typeIds = Object.fromEntries(Object.entries(index.types).map(([type, ids]) => [type, new Set(ids)]));
+    const entryElements = new Map();
+    let activeType = null;
+    let shownIds = allIds;
+
+    // Entries are looked up lazily so that only entries whose visibility changes ever touch the DOM
+    function entryElement(id) {
+        if (!entryElements.has(id)) {
+            const anchor = document.getElementById(index.entries[id]);
+            entryElements.set(id, anchor ? anchor.closest('.editor-note-entry') : null);
+        }
+        return entryElements.get(id);
+    }
+
+    function matchWord(word) {
+        const ids = new Set();
+        tokenKeys.filter(token => token.startsWith(word)).forEach(token => {
+            index.tokens[token].forEach(id => ids.add(id));
+        });
+        return ids;
+    }
+
+    const panel = document.createElement('div');
+    panel.className = 'editor-notes-filter';
+    const input = document.createElement('input');
+    input.type = 'search';
+    input.placeholder = 'Filter notes...';
+    const facets = document.createElement('div');
+    facets.className = 'editor-notes-facets';
+    panel.append(input, facets);
+    firstHeading.before(panel);
+
+    const facetButtons = new Map();
+    [null, ...Object.keys(index.types).sort()].forEach(type => {
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'editor-notes-facet';
+        button.dataset.type = type || '';
+        facets.append(button);
+        facetButtons.set(type, button);
+    });
+
+    facets.addEventListener('click', event => {
+        const button = event.target.closest('.editor-notes-facet');
+        if (!button) return;
+        const type = button.dataset.type || null;
+        activeType = activeType === type ? null : type;
+        applyFilter();
+    });
+
+    function applyFilter() {
+        let matchedIds = allIds;
+        tokenize(input.value).forEach(word => {
+            matchedIds = intersect(matchedIds, matchWord(word));
+        });
+        const visibleIds = activeType ? intersect(matchedIds, typeIds[activeType]) : matchedIds;
+
+        shownIds.forEach(id => {
+            if (!visibleIds.has(id)) entryElement(id)?.setAttribute('hidden', '');
+        });
+        visibleIds.forEach(id => {
+            if (!shownIds.has(id)) entryElement(id)?.removeAttribute('hidden');
+        });
+        shownIds = visibleIds;
+
+        facetButtons.forEach((button, type) => {
+            const count = type ? intersect(matchedIds, typeIds[type]).size : matchedIds.size;
+            button.textContent = `${type || 'all'} (${count})`;
+            button.setAttribute('aria-pressed', String(activeType === type));
+        });
+    }
+
+    input.addEventListener('input', applyFilter);
+    applyFilter();
+}
+
+// Per-page setup, run on the initial load and after every instant navigation
+
+function setupPage() {
+    highlightTarget();
+    setupNotesFilter();
+}
+
+if (window.document$ && typeof window.document$.subscribe === 'function') {
+    // mkdocs-material emits on the initial load and on each instant navigation
+    window.document$.subscribe(setupPage);
+} else if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', setupPage);
+} else {
+    setupPage();
+}
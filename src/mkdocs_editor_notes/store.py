@@ -0,0 +1,249 @@
+"""Storage backends for collected editor notes."""
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Generator
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import TYPE_CHECKING, override
+
+from mkdocs_editor_notes.note import EditorNote
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class StoreKind(StrEnum):
+    """Available note storage backends."""
+
+    MEMORY = auto()
+    SQLITE = auto()
+
+
+class NoteStore(ABC):
+    """Interface shared by all note storage backends.
+
+    Notes are addressed by the key built by `EditorNotesManager.key()`. Iteration yields notes in the order they were
+    added.
+    """
+
+    @abstractmethod
+    def __iter__(self) -> Generator[EditorNote, None, None]: ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def __contains__(self, note_key: object) -> bool: ...
+
+    @abstractmethod
+    def add(self, note_key: str, note: EditorNote) -> None:
+        """Store a new note under the given key."""
+
+    @abstractmethod
+    def update(self, note_key: str, note: EditorNote) -> None:
+        """Persist changes made to a note that was previously added."""
+
+    @abstractmethod
+    def get(self, note_key: str) -> EditorNote | None:
+        """Fetch a note by key or return None if it is not stored."""
+
+    @abstractmethod
+    def types(self) -> Generator[str, None, None]:
+        """Yield each distinct note type."""
+
+    @abstractmethod
+    def by_type(self, note_type: str) -> Generator[EditorNote, None, None]:
+        """Yield the notes of one type in insertion order."""
+
+    @abstractmethod
+    def by_page(self, source_page: Path) -> Generator[EditorNote, None, None]:
+        """Yield the notes defined on one source page in insertion order."""
+
+    def flush(self) -> None:
+        """Write any pending changes to the backing storage."""
+
+    def close(self) -> None:
+        """Flush pending changes and release any resources held by the store."""
+        self.flush()
+
+    @property
+    def notes_map(self) -> dict[str, EditorNote]:
+        return {f"{note.note_type}:{note.label}": note for note in self}
+
+    @property
+    def type_map(self) -> dict[str, set[str]]:
+        type_map: dict[str, set[str]] = {}
+        for note in self:
+            type_map.setdefault(note.note_type, set()).add(f"{note.note_type}:{note.label}")
+        return type_map
+
+
+class MemoryNoteStore(NoteStore):
+    """Default backend that keeps every note in Python dictionaries for the whole build.
+
+    Besides the notes by key, the store keeps the keys of each type and of each source page in insertion order, so
+    `by_type` and `by_page` only visit the notes they yield.
+    """
+
+    _notes_map: dict[str, EditorNote]
+    _type_map: dict[str, set[str]]
+    _type_keys: dict[str, list[str]]
+    _page_keys: dict[Path, list[str]]
+
+    def __init__(self):
+        self._notes_map = {}
+        self._type_map = {}
+        self._type_keys = {}
+        self._page_keys = {}
+
+    @override
+    def __iter__(self) -> Generator[EditorNote, None, None]:
+        yield from self._notes_map.values()
+
+    @override
+    def __len__(self) -> int:
+        return len(self._notes_map)
+
+    @override
+    def __contains__(self, note_key: object) -> bool:
+        return note_key in self._notes_map
+
+    @property
+    @override
+    def notes_map(self) -> dict[str, EditorNote]:
+        return self._notes_map
+
+    @property
+    @override
+    def type_map(self) -> dict[str, set[str]]:
+        return self._type_map
+
+    @override
+    def add(self, note_key: str, note: EditorNote) -> None:
+        self._notes_map[note_key] = note
+        self._type_map.setdefault(note.note_type, set()).add(note_key)
+        self._type_keys.setdefault(note.note_type, []).append(note_key)
+        self._page_keys.setdefault(note.source_page, []).append(note_key)
+
+    @override
+    def update(self, note_key: str, note: EditorNote) -> None:
+        self._notes_map[note_key] = note
+
+    @override
+    def get(self, note_key: str) -> EditorNote | None:
+        return self._notes_map.get(note_key)
+
+    @override
+    def types(self) -> Generator[str, None, None]:
+        yield from self._type_map.keys()
+
+    @override
+    def by_type(self, note_type: str) -> Generator[EditorNote, None, None]:
+        yield from (self._notes_map[note_key] for note_key in self._type_keys.get(note_type, []))
+
+    @override
+    def by_page(self, source_page: Path) -> Generator[EditorNote, None, None]:
+        yield from (self._notes_map[note_key] for note_key in self._page_keys.get(source_page, []))
+
+
+class SqliteNoteStore(NoteStore):
+    """Backend that spills notes into a local SQLite file.
+
+    The table is indexed on type, label and source page so that aggregator queries never need the full note set in
+    memory. The database file is kept after the build so the index can be inspected or queried by other tools. Any
+    notes left over from a previous build are cleared when the store is opened.
+
+    The store is opened when a build is configured and must be closed when it ends, whether it succeeds or fails.
+    """
+
+    path: Path
+    connection: "sqlite3.Connection"
+    closed: bool
+
+    SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            note_key TEXT NOT NULL UNIQUE,
+            note_type TEXT NOT NULL,
+            label TEXT NOT NULL,
+            source_page TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS notes_type_idx ON notes (note_type);
+        CREATE INDEX IF NOT EXISTS notes_label_idx ON notes (label);
+        CREATE INDEX IF NOT EXISTS notes_page_idx ON notes (source_page);
+    """
+
+    def __init__(self, path: Path | str):
+        import sqlite3
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute("DELETE FROM notes")
+        self.closed = False
+
+    @override
+    def __iter__(self) -> Generator[EditorNote, None, None]:
+        yield from self._select("SELECT data FROM notes ORDER BY id")
+
+    @override
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM notes").fetchone()
+        return count
+
+    @override
+    def __contains__(self, note_key: object) -> bool:
+        row = self.connection.execute("SELECT 1 FROM notes WHERE note_key = ?", (note_key,)).fetchone()
+        return row is not None
+
+    def _select(self, query: str, *params: str) -> Generator[EditorNote, None, None]:
+        for (data,) in self.connection.execute(query, params):
+            yield EditorNote.from_dict(json.loads(data))
+
+    @override
+    def add(self, note_key: str, note: EditorNote) -> None:
+        self.connection.execute(
+            "INSERT INTO notes (note_key, note_type, label, source_page, data) VALUES (?, ?, ?, ?, ?)",
+            (note_key, note.note_type, note.label, note.source_page.as_posix(), json.dumps(note.to_dict())),
+        )
+
+    @override
+    def update(self, note_key: str, note: EditorNote) -> None:
+        self.connection.execute(
+            "UPDATE notes SET data = ? WHERE note_key = ?",
+            (json.dumps(note.to_dict()), note_key),
+        )
+
+    @override
+    def get(self, note_key: str) -> EditorNote | None:
+        return next(self._select("SELECT data FROM notes WHERE note_key = ?", note_key), None)
+
+    @override
+    def types(self) -> Generator[str, None, None]:
+        for (note_type,) in self.connection.execute("SELECT DISTINCT note_type FROM notes ORDER BY note_type"):
+            yield note_type
+
+    @override
+    def by_type(self, note_type: str) -> Generator[EditorNote, None, None]:
+        yield from self._select("SELECT data FROM notes WHERE note_type = ? ORDER BY id", note_type)
+
+    @override
+    def by_page(self, source_page: Path) -> Generator[EditorNote, None, None]:
+        yield from self._select("SELECT data FROM notes WHERE source_page = ? ORDER BY id", source_page.as_posix())
+
+    @override
+    def flush(self) -> None:
+        self.connection.commit()
+
+    @override
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,270 @@
+"""Chunked streaming engine for note definitions and references.
+
+The regex pipeline in `EditorNotesManager.process_page_markdown` holds several full-size copies of a page at once. This
+engine instead reads the page in bounded chunks and works one logical line at a time, carrying the scanner state (an
+open code fence, a definition still collecting text) across chunk boundaries. Only the output pieces and the line that
+is currently being assembled are held in memory.
+
+It reproduces the regex pipeline's output with one deliberate difference: a code fence that is never closed runs to the
+end of the document (as it does in Markdown) instead of being re-scanned as plain text, which keeps the engine linear.
+
+Like the parsing core, this module only depends on the standard library.
+"""
+
+import codecs
+import mmap
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mkdocs_editor_notes.constants import STREAM_CHUNK_SIZE
+
+FENCE_MARKERS = ("```", "~~~")
+
+JOIN_BLOCK_SIZE = 1 << 16
+
+DEF_START_PATTERN = re.compile(r"\[\^(?P<type>[a-z]+):(?P<label>[a-z0-9\-_]+)\]:")
+
+PLACEHOLDER = "<<<CODE_BLOCK_{}>>>"
+
+PLACEHOLDER_PATTERN = re.compile(r"<<<CODE_BLOCK_(\d+)>>>")
+
+
+@dataclass(slots=True)
+class LogicalLine:
+    """One line of markdown with any code blocks on it replaced by placeholders.
+
+    A code block that spans several physical lines belongs to the logical line on which it opens, so the placeholder
+    text never contains protected content and never needs more than one line of context.
+
+    Attributes:
+        text: The line with its code blocks replaced by placeholders
+        code_blocks: The protected code blocks, in line order
+        line_number: The physical line the logical line starts on (one-based), or 0 for a line made up by the engine
+        resumes: Where the text after each placeholder resumes: its position in `text`, then its physical line and
+            the zero-based position on that line
+    """
+
+    text: str = ""
+    code_blocks: list[str] = field(default_factory=list)
+    line_number: int = 0
+    resumes: list[tuple[int, int, int]] = field(default_factory=list)
+
+    def restore(self, text: str | None = None) -> str:
+        """Put the protected code blocks back into this line's text (or a rewritten version of it)."""
+        text = self.text if text is None else text
+        if not self.code_blocks:
+            return text
+        return PLACEHOLDER_PATTERN.sub(lambda match: self.code_blocks[int(match.group(1))], text)
+
+    def locate(self, position: int) -> tuple[int, int]:
+        """Find the physical line and column (both one-based) of a position in this line's text."""
+        line_number, shift = self.line_number, 0
+        for text_position, physical_line, physical_position in self.resumes:
+            if text_position > position:
+                break
+            line_number, shift = physical_line, physical_position - text_position
+        return line_number, position + shift + 1
+
+
+@dataclass(slots=True)
+class NoteDefinition:
+    note_type: str
+    label: str
+    text: str
+    line_number: int = 0
+
+
+def iter_text_chunks(text: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
+
+
+def iter_file_chunks(path: Path, chunk_size: int = STREAM_CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    """Decode a file in chunks straight from a memory map, without reading it into memory first."""
+    with path.open("rb") as file:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            for start in range(0, len(mapped), chunk_size):
+                chunk = decoder.decode(mapped[start : start + chunk_size])
+                if chunk:
+                    yield chunk
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+
+def iter_physical_lines(chunks: Iterable[str]) -> Iterator[tuple[str, bool]]:
+    """Yield each line without its newline, along with whether a newline followed it."""
+    partial = ""
+    for chunk in chunks:
+        buffer = partial + chunk if partial else chunk
+        start = 0
+        while (end := buffer.find("\n", start)) >= 0:
+            yield buffer[start:end], True
+            start = end + 1
+        partial = buffer[start:]
+    yield partial, False
+
+
+def iter_logical_lines(chunks: Iterable[str]) -> Iterator[LogicalLine]:
+    """Group chunks into logical lines, protecting fenced code the same way `CODE_BLOCK_PATTERN` does.
+
+    A fence opens at the earliest ``` or ~~~ anywhere on a line and closes at the next occurrence of the same marker.
+    """
+    line = LogicalLine(line_number=1)
+    pieces: list[str] = []
+    written = 0
+    code: list[str] = []
+    open_marker: str | None = None
+
+    for physical_number, (physical, has_newline) in enumerate(iter_physical_lines(chunks), start=1):
+        position = 0
+        while position <= len(physical):
+            if open_marker is not None:
+                close = physical.find(open_marker, position)
+                if close < 0:
+                    code.append(physical[position:])
+                    if has_newline:
+                        code.append("\n")
+                    break
+                code.append(physical[position : close + len(open_marker)])
+                position = close + len(open_marker)
+                placeholder = PLACEHOLDER.format(len(line.code_blocks))
+                pieces.append(placeholder)
+                written += len(placeholder)
+                line.resumes.append((written, physical_number, position))
+                line.code_blocks.append("".join(code))
+                code = []
+                open_marker = None
+                continue
+
+            starts = [(found, marker) for marker in FENCE_MARKERS if (found := physical.find(marker, position)) >= 0]
+            if not starts:
+                pieces.append(physical[position:])
+                line.text = "".join(pieces)
+                yield line
+                line = LogicalLine(line_number=physical_number + 1)
+                pieces = []
+                written = 0
+                break
+            start, open_marker = min(starts)
+            pieces.append(physical[position:start])
+            written += start - position
+            code.append(open_marker)
+            position = start + len(open_marker)
+
+    if open_marker is not None:
+        # An unclosed fence runs to the end of the document
+        pieces.append(PLACEHOLDER.format(len(line.code_blocks)))
+        line.code_blocks.append("".join(code))
+        line.text = "".join(pieces)
+        yield line
+
+
+def split_definitions(lines: Iterable[LogicalLine]) -> Iterator[LogicalLine | NoteDefinition]:
+    """Yield regular lines unchanged and collapse each note definition block into a single `NoteDefinition`.
+
+    This mirrors `NOTE_DEF_PATTERN`: a definition starts at the beginning of a line, any whitespace (including blank
+    lines) after the colon is skipped, and the text then runs until a whitespace-only line that is followed by another
+    line, a line starting with `[^`, or the end of the page.
+    """
+    definition: NoteDefinition | None = None
+    text_lines: list[str] = []
+    skipping_whitespace = False
+    # A blank line only ends a definition if another line follows it; at the end of the page it is part of the text
+    pending_blank: LogicalLine | None = None
+
+    for line in lines:
+        if definition is not None:
+            if skipping_whitespace:
+                if not line.text.strip():
+                    continue
+                skipping_whitespace = False
+                text_lines.append(line.restore())
+                continue
+            if pending_blank is None and line.text.strip() and not line.text.startswith("[^"):
+                text_lines.append(line.restore())
+                continue
+            if pending_blank is None and not line.text.strip():
+                pending_blank = line
+                continue
+            definition.text = "\n".join(text_lines).strip()
+            yield definition
+            definition = None
+            if pending_blank is not None:
+                yield pending_blank
+                pending_blank = None
+
+        match = DEF_START_PATTERN.match(line.text)
+        if match is None:
+            yield line
+            continue
+
+        rest = LogicalLine(line.text[match.end() :], line.code_blocks).restore()
+        definition = NoteDefinition(
+            note_type=match.group("type"), label=match.group("label"), text="", line_number=line.line_number
+        )
+        text_lines = [rest] if rest.strip() else []
+        skipping_whitespace = not rest.strip()
+
+    if definition is not None:
+        definition.text = "\n".join(text_lines).strip()
+        yield definition
+
+
+def iter_definitions(chunks: Iterable[str]) -> Iterator[NoteDefinition]:
+    for item in split_definitions(iter_logical_lines(chunks)):
+        if isinstance(item, NoteDefinition):
+            yield item
+
+
+def collapse_blank_lines(lines: Iterable[LogicalLine]) -> Iterator[LogicalLine]:
+    """Collapse runs of three or more newlines into two, as `re.sub(r"\\n\\n\\n+", "\\n\\n", ...)` does.
+
+    In line terms a run of empty lines shrinks to one between content, and to two at the start or end of the page.
+    """
+    pending = 0
+    seen_content = False
+    for line in lines:
+        if not line.text:
+            pending += 1
+            continue
+        for _ in range(min(pending, 1 if seen_content else 2)):
+            yield LogicalLine()
+        pending = 0
+        seen_content = True
+        yield line
+    for _ in range(min(pending, 2 if seen_content else 3)):
+        yield LogicalLine()
+
+
+def iter_output_lines(chunks: Iterable[str]) -> Iterator[LogicalLine]:
+    """Yield the page's lines with definitions removed and blank lines collapsed, ready for reference processing."""
+    stripped = (
+        LogicalLine() if isinstance(item, NoteDefinition) else item
+        for item in split_definitions(iter_logical_lines(chunks))
+    )
+    yield from collapse_blank_lines(stripped)
+
+
+def join_lines(lines: Iterable[str], block_size: int = JOIN_BLOCK_SIZE) -> str:
+    """Join lines with newlines, gathering them into blocks first so that no more than a block of small strings is alive
+    at once.
+    """
+    blocks: list[str] = []
+    pending: list[str] = []
+    pending_size = 0
+    for line in lines:
+        pending.append(line)
+        pending_size += len(line) + 1
+        if pending_size >= block_size:
+            blocks.append("\n".join(pending))
+            pending = []
+            pending_size = 0
+    if pending or not blocks:
+        blocks.append("\n".join(pending))
+    return "\n".join(blocks)
@@ -1,17 +1,25 @@
-import tomllib
-from importlib import metadata
+from functools import cache
+from pathlib import Path
+
+PYPROJECT_PATH = Path(__file__).parents[2] / "pyproject.toml"
 
 
 def get_version_from_metadata() -> str:
+    from importlib import metadata
+
     return metadata.version(__package__ or __name__)
 
 
 def get_version_from_pyproject() -> str:
-    with open("pyproject.toml", "rb") as file:
+    import tomllib
+
+    with open(PYPROJECT_PATH, "rb") as file:
         return tomllib.load(file)["project"]["version"]
 
 
 def get_version() -> str:
+    from importlib import metadata
+
     try:
         return get_version_from_metadata()
     except metadata.PackageNotFoundError:
@@ -21,4 +29,13 @@ def get_version() -> str:
             return "unknown"
 
 
-__version__ = get_version()
+@cache
+def _resolve_version() -> str:
+    return get_version()
+
+
+def __getattr__(name: str) -> str:
+    # The version is resolved on first access rather than at import time
+    if name == "__version__":
+        return _resolve_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,128 @@
+"""Read-only view of the notes collected in a build, for other plugins."""
+
+from collections.abc import Iterator, Mapping, Set
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import override
+
+from mkdocs_editor_notes.diagnostics import NoteDiagnostics
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.occurrences import NoteOccurrence, OccurrenceTable
+from mkdocs_editor_notes.store import NoteStore
+
+
+@dataclass(frozen=True)
+class NoteIndexStats:
+    """Counts over the notes collected in a build.
+
+    Attributes:
+        notes: Defined notes
+        types: Distinct note types
+        pages: Pages that define at least one note
+        references: References to defined notes, across every page
+        problems: Note problems reported for the build
+    """
+
+    notes: int
+    types: int
+    pages: int
+    references: int
+    problems: int
+
+
+class KeySet(Set[str]):
+    """Read-only view of a set of note keys that shares the set it wraps."""
+
+    __slots__: tuple[str, ...] = ("keys",)
+
+    keys: set[str]
+
+    def __init__(self, keys: set[str]):
+        self.keys = keys
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys)
+
+    @override
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class TypeKeys(Mapping[str, KeySet]):
+    """Read-only view of the note keys of each type that shares the store's type map."""
+
+    type_map: dict[str, set[str]]
+
+    def __init__(self, type_map: dict[str, set[str]]):
+        self.type_map = type_map
+
+    @override
+    def __getitem__(self, note_type: str) -> KeySet:
+        return KeySet(self.type_map[note_type])
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.type_map)
+
+    @override
+    def __len__(self) -> int:
+        return len(self.type_map)
+
+
+class NoteIndexView:
+    """Read-only view of the notes collected in a build, handed to other plugins once collection is complete.
+
+    With the default memory store, the mappings by key and by type wrap the store's own dictionaries, so the view
+    copies nothing however many notes the build has. The SQLite store reads its notes once, on first access. The
+    mapping by page is built once, on first access.
+
+    The notes themselves are shared with the plugin, so they must not be modified.
+    """
+
+    store: NoteStore
+    occurrence_table: OccurrenceTable
+    diagnostics: NoteDiagnostics
+
+    def __init__(self, store: NoteStore, occurrence_table: OccurrenceTable, diagnostics: NoteDiagnostics):
+        self.store = store
+        self.occurrence_table = occurrence_table
+        self.diagnostics = diagnostics
+
+    @cached_property
+    def by_key(self) -> Mapping[str, EditorNote]:
+        """Every note, by its `type:label` key, in the order the notes were defined."""
+        return MappingProxyType(self.store.notes_map)
+
+    @cached_property
+    def by_type(self) -> Mapping[str, Set[str]]:
+        """The keys of the notes of each type."""
+        return TypeKeys(self.store.type_map)
+
+    @cached_property
+    def by_page(self) -> Mapping[str, tuple[str, ...]]:
+        """The keys of the notes defined on each source page, by its path relative to the docs directory."""
+        pages: dict[str, list[str]] = {}
+        for key, note in self.by_key.items():
+            pages.setdefault(note.source_page.as_posix(), []).append(key)
+        return MappingProxyType({page: tuple(keys) for page, keys in pages.items()})
+
+    @cached_property
+    def stats(self) -> NoteIndexStats:
+        occurrences = self.occurrence_table
+        return NoteIndexStats(
+            notes=len(self.by_key),
+            types=len(self.by_type),
+            pages=len(self.by_page),
+            references=sum(occurrences.count(key) for key in occurrences if key in self.by_key),
+            problems=self.diagnostics.problem_count,
+        )
+
+    def occurrences(self, key: str) -> list[NoteOccurrence]:
+        """List every reference to a note, in the order they were found."""
+        return self.occurrence_table.get(key)
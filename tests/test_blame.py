@@ -0,0 +1,162 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from mkdocs_editor_notes import blame
+from mkdocs_editor_notes.blame import BlameError, BlameInfo, blame_definitions, blob_hash, parse_porcelain
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo: Path, *args: str, author: str = "Ann Author", date: str = "2024-05-06T12:00:00+00:00") -> str:
+    env = dict(
+        GIT_AUTHOR_NAME=author,
+        GIT_AUTHOR_EMAIL="author@example.com",
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_NAME=author,
+        GIT_COMMITTER_EMAIL="author@example.com",
+        GIT_COMMITTER_DATE=date,
+        HOME=str(repo),
+        PATH="/usr/bin:/bin:/usr/local/bin",
+    )
+    return subprocess.run(["git", *args], cwd=repo, env=env, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "docs").mkdir(parents=True)
+    git(repo, "init", "-q")
+    (repo / "docs" / "index.md").write_text("# Home\n\nText[^todo:home].\n\n[^todo:home]: Home note\n")
+    (repo / "docs" / "other.md").write_text("Other[^ponder:other]\n\n[^ponder:other]: Other note\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "Add docs")
+    return repo
+
+
+def test_blame__blob_hash_matches_git(repo: Path):
+    path = repo / "docs" / "index.md"
+
+    assert blob_hash(path.read_bytes()) == git(repo, "hash-object", str(path)).strip()
+
+
+def test_blame__parse_porcelain():
+    commit = "a" * 40
+    output = "\n".join(
+        [
+            f"{commit} 1 1 2",
+            "author Ann Author",
+            "author-time 1714996800",
+            "summary Add docs",
+            "\tText",
+            f"{commit} 2 2",
+            "\t[^todo:home]: Home note",
+        ]
+    )
+
+    assert parse_porcelain(output) == {
+        "todo:home": BlameInfo(author="Ann Author", author_time=1714996800, commit=commit)
+    }
+
+
+def test_blame__parse_porcelain_skips_fenced_and_uncommitted_lines():
+    commit = "a" * 40
+    uncommitted = "0" * 40
+    output = "\n".join(
+        [
+            f"{commit} 1 1 4",
+            "author Ann Author",
+            "author-time 1714996800",
+            "summary Add docs",
+            "\t```",
+            f"{commit} 2 2",
+            "\t[^todo:fenced]: Not a note",
+            f"{commit} 3 3",
+            "\t```",
+            f"{commit} 4 4",
+            "\t[^todo:kept]: A note",
+            f"{uncommitted} 5 5 1",
+            "author Not Committed Yet",
+            "author-time 1714999999",
+            "\t[^todo:draft]: Not saved yet",
+        ]
+    )
+
+    assert parse_porcelain(output) == {
+        "todo:kept": BlameInfo(author="Ann Author", author_time=1714996800, commit=commit)
+    }
+
+
+def test_blame__blames_each_file_and_caches_clean_files(repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    docs = repo / "docs"
+    cache_path = tmp_path / "cache" / "blame.json"
+    (docs / "other.md").write_text("Other[^ponder:other]\n\n[^ponder:other]: Other note\n[^todo:new]: Unsaved\n")
+
+    results = blame_definitions([docs / "index.md", docs / "other.md"], cache_path=cache_path)
+
+    home = results[(docs / "index.md").resolve()]["todo:home"]
+    assert (home.author, home.author_time) == ("Ann Author", 1714996800)
+    other = results[(docs / "other.md").resolve()]
+    assert other["ponder:other"].author == "Ann Author"
+    assert "todo:new" not in other
+
+    blamed: list[str] = []
+    original = blame.blame_file
+
+    def counting_blame_file(repo_root: Path, relative_path: str):
+        blamed.append(relative_path)
+        return original(repo_root, relative_path)
+
+    monkeypatch.setattr(blame, "blame_file", counting_blame_file)
+    again = blame_definitions([docs / "index.md", docs / "other.md"], cache_path=cache_path)
+
+    assert blamed == ["docs/other.md"]
+    assert again[(docs / "index.md").resolve()]["todo:home"] == home
+
+
+def test_blame__untracked_file_has_no_blame(repo: Path):
+    path = repo / "docs" / "untracked.md"
+    path.write_text("[^todo:untracked]: Not in git\n")
+
+    assert blame_definitions([path]) == {path.resolve(): {}}
+
+
+def test_blame__outside_a_repository(tmp_path: Path):
+    path = tmp_path / "plain" / "index.md"
+    path.parent.mkdir()
+    path.write_text("[^todo:plain]: No repository\n")
+
+    with pytest.raises(BlameError):
+        blame_definitions([path])
+
+
+def test_blame__skips_files_outside_any_repository(repo: Path, tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    plain = tmp_path / "plain" / "index.md"
+    plain.parent.mkdir()
+    plain.write_text("[^todo:plain]: No repository\n")
+
+    results = blame_definitions([repo / "docs" / "index.md", plain])
+
+    assert list(results) == [(repo / "docs" / "index.md").resolve()]
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 1
+    assert f"Skipping git blame for editor notes in {plain.resolve()}: " in warnings[0]
+
+
+def test_blame__files_in_several_repositories(repo: Path, tmp_path: Path):
+    vendored = tmp_path / "vendored"
+    vendored.mkdir()
+    git(vendored, "init", "-q")
+    (vendored / "api.md").write_text("[^todo:api]: Vendored note\n")
+    git(vendored, "add", ".")
+    git(vendored, "commit", "-q", "-m", "Add api", author="Val Vendor")
+
+    results = blame_definitions([repo / "docs" / "index.md", vendored / "api.md"])
+
+    assert results[(repo / "docs" / "index.md").resolve()]["todo:home"].author == "Ann Author"
+    assert results[(vendored / "api.md").resolve()]["todo:api"].author == "Val Vendor"
+
+
+def test_blame__no_paths():
+    assert blame_definitions([]) == {}
@@ -0,0 +1,62 @@
+import re
+import threading
+import time
+
+import pytest
+from mkdocs_editor_notes.budget import PageBudgetExceeded, PageStage, PageTimer
+
+
+def test_budget__times_stages_without_budget():
+    timer = PageTimer()
+
+    with timer.stage(PageStage.CODE_BLOCKS, interruptible=True):
+        time.sleep(0.01)
+    with timer.stage(PageStage.REFERENCES):
+        pass
+
+    assert list(timer.stages) == [PageStage.CODE_BLOCKS, PageStage.REFERENCES]
+    assert timer.slowest == PageStage.CODE_BLOCKS
+    assert not timer.exceeded
+
+
+def test_budget__interrupts_backtracking_regex():
+    timer = PageTimer(0.05)
+    started = time.perf_counter()
+
+    with pytest.raises(PageBudgetExceeded, match="in the definitions stage") as exc_info:
+        with timer.stage(PageStage.DEFINITIONS, interruptible=True):
+            re.match(r"(a+)+$", "a" * 64 + "b")
+
+    assert exc_info.value.stage == PageStage.DEFINITIONS
+    assert time.perf_counter() - started < 1
+
+
+def test_budget__does_not_start_interruptible_stage_once_exceeded():
+    timer = PageTimer(0.001)
+    time.sleep(0.01)
+
+    with pytest.raises(PageBudgetExceeded):
+        with timer.stage(PageStage.CODE_BLOCKS, interruptible=True):
+            pytest.fail("the stage should not run")
+
+    with timer.stage(PageStage.RESTORE):
+        pass
+    assert timer.exceeded
+
+
+def test_budget__detects_overrun_when_stage_returns_outside_main_thread():
+    errors: list[BaseException] = []
+
+    def run() -> None:
+        timer = PageTimer(0.01)
+        try:
+            with timer.stage(PageStage.CODE_BLOCKS, interruptible=True):
+                time.sleep(0.05)
+        except PageBudgetExceeded as err:
+            errors.append(err)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert len(errors) == 1
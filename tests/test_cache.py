@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+
+from mkdocs_editor_notes.cache import OutputManifest, write_if_changed
+
+
+def test_cache__write_if_changed(tmp_path: Path):
+    path = tmp_path / "out" / "index.json"
+
+    assert write_if_changed(path, b"{}") is True
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    assert write_if_changed(path, b"{}") is False
+    assert path.stat().st_mtime_ns == 1_000_000_000
+
+    assert write_if_changed(path, b"{ }") is True
+    assert path.read_bytes() == b"{ }"
+
+
+def test_cache__manifest_restores_mtime_of_unchanged_files(tmp_path: Path):
+    manifest_path = tmp_path / "outputs.json"
+    kept = tmp_path / "kept.html"
+    edited = tmp_path / "edited.html"
+    kept.write_text("same")
+    edited.write_text("before")
+    os.utime(kept, ns=(1_000_000_000, 1_000_000_000))
+
+    first = OutputManifest(manifest_path)
+    assert first.settle(kept, "kept.html") is True
+    assert first.settle(edited, "edited.html") is True
+    first.save()
+
+    # A clean rebuild writes both files again
+    kept.write_text("same")
+    edited.write_text("after")
+    os.utime(edited, ns=(3_000_000_000, 3_000_000_000))
+
+    second = OutputManifest(manifest_path)
+    assert second.settle(kept, "kept.html") is False
+    assert second.settle(edited, "edited.html") is True
+    second.save()
+
+    assert kept.stat().st_mtime_ns == 1_000_000_000
+    assert edited.stat().st_mtime_ns == 3_000_000_000
+    assert set(OutputManifest(manifest_path).previous) == {"kept.html", "edited.html"}
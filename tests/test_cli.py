@@ -0,0 +1,78 @@
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+from mkdocs_editor_notes.cli import main
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.shard import read_shard, write_shard
+
+
+@pytest.fixture
+def shards(tmp_path: Path) -> list[Path]:
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+    write_shard(
+        first,
+        "first",
+        [EditorNote(note_type="todo", label="a", text="Alpha", source_page=Path("index.md"))],
+        prefix="first",
+    )
+    write_shard(
+        second,
+        "second",
+        [
+            EditorNote(note_type="todo", label="a", text="Again", source_page=Path("index.md")),
+            EditorNote(note_type="ponder", label="b", text="Beta", source_page=Path("index.md")),
+        ],
+        prefix="second",
+    )
+    return [first, second]
+
+
+def test_cli__merge_writes_aggregator_and_shard(shards: list[Path], tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    output = tmp_path / "editor-notes.md"
+    combined = tmp_path / "combined.jsonl"
+
+    assert main(["merge", *map(str, shards), "--output", str(output), "--shard", str(combined)]) == 0
+
+    markdown = output.read_text()
+    assert 'href="../first/#ref-todo-a"' in markdown
+    assert "agg-ponder-b" in markdown
+    assert "Again" not in markdown
+    assert [entry.key for entry in read_shard(combined)] == ["ponder:b", "todo:a"]
+    assert "Duplicate note key 'todo:a' in shards: first, second" in capsys.readouterr().err
+
+
+def test_cli__merge_strict_fails_on_duplicates(shards: list[Path], capsys: pytest.CaptureFixture[str]):
+    assert main(["merge", *map(str, shards), "--strict"]) == 1
+    assert "# Editor Notes" in capsys.readouterr().out
+
+
+def test_cli__module_entry_point(shards: list[Path], monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "argv", ["mkdocs-editor-notes", "merge", str(shards[0])])
+
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("mkdocs_editor_notes", run_name="__main__")
+
+    assert exit_info.value.code == 0
+
+
+def test_cli__scan_writes_shard(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    docs_dir = tmp_path / "docs"
+    (docs_dir / "guide").mkdir(parents=True)
+    (docs_dir / "index.md").write_text("Intro[^todo:intro]\n\n[^todo:intro]: Write the intro\n")
+    (docs_dir / "guide" / "setup.md").write_text("```\n[^todo:hidden]: not a note\n```\n[^ponder:setup]: Setup text\n")
+    shard = tmp_path / "docs.jsonl"
+
+    assert main(["scan", str(docs_dir), "--shard", str(shard), "--prefix", "sub"]) == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        "guide/setup.md: [^ponder:setup]",
+        "index.md: [^todo:intro]",
+    ]
+    entries = {entry.key: entry for entry in read_shard(shard)}
+    assert list(entries) == ["ponder:setup", "todo:intro"]
+    assert entries["ponder:setup"].shard == "docs"
+    assert entries["ponder:setup"].note.source_url == "sub/guide/setup/"
+    assert entries["todo:intro"].note.text == "Write the intro"
@@ -0,0 +1,73 @@
+import gzip
+from pathlib import Path
+from unittest import mock
+
+from mkdocs_editor_notes import compress
+from mkdocs_editor_notes.compress import compress_file, precompress, sibling_suffixes
+
+
+def test_compress_file__writes_gzip_sibling(tmp_path: Path):
+    path = tmp_path / "index.html"
+    path.write_text("<p>notes</p>" * 100)
+
+    with mock.patch.object(compress, "brotli", None):
+        written = compress_file(str(path))
+
+    assert written == [f"{path}.gz"]
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == path.read_bytes()
+
+
+def test_compress_file__writes_brotli_sibling_when_available(tmp_path: Path):
+    path = tmp_path / "notes.json"
+    path.write_text("{}")
+    fake_brotli = mock.Mock(compress=mock.Mock(return_value=b"br"))
+
+    with mock.patch.object(compress, "brotli", fake_brotli):
+        written = compress_file(str(path))
+        assert sibling_suffixes() == [".gz", ".br"]
+
+    assert written == [f"{path}.gz", f"{path}.br"]
+    assert (tmp_path / "notes.json.br").read_bytes() == b"br"
+
+
+def test_import_brotli__falls_back_to_the_cffi_port():
+    port = mock.Mock()
+
+    def import_module(name: str) -> mock.Mock:
+        if name == "brotli":
+            raise ImportError(name)
+        return port
+
+    with mock.patch("importlib.import_module", side_effect=import_module):
+        assert compress.import_brotli() is port
+    with mock.patch("importlib.import_module", side_effect=ImportError):
+        assert compress.import_brotli() is None
+
+
+def test_precompress__skips_unchanged_files(tmp_path: Path):
+    manifest_path = tmp_path / "cache" / "precompress.json"
+    first = tmp_path / "first.html"
+    second = tmp_path / "second.json"
+    first.write_text("first")
+    second.write_text("second")
+
+    assert precompress([first, second, tmp_path / "missing.html"], manifest_path, max_workers=2) == [first, second]
+    assert (tmp_path / "second.json.gz").exists()
+
+    assert precompress([first, second], manifest_path) == []
+
+    second.write_text("second, edited")
+    assert precompress([first, second], manifest_path) == [second]
+    assert gzip.decompress((tmp_path / "second.json.gz").read_bytes()) == b"second, edited"
+
+
+def test_precompress__rewrites_missing_siblings(tmp_path: Path):
+    manifest_path = tmp_path / "precompress.json"
+    path = tmp_path / "index.html"
+    path.write_text("content")
+    precompress([path], manifest_path)
+
+    (tmp_path / "index.html.gz").unlink()
+
+    assert precompress([path], manifest_path) == [path]
+    assert (tmp_path / "index.html.gz").exists()
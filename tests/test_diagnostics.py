@@ -0,0 +1,95 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+from mkdocs_editor_notes.diagnostics import NoteDiagnostics, NoteLocation
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+
+
+def test_diagnostics__location_str():
+    assert str(NoteLocation("index.md", 3)) == "index.md:3"
+    assert str(NoteLocation("shard 'api'")) == "shard 'api'"
+
+
+def test_diagnostics__unused_is_defined_minus_referenced():
+    diagnostics = NoteDiagnostics()
+    diagnostics.add_definition("todo:a", NoteLocation("index.md", 1))
+    diagnostics.add_definition("todo:b", NoteLocation("index.md", 2))
+    diagnostics.add_reference("todo:a", NoteLocation("index.md", 5), defined=True)
+    diagnostics.add_reference("todo:c", NoteLocation("index.md", 6), defined=False)
+
+    assert diagnostics.unused == ["todo:b"]
+    assert diagnostics.undefined == {"todo:c": [NoteLocation("index.md", 6)]}
+    assert diagnostics.problem_count == 2
+    assert diagnostics.warning_count == 1
+    assert (
+        diagnostics.format_unused()
+        == "Editor notes found 1 unused note definition(s):\n  [^todo:b] defined at index.md:2"
+    )
+
+
+def test_diagnostics__empty_report():
+    diagnostics = NoteDiagnostics()
+
+    assert diagnostics.problem_count == 0
+    assert diagnostics.format_report() == "Editor notes found 0 problem(s):"
+
+
+def test_manager__define_records_duplicates_instead_of_raising():
+    manager = EditorNotesManager()
+    page = Mock()
+    page.url = "index/"
+    page.file.src_uri = "index.md"
+
+    manager.parse_note_definitions("[^todo:a]: First\n\n[^todo:a]: Second\n\n[^todo:a]: Third\n", page)
+
+    assert [note.text for note in manager] == ["First"]
+    assert manager.diagnostics.duplicates == {
+        "todo:a": [NoteLocation("index.md", 1), NoteLocation("index.md", 3), NoteLocation("index.md", 5)]
+    }
+
+
+def test_manager__records_every_reference_on_a_line():
+    manager = EditorNotesManager()
+    manager.define(EditorNote(note_type="todo", label="a", text="A", source_page=Path("index.md")), 1)
+    page = Mock()
+    page.file.src_uri = "index.md"
+
+    line = manager.annotate_reference_line("One[^todo:missing] two[^todo:a]", 4, page)
+
+    assert line == '<span id="ref-todo-a"></span>One[^todo:missing] two[^todo:a]'
+    assert manager.diagnostics.referenced == {"todo:a", "todo:missing"}
+    assert manager.diagnostics.undefined == {"todo:missing": [NoteLocation("index.md", 5)]}
+
+
+LOCATED_PAGE = """# Title
+
+```python
+one
+two
+three
+```
+
+[^todo:a]: First
+spanning a line
+
+
+
+See[^todo:a] and[^todo:missing]
+
+[^todo:a]: Duplicate
+"""
+
+
+def test_manager__locates_notes_in_the_page_after_fences_and_definitions():
+    manager = EditorNotesManager()
+    page = Mock()
+    page.url = "index/"
+    page.file.src_uri = "index.md"
+
+    manager.process_page_markdown(LOCATED_PAGE, page, "")
+
+    note = manager.get("todo", "a")
+    assert note is not None and note.line_number == 9
+    assert manager.diagnostics.duplicates == {"todo:a": [NoteLocation("index.md", 9), NoteLocation("index.md", 16)]}
+    assert manager.diagnostics.undefined == {"todo:missing": [NoteLocation("index.md", 14)]}
@@ -0,0 +1,227 @@
+"""Differential tests for alternative parsing engines against `EditorNotesManager.process_page_markdown`.
+
+Markdown documents are generated from a seed, mixing ordinary content with adversarial cases: nested and unclosed
+fences, fences opened mid-line, adjacent definitions, definitions spanning blank lines, many references per line, huge
+labels and CRLF line endings. Every registered engine must produce the same output, notes and diagnostics as the
+reference pipeline, and record the same reference occurrences. Set `EDITOR_NOTES_FUZZ_SEEDS` to run more documents.
+"""
+
+import os
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+import pytest
+from mkdocs_editor_notes import parser
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.occurrences import NoteOccurrence
+
+FUZZ_SEEDS = int(os.environ.get("EDITOR_NOTES_FUZZ_SEEDS", "150"))
+
+NOTE_TYPES = ["todo", "ponder", "improve", "x"]
+WORDS = ["alpha", "beta", "[link](x.md)", "`code`", "[^plain]", "[^todo:]", "*em*", "#tag", "1.", "-", "~~", "``"]
+
+
+def make_label(rng: random.Random) -> str:
+    if rng.random() < 0.05:
+        return "huge-" + "l" * rng.randint(200, 2000)
+    return rng.choice(["a", "b", "c", "long_label-1", "z9"])
+
+
+def make_ref(rng: random.Random) -> str:
+    return f"[^{rng.choice(NOTE_TYPES)}:{make_label(rng)}]"
+
+
+def make_words(rng: random.Random, refs: float = 0.2) -> str:
+    words: list[str] = []
+    for _ in range(rng.randint(0, 8)):
+        words.append(make_ref(rng) if rng.random() < refs else rng.choice(WORDS))
+    return rng.choice([" ", "", "  "]).join(words)
+
+
+def make_fence(rng: random.Random) -> str:
+    marker = rng.choice(["```", "~~~"])
+    other = "~~~" if marker == "```" else "```"
+    body = [make_words(rng, refs=0.4) for _ in range(rng.randint(0, 3))]
+    if rng.random() < 0.3:
+        body.insert(rng.randint(0, len(body)), f"{make_ref(rng)}: defined in code")
+    if rng.random() < 0.3:
+        body.insert(rng.randint(0, len(body)), "")
+    if rng.random() < 0.2:
+        body.insert(rng.randint(0, len(body)), f"{other}nested{other}" if rng.random() < 0.5 else other)
+    opener = rng.choice(["", "python", " md"])
+    closer = marker + (make_words(rng) if rng.random() < 0.2 else "")
+    return "\n".join([f"{marker}{opener}", *body, closer])
+
+
+def make_definition(rng: random.Random) -> str:
+    head = f"{make_ref(rng)}:{rng.choice(['', ' ', '  ', '\n', '\n\n'])}"
+    lines = [make_words(rng, refs=0.1) for _ in range(rng.randint(0, 3))]
+    if rng.random() < 0.15:
+        lines.append(make_fence(rng))
+    if rng.random() < 0.2:
+        lines.extend(["", "    indented continuation"])
+    return head + "\n".join(lines)
+
+
+def make_block(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.25:
+        return make_words(rng, refs=0.3)
+    if kind < 0.35:
+        return f"{'#' * rng.randint(1, 6)}{rng.choice([' ', ''])}{make_words(rng)}"
+    if kind < 0.45:
+        marker = rng.choice(["-", "*", "+", "1.", "10.", "  -"])
+        return f"{marker}{rng.choice([' ', ''])}{make_words(rng)}"
+    if kind < 0.55:
+        return " ".join(make_ref(rng) for _ in range(rng.randint(2, 12)))
+    if kind < 0.65:
+        return make_fence(rng)
+    if kind < 0.7:
+        marker = rng.choice(["```", "~~~"])
+        return f"{make_words(rng)} {marker}inline{marker} {make_words(rng)}"
+    if kind < 0.9:
+        return make_definition(rng)
+    return rng.choice(["", " ", "\t", "   "])
+
+
+def generate_markdown(seed: int) -> str:
+    """Generate a random Markdown document. Roughly one in four documents has an unclosed fence."""
+    rng = random.Random(seed)
+    blocks = [make_block(rng) for _ in range(rng.randint(1, 40))]
+    if rng.random() < 0.25:
+        blocks.insert(rng.randint(0, len(blocks)), rng.choice(["```", "~~~", "text ```"]))
+    separators = ["\n", "\n\n", "\n\n\n", "\n \n"]
+    markdown = "".join(block + rng.choice(separators) for block in blocks)
+    if rng.random() < 0.1:
+        markdown = markdown.replace("\n", "\r\n")
+    return markdown if rng.random() < 0.8 else markdown.rstrip("\n")
+
+
+def has_unclosed_fence(markdown: str) -> bool:
+    """Tell whether a fence marker is left over once the reference pipeline has paired up the code blocks."""
+    protected = parser.protect_code_blocks(markdown, [])
+    return "```" in protected or "~~~" in protected
+
+
+Replacer = Callable[[re.Match[str]], str] | str
+
+
+@dataclass(frozen=True)
+class Engine:
+    """An alternative to `process_page_markdown`, and the documents it promises to process identically."""
+
+    name: str
+    process: Callable[[EditorNotesManager, str, Mock, Replacer], str]
+    handles: Callable[[str], bool] = lambda markdown: True
+
+
+ENGINES = [
+    Engine(
+        name="streaming",
+        process=lambda manager, markdown, page, replacer: manager.process_page_markdown_streaming(
+            markdown, page, replacer
+        ),
+        # An unclosed fence deliberately runs to the end of the document in the streaming engine
+        handles=lambda markdown: not has_unclosed_fence(markdown),
+    ),
+    Engine(
+        name="streaming-tiny-chunks",
+        process=lambda manager, markdown, page, replacer: manager.process_page_markdown_streaming(
+            markdown, page, replacer, chunk_size=3
+        ),
+        handles=lambda markdown: not has_unclosed_fence(markdown),
+    ),
+]
+
+
+def make_page() -> Mock:
+    page = Mock()
+    page.url = "fuzz/"
+    page.file.src_uri = "fuzz.md"
+    return page
+
+
+def replacer(match: re.Match[str]) -> str:
+    return f"<{match.group('type')}:{match.group('label')}>"
+
+
+@dataclass
+class Outcome:
+    markdown: str
+    notes: list[dict[str, object]]
+    diagnostics: object
+    occurrences: dict[str, list[NoteOccurrence]]
+    seconds: float
+
+
+def run_engine(process: Callable[[EditorNotesManager, str, Mock, Replacer], str], markdown: str) -> Outcome:
+    manager = EditorNotesManager()
+    start = time.perf_counter()
+    output = process(manager, markdown, make_page(), replacer)
+    seconds = time.perf_counter() - start
+    occurrences = {key: manager.occurrences.get(key) for key in manager.occurrences}
+    return Outcome(output, [note.to_dict() for note in manager], manager.diagnostics, occurrences, seconds)
+
+
+def reference(manager: EditorNotesManager, markdown: str, page: Mock, replacer: Replacer) -> str:
+    return manager.process_page_markdown(markdown, page, replacer)
+
+
+def compare(engine: Engine, seed: int) -> tuple[Outcome, Outcome] | None:
+    markdown = generate_markdown(seed)
+    if not engine.handles(markdown):
+        return None
+    expected = run_engine(reference, markdown)
+    actual = run_engine(engine.process, markdown)
+    context = f"engine {engine.name!r} differs from the reference for seed {seed}:\n{markdown!r}"
+    assert actual.markdown == expected.markdown, context
+    assert actual.notes == expected.notes, context
+    assert actual.diagnostics == expected.diagnostics, context
+    assert actual.occurrences == expected.occurrences, context
+    return expected, actual
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.name)
+def test_differential__engines_match_reference(engine: Engine, record_property: Callable[[str, object], None]):
+    compared = 0
+    reference_seconds = 0.0
+    engine_seconds = 0.0
+    for seed in range(FUZZ_SEEDS):
+        outcomes = compare(engine, seed)
+        if outcomes is None:
+            continue
+        compared += 1
+        reference_seconds += outcomes[0].seconds
+        engine_seconds += outcomes[1].seconds
+
+    # Most documents must actually be compared, or the harness proves nothing
+    assert compared >= FUZZ_SEEDS // 2
+    record_property("compared_documents", compared)
+    record_property("time_ratio", round(engine_seconds / reference_seconds, 3))
+
+
+def test_differential__generator_covers_adversarial_cases():
+    documents = [generate_markdown(seed) for seed in range(FUZZ_SEEDS)]
+
+    assert any(has_unclosed_fence(markdown) for markdown in documents)
+    assert any("huge-" in markdown for markdown in documents)
+    assert any(re.search(r"(\[\^[a-z]+:[^\]]+\] ?){6}", markdown) for markdown in documents)
+    assert any(re.search(r"^\[\^[a-z]+:[^\]]+\]:.*\n\[\^", markdown, re.MULTILINE) for markdown in documents)
+    assert any(re.search(r"```[^`]*~~~[^`]*```", markdown) for markdown in documents)
+    assert any("\r\n" in markdown for markdown in documents)
+    assert generate_markdown(7) == generate_markdown(7)
+
+
+def test_differential__catches_a_diverging_engine():
+    def ignores_code_blocks(manager: EditorNotesManager, markdown: str, page: Mock, replacer: Replacer) -> str:
+        return manager.process_page_markdown(markdown.replace("```", "").replace("~~~", ""), page, replacer)
+
+    broken = Engine(name="broken", process=ignores_code_blocks)
+
+    with pytest.raises(AssertionError, match="engine 'broken' differs from the reference for seed"):
+        for seed in range(FUZZ_SEEDS):
+            compare(broken, seed)
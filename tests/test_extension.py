@@ -0,0 +1,90 @@
+import re
+
+import markdown
+import snick
+from mkdocs_editor_notes.extension import EditorNotesExtension, collected_notes
+
+SAMPLE = snick.dedent(
+    """
+    # Title[^todo:title]
+
+    Text with `[^todo:span]` code and a note[^ponder:why] plus a footnote[^1].
+
+    ```
+    [^todo:fenced]: not a definition
+    ```
+
+        [^todo:indented]: not a definition either
+
+    - item[^todo:title]
+    [^todo:title]: Fix the title
+    over two lines
+    [^ponder:why]:
+
+    Spans a blank line
+    [^improve:link]: See [the docs][docs]
+
+    [docs]: https://example.com
+    [^1]: A regular footnote
+    """
+)
+
+
+def test_extension__collects_definitions_and_removes_references():
+    md = markdown.Markdown(extensions=[EditorNotesExtension(), "fenced_code", "footnotes"])
+
+    html = md.convert(SAMPLE)
+
+    assert collected_notes(md) == {
+        "todo:title": "Fix the title\nover two lines",
+        "ponder:why": "Spans a blank line",
+        "improve:link": "See [the docs][docs]",
+    }
+    assert "<h1>Title</h1>" in html
+    assert "<code>[^todo:span]</code>" in html
+    assert "[^todo:fenced]: not a definition" in html
+    assert "[^todo:indented]: not a definition either" in html
+    assert "<li>item</li>" in html
+    assert "Fix the title" not in html
+    assert 'class="footnote-ref"' in html
+    assert "A regular footnote" in html
+
+
+def test_extension__callbacks():
+    definitions: list[tuple[str, str, str]] = []
+
+    def reference(match: re.Match[str]) -> str:
+        return f'<sup class="note">{match.group("type")}</sup>'
+
+    def define(note_type: str, label: str, text: str) -> None:
+        definitions.append((note_type, label, text))
+
+    extension = EditorNotesExtension(definitions=define, references=reference)
+    html = markdown.markdown("A[^todo:x] and[^ponder:y]\n\n[^todo:x]: X\n", extensions=[extension])
+
+    assert html == '<p>A<sup class="note">todo</sup> and<sup class="note">ponder</sup></p>'
+    assert definitions == [("todo", "x", "X")]
+
+
+def test_extension__loaded_by_name_and_reset_between_documents():
+    md = markdown.Markdown(extensions=["mkdocs_editor_notes.extension"])
+
+    assert md.convert("A[^todo:x]\n\n[^todo:x]: X") == "<p>A</p>"
+    assert collected_notes(md) == {"todo:x": "X"}
+    md.reset().convert("No notes")
+    assert collected_notes(md) == {}
+
+
+def test_extension__keeps_code_inside_definitions():
+    md = markdown.Markdown(extensions=[EditorNotesExtension(), "fenced_code"])
+
+    md.convert("[^todo:x]: Run this\n```\nmake docs\n```\n")
+
+    assert collected_notes(md) == {
+        "todo:x": "Run this\n<pre><code>make docs\n</code></pre>",
+    }
+
+    # After a blank line, the code block is part of the page instead
+    html = md.reset().convert("[^todo:x]: Run this\n\n```\nmake docs\n```\n")
+    assert html == "<pre><code>make docs\n</code></pre>"
+    assert collected_notes(md) == {"todo:x": "Run this"}
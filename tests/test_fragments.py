@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from mkdocs_editor_notes.fragments import AggregatorFragments
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+
+
+def make_notes(edited_text: str = "Two") -> list[EditorNote]:
+    return [
+        EditorNote(note_type="todo", label="one", text="One", source_page=Path("a.md"), line_number=1),
+        EditorNote(note_type="todo", label="two", text=edited_text, source_page=Path("b.md"), line_number=1),
+        EditorNote(note_type="ponder", label="three", text="Three", source_page=Path("a.md"), line_number=2),
+    ]
+
+
+def build(fragments: AggregatorFragments, notes: list[EditorNote]) -> str:
+    manager = EditorNotesManager(fragments=fragments)
+    for note in notes:
+        manager.add(note)
+    return manager.build_aggregator_html(lambda note_type: f"[{note_type}]")
+
+
+def test_fragments__render_reuses_unchanged_groups():
+    fragments = AggregatorFragments()
+    notes = make_notes()
+
+    first = fragments.render(("todo", "a.md"), notes[:1], lambda note: note.text)
+    second = fragments.render(("todo", "a.md"), notes[:1], lambda note: "never called")
+
+    assert first == second == "One"
+    assert fragments.renders == 1
+
+
+def test_fragments__prune_drops_unused_groups():
+    fragments = AggregatorFragments()
+    fragments.render(("todo", "a.md"), make_notes()[:1], lambda note: note.text)
+
+    fragments.start()
+    fragments.render(("todo", "b.md"), make_notes()[1:2], lambda note: note.text)
+    fragments.prune()
+
+    assert list(fragments.fragments) == [("todo", "b.md")]
+
+
+def test_fragments__rebuild_renders_only_changed_groups():
+    fragments = AggregatorFragments()
+
+    first = build(fragments, make_notes())
+    assert fragments.renders == 3
+    assert first.index("[ponder]") < first.index("agg-ponder-three") < first.index("[todo]")
+    assert first.index("agg-todo-one") < first.index("agg-todo-two")
+
+    unchanged = build(fragments, make_notes())
+    assert fragments.renders == 0
+    assert unchanged == first
+
+    edited = build(fragments, make_notes(edited_text="Edited"))
+    assert fragments.renders == 1
+    assert "<p>Edited</p>" in edited
+    assert "<p>Two</p>" not in edited
+
+
+def test_fragments__empty_manager_has_no_html():
+    assert build(AggregatorFragments(), []) == ""
+
+
+def test_fragments__new_reference_renders_its_group_again():
+    fragments = AggregatorFragments()
+    manager = EditorNotesManager(fragments=fragments)
+    for note in make_notes():
+        manager.add(note)
+    manager.build_aggregator_html(lambda note_type: note_type)
+
+    manager.occurrences.add("todo:one", "c.md", "c/", 4, 2)
+    html = manager.build_aggregator_html(lambda note_type: note_type)
+
+    assert fragments.renders == 1
+    assert '<a href="../c/#ref-todo-one">c.md:4:2</a>' in html
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from mkdocs_editor_notes.history import NoteDiff, build_snapshot, diff_snapshots, load_snapshot, save_snapshot
+from mkdocs_editor_notes.note import EditorNote
+
+
+def make_note(label: str, text: str) -> tuple[str, EditorNote]:
+    return f"todo:{label}", EditorNote(note_type="todo", label=label, text=text, source_page=Path("index.md"))
+
+
+def test_history__snapshot_is_sorted_keys_and_short_hashes():
+    snapshot = build_snapshot([make_note("b", "B"), make_note("a", "A")])
+
+    assert [key for key, _ in snapshot] == ["todo:a", "todo:b"]
+    assert all(len(content_hash) == 16 for _, content_hash in snapshot)
+    assert build_snapshot([make_note("a", "A")]) == snapshot[:1]
+    assert build_snapshot([make_note("a", "Edited")]) != snapshot[:1]
+
+
+def test_history__snapshot_round_trip(tmp_path: Path):
+    path = tmp_path / "cache" / "snapshot.json"
+    snapshot = build_snapshot([make_note("a", "A"), make_note("b", "B")])
+
+    assert load_snapshot(path) is None
+    save_snapshot(path, snapshot)
+    assert load_snapshot(path) == snapshot
+
+    path.write_text('{"not": "a snapshot"}')
+    assert load_snapshot(path) is None
+
+
+def test_history__diff_merges_sorted_snapshots():
+    previous = [("todo:a", "1"), ("todo:b", "2"), ("todo:d", "4"), ("todo:f", "6")]
+    current = [("ponder:z", "0"), ("todo:b", "2"), ("todo:c", "3"), ("todo:d", "5"), ("todo:g", "7")]
+
+    assert diff_snapshots(previous, current) == NoteDiff(
+        added=["ponder:z", "todo:c", "todo:g"],
+        edited=["todo:d"],
+        resolved=["todo:a", "todo:f"],
+    )
+
+
+def test_history__diff_of_unchanged_snapshots_is_empty():
+    snapshot = build_snapshot([make_note("a", "A")])
+    diff = diff_snapshots(snapshot, list(snapshot))
+
+    assert diff.empty
+    assert diff.to_dict() == dict(added=[], edited=[], resolved=[])
+    assert not diff_snapshots([], snapshot).empty
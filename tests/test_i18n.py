@@ -0,0 +1,93 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from mkdocs_editor_notes.i18n import ExtractionCache, PageExtraction, PageLanguage, split_language
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.parser import SourceMap
+from mkdocs_editor_notes.plugin import EditorNotesPlugin
+
+
+def make_page(src_uri: str, url: str) -> Mock:
+    page = Mock()
+    page.url = url
+    page.file.src_uri = src_uri
+    return page
+
+
+@pytest.mark.parametrize(
+    "src_uri, expected",
+    [
+        ("guide/setup.md", PageLanguage("guide/setup.md", "")),
+        ("fr/guide/setup.md", PageLanguage("guide/setup.md", "fr")),
+        ("guide/setup.fr.md", PageLanguage("guide/setup.md", "fr")),
+        ("guide/setup.es.md", PageLanguage("guide/setup.es.md", "")),
+        ("fr.md", PageLanguage("fr.md", "")),
+    ],
+)
+def test_i18n__split_language(src_uri: str, expected: PageLanguage):
+    assert split_language(src_uri, ["en", "fr"]) == expected
+
+
+def test_i18n__cache_keeps_one_result_per_language_for_each_source_page():
+    # Only the translation is listed: the untranslated default page still gets its own slot
+    cache = ExtractionCache(["fr"])
+    assert cache.variants == 2
+    english = cache.key("index.md", "Hello")
+    french = cache.key("index.fr.md", "Bonjour")
+    edited = cache.key("fr/index.md", "Salut")
+    assert english[0] == french[0] == edited[0] == "index.md"
+
+    cache.put(english, PageExtraction("Hello", (), (), SourceMap("Hello")))
+    cache.put(french, PageExtraction("Bonjour", (), (), SourceMap("Bonjour")))
+    assert cache.get(french) is not None
+    assert cache.get(english) is not None
+    cache.put(edited, PageExtraction("Salut", (), (), SourceMap("Salut")))
+
+    # The least recently used result made room for the edited translation
+    assert cache.get(french) is None
+    assert cache.get(english) is not None
+    assert (cache.hits, cache.lookups) == (3, 4)
+    cache.start()
+    assert (cache.hits, cache.lookups) == (0, 0)
+
+
+def test_i18n__manager_reuses_extraction_for_identical_translations():
+    cache = ExtractionCache(["en", "fr"])
+    markdown = "Text[^todo:a]\n\n```\n[^todo:b]: Not a note\n```\n\n[^todo:a]: A note\n"
+
+    english = EditorNotesManager(extractions=cache)
+    english_result = english.process_page_markdown(markdown, make_page("index.md", ""), "")
+    french = EditorNotesManager(extractions=cache)
+    french_result = french.process_page_markdown(markdown, make_page("fr/index.md", "fr/"), "")
+
+    assert (cache.hits, cache.lookups) == (1, 2)
+    assert french_result == english_result
+    assert "[^todo:b]: Not a note" in french_result
+    note = french.get("todo", "a")
+    assert note is not None
+    assert (note.source_page, note.source_url) == (Path("fr/index.md"), "fr/")
+    assert note.line_number == english.notes_map["todo:a"].line_number
+    assert french.get("todo", "b") is None
+
+
+def test_i18n__plugin_shares_extractions_across_language_builds():
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(languages=["en", "fr"], search_index=False))
+    markdown = "Text[^todo:a]\n\n[^todo:a]: A note\n"
+
+    for src_uri, url in [("index.md", ""), ("fr/index.md", "fr/")]:
+        plugin.on_config(Mock(markdown_extensions=[], mdx_configs={}))
+        plugin.on_page_markdown(markdown, make_page(src_uri, url), Mock(), Mock())
+        plugin.on_env(Mock(), Mock(), Mock())
+
+    extractions = plugin.note_extractions
+    assert extractions is not None
+    assert (extractions.hits, extractions.lookups) == (1, 1)
+    assert plugin.note_manager.notes_map["todo:a"].source_url == "fr/"
+
+    # Sites with one language do not keep the page content around
+    plugin.load_config(dict(search_index=False))
+    plugin.on_config(Mock(markdown_extensions=[], mdx_configs={}))
+    assert plugin.note_extractions is None
+    assert plugin.note_manager.extractions is None
@@ -0,0 +1,82 @@
+"""Import-time budget checks based on `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE = "mkdocs_editor_notes"
+
+# Budgets are in microseconds, with about half again the measured time as headroom for noise: the parser measures about
+# 2.5 ms and the package's own modules about 11 ms when the plugin is imported.
+PARSER_BUDGET_US = 4_000
+PACKAGE_SELF_BUDGET_US = 16_000
+
+DEFERRED_MODULES = {
+    "sqlite3",
+    "cProfile",
+    "tracemalloc",
+    "concurrent.futures.process",
+    "gzip",
+    "tomllib",
+    *(
+        f"{PACKAGE}.{subsystem}"
+        for subsystem in ["blame", "compress", "history", "profiling", "shard", "stream", "view"]
+    ),
+}
+
+
+def import_times(module: str, env: dict[str, str] | None = None) -> dict[str, tuple[int, int]]:
+    """Import a module in a fresh interpreter and map each imported module to its (self, cumulative) microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def sample_import_times(module: str, pycache: Path, runs: int = 3) -> list[dict[str, tuple[int, int]]]:
+    """Repeat the measurement so budgets can be checked against the fastest run.
+
+    A first, unmeasured import writes the bytecode to a private cache, so that compiling the sources is left out of the
+    measurement even where `PYTHONDONTWRITEBYTECODE` is set: an installed package is not compiled on import.
+    """
+    env = os.environ | {"PYTHONPYCACHEPREFIX": str(pycache)}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    import_times(module, env)
+    return [import_times(module, env) for _ in range(runs)]
+
+
+def test_import_time__parser_has_no_heavy_dependencies(tmp_path: Path):
+    runs = sample_import_times(f"{PACKAGE}.parser", tmp_path)
+
+    imported = set(runs[0])
+    assert not {name for name in imported if name.split(".")[0] in {"mkdocs", "markdown", "jinja2", "snick"}}
+
+    assert min(times[f"{PACKAGE}.parser"][1] for times in runs) < PARSER_BUDGET_US
+
+
+def test_import_time__plugin_defers_optional_machinery(tmp_path: Path):
+    runs = sample_import_times(f"{PACKAGE}.plugin", tmp_path)
+
+    assert not DEFERRED_MODULES & set(runs[0])
+
+    own_self_time = min(
+        sum(self_us for name, (self_us, _) in times.items() if name.split(".")[0] == PACKAGE) for times in runs
+    )
+    assert own_self_time < PACKAGE_SELF_BUDGET_US
+
+
+def test_import_time__version_is_resolved_lazily():
+    times = import_times(f"{PACKAGE}.version")
+
+    assert "tomllib" not in times
@@ -1,5 +1,9 @@
 """Integration tests that build actual MkDocs sites."""
 
+import json
+import os
+import shutil
+import subprocess
 import tempfile
 from collections.abc import Generator
 from pathlib import Path
@@ -93,6 +97,8 @@ def test_build_site_with_notes(temp_site: tuple[Path, Path]) -> None:
     site_output = site_dir / "site"
     assert site_output.exists()
 
+    # The aggregator page is generated in memory, nothing is written to the docs
+    assert not (docs_dir / "editor-notes.md").exists()
     aggregator_page = site_output / "editor-notes" / "index.html"
     assert aggregator_page.exists()
 
@@ -114,6 +120,11 @@ def test_build_site_with_notes(temp_site: tuple[Path, Path]) -> None:
     advanced_html = (site_output / "guide" / "advanced" / "index.html").read_text()
     assert "ref-todo-document" in advanced_html
 
+    search_index = json.loads((site_output / "editor-notes-index.json").read_text())
+    assert sorted(search_index["types"]) == ["bug", "improve", "todo"]
+    assert '"searchIndexUrl": "editor-notes-index.json"' in aggregator_html
+    assert '"searchIndexUrl": "editor-notes-index.json"' in index_html
+
 
 def test_build_site_with_notes_in_headings(temp_site: tuple[Path, Path]) -> None:
     """Test building a site with notes in headings."""
@@ -324,3 +335,560 @@ def test_build_site_link_depths(temp_site: tuple[Path, Path]) -> None:
     assert 'href="../#ref-todo-root' in aggregator_html
     assert 'href="../features/#ref-todo-one' in aggregator_html
     assert 'href="../guide/advanced/#ref-todo-two' in aggregator_html
+
+
+def test_build_site_with_sqlite_store(temp_site: tuple[Path, Path]) -> None:
+    """Test building a site with notes spilled to a SQLite store."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - search
+              - editor-notes:
+                  note_store: sqlite
+
+            nav:
+              - Home: index.md
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text(
+        snick.dedent(
+            """
+            # Home
+
+            Stored note[^todo:stored].
+
+            [^todo:stored]: Kept on disk
+            """
+        )
+    )
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    aggregator_html = (site_dir / "site" / "editor-notes" / "index.html").read_text()
+    assert "agg-todo-stored" in aggregator_html
+    assert "Kept on disk" in aggregator_html
+    assert (site_dir / ".cache" / "editor-notes" / "notes.db").exists()
+
+
+def test_build_site_with_precompress(temp_site: tuple[Path, Path]) -> None:
+    """Test that generated note outputs get compressed siblings."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  precompress: true
+
+            nav:
+              - Home: index.md
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:zip].\n\n[^todo:zip]: Compress me\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    assert (site_output / "editor-notes" / "index.html.gz").exists()
+    assert (site_output / "editor-notes-index.json.gz").exists()
+    assert not (site_output / "index.html.gz").exists()
+
+
+def test_build_site_with_note_previews(temp_site: tuple[Path, Path]) -> None:
+    """Test that note previews are written to one shared file that every page points to."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  show_markers: true
+                  note_previews: true
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:peek].\n\n[^todo:peek]: Preview **me**\n")
+    (docs_dir / "guide").mkdir()
+    (docs_dir / "guide" / "deep.md").write_text("# Deep\n\nAgain[^todo:peek].\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    previews = json.loads((site_output / "editor-notes-previews.json").read_text())
+    assert previews == {"todo:peek": "<p>Preview <strong>me</strong></p>"}
+
+    index_html = (site_output / "index.html").read_text()
+    assert 'data-note="todo:peek"' in index_html
+    assert '"editor-notes-previews.json"' in index_html
+    assert "Preview <strong>me</strong>" not in index_html
+    assert (
+        '"notePreviewsUrl": "editor-notes-previews.json"' in (site_output / "guide" / "deep" / "index.html").read_text()
+    )
+
+
+def test_build_site_links_hashed_client_assets(temp_site: tuple[Path, Path]) -> None:
+    """Test that the stylesheet and script are emitted once under hashed names and linked from every page."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:a].\n\n[^todo:a]: A\n")
+    (docs_dir / "guide").mkdir()
+    (docs_dir / "guide" / "advanced.md").write_text("# Advanced\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    [css_path] = site_output.glob("editor-notes.*.css")
+    [js_path] = site_output.glob("editor-notes.*.js")
+    assert "editor-note-highlight-fade" in css_path.read_text()
+    assert "document$" in js_path.read_text()
+
+    index_html = (site_output / "index.html").read_text()
+    assert f'<link rel="stylesheet" href="{css_path.name}">' in index_html
+    assert f'<script src="{js_path.name}" defer></script>' in index_html
+    assert "<style>" not in index_html
+
+    advanced_html = (site_output / "guide" / "advanced" / "index.html").read_text()
+    assert f'<script src="../../{js_path.name}" defer></script>' in advanced_html
+
+
+def test_build_site_with_markdown_engine(temp_site: tuple[Path, Path]) -> None:
+    """Test that the Markdown extension engine handles notes while MkDocs renders each page."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            markdown_extensions:
+              - footnotes
+            plugins:
+              - editor-notes:
+                  engine: markdown
+                  show_markers: true
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text(
+        snick.dedent(
+            """
+            # Home[^todo:title]
+
+            Use `[^todo:title]` to reference it, twice[^todo:title], with a footnote[^1].
+
+                [^todo:indented]: code, not a note
+
+            [^todo:title]: Write a better *title*
+            [^1]: A footnote
+            """
+        )
+    )
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    index_html = (site_output / "index.html").read_text()
+    assert index_html.count('id="ref-todo-title"') == 1
+    assert index_html.count('id="ref-2-todo-title"') == 1
+    assert index_html.count('class="editor-note-marker"') == 2
+    assert "<code>[^todo:title]</code>" in index_html
+    assert "[^todo:indented]: code, not a note" in index_html
+    assert "Write a better" not in index_html
+    assert "A footnote" in index_html
+
+    aggregator_html = (site_output / "editor-notes" / "index.html").read_text()
+    assert 'id="agg-todo-title"' in aggregator_html
+    assert "Write a better <em>title</em>" in aggregator_html
+    assert '<li><a href="../#ref-todo-title">index.md</a></li>' in aggregator_html
+    assert '<li><a href="../#ref-2-todo-title">index.md</a></li>' in aggregator_html
+    assert "indented" not in aggregator_html
+
+
+def test_build_site_links_every_reference_site(temp_site: tuple[Path, Path]) -> None:
+    """Test that a note referenced several times gets an anchor per reference and the aggregator links to each."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (docs_dir / "index.md").write_text(
+        snick.dedent(
+            """
+            # Home
+
+            First[^todo:shared] and second[^todo:shared] on one line.
+
+            [^todo:shared]: Shared note
+            """
+        )
+    )
+    (docs_dir / "features.md").write_text("# Features\n\nAgain[^todo:shared].\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    index_html = (site_output / "index.html").read_text()
+    assert '<span id="ref-todo-shared"></span><span id="ref-2-todo-shared"></span>First' in index_html
+    assert '<span id="ref-3-todo-shared"></span>Again' in (site_output / "features" / "index.html").read_text()
+
+    aggregator_html = (site_output / "editor-notes" / "index.html").read_text()
+    assert 'shared (<a href="../#ref-todo-shared">index.md:3:6</a>)' in aggregator_html
+    assert '<li><a href="../#ref-2-todo-shared">index.md:3:31</a></li>' in aggregator_html
+    assert '<li><a href="../features/#ref-3-todo-shared">features.md:3:6</a></li>' in aggregator_html
+
+
+def test_build_site_renders_aggregator_in_band(temp_site: tuple[Path, Path]) -> None:
+    """Test that the aggregator page is built once with its notes, so the search index and the toc see them."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (site_dir / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - search
+              - editor-notes:
+                  aggregator_page: aaa-notes.md
+            nav:
+              - Notes: aaa-notes.md
+              - Home: index.md
+            """
+        )
+    )
+    # The docs provide the aggregator page, and it sorts before the page whose notes it lists
+    (docs_dir / "aaa-notes.md").write_text("# Placeholder\n")
+    (docs_dir / "index.md").write_text("# Home\n\nText[^todo:wombat].\n\n[^todo:wombat]: Feed the wombat\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    aggregator_html = (site_output / "aaa-notes" / "index.html").read_text()
+    assert "Generating..." not in aggregator_html
+    assert "Feed the wombat" in aggregator_html
+    assert '<h2 id="todo">✅ todo</h2>' in aggregator_html
+    assert 'href="#todo" class="nav-link">✅ todo</a>' in aggregator_html
+
+    search_index = json.loads((site_output / "search" / "search_index.json").read_text())
+    aggregator_docs = [doc for doc in search_index["docs"] if doc["location"].startswith("aaa-notes/")]
+    assert "Feed the wombat" in " ".join(doc["text"] for doc in aggregator_docs)
+    assert "✅ todo" in [doc["title"] for doc in aggregator_docs]
+
+    # The page keeps its place in the navigation
+    index_html = (site_output / "index.html").read_text()
+    assert '<a rel="prev" href="aaa-notes/"' in index_html
+
+
+def test_build_site_reports_note_changes(temp_site: tuple[Path, Path]) -> None:
+    """Test that a second build reports the notes added, edited and resolved since the first one."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (site_dir / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  note_changes: true
+            """
+        )
+    )
+    page = docs_dir / "index.md"
+    page.write_text("# Home[^todo:kept]\n\nText[^todo:edited] and[^todo:resolved].\n\n")
+    page.write_text(page.read_text() + "[^todo:kept]: Kept\n[^todo:edited]: Before\n[^todo:resolved]: Gone soon\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    assert not (site_output / "editor-notes-changes.json").exists()
+    assert "editor-notes-changes" not in (site_output / "editor-notes" / "index.html").read_text()
+    assert (site_dir / ".cache" / "editor-notes" / "snapshot.json").exists()
+
+    page.write_text(
+        (
+            "# Home[^todo:kept]\n\nText[^todo:edited] and[^todo:added].\n\n"
+            "[^todo:kept]: Kept\n[^todo:edited]: After\n[^todo:added]: New\n"
+        )
+    )
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    changes = json.loads((site_output / "editor-notes-changes.json").read_text())
+    assert changes == dict(added=["todo:added"], edited=["todo:edited"], resolved=["todo:resolved"])
+    aggregator_html = (site_output / "editor-notes" / "index.html").read_text()
+    assert '<li>Added (1): <a href="#agg-todo-added">todo:added</a></li>' in aggregator_html
+    assert "<li>Resolved (1): <code>todo:resolved</code></li>" in aggregator_html
+
+
+def test_build_site_in_strip_mode(temp_site: tuple[Path, Path]) -> None:
+    """Test that strip mode removes notes without generating anything else."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  mode: strip
+                  show_markers: true
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text(
+        (
+            "# Home[^todo:title]\n\nPublic text[^ponder:why].\n\n[^todo:title]: Secret\n[^ponder:why]: Hidden\n\n"
+            "```md\nKept[^todo:title]\n```\n"
+        )
+    )
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    site_output = site_dir / "site"
+    index_html = (site_output / "index.html").read_text()
+    assert "Public text." in index_html
+    assert "Kept[^todo:title]" in index_html
+    assert "Secret" not in index_html
+    assert "Hidden" not in index_html
+    assert "editor-note" not in index_html
+    assert "EDITOR_NOTES_CONFIG" not in index_html
+    assert not (site_output / "editor-notes").exists()
+    assert not (site_output / "editor-notes-index.json").exists()
+    assert not (docs_dir / "editor-notes.md").exists()
+
+
+def test_build_site_with_profiling(temp_site: tuple[Path, Path]) -> None:
+    """Test that profiling reports are written for each hook."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    mkdocs_yml = site_dir / "mkdocs.yml"
+    mkdocs_yml.write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  profile: [cprofile, tracemalloc]
+
+            nav:
+              - Home: index.md
+            """
+        )
+    )
+
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:profile].\n\n[^todo:profile]: Measure me\n")
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    reports_dir = site_dir / ".cache" / "editor-notes" / "profile"
+    assert (reports_dir / "on_page_markdown.prof").exists()
+    assert (reports_dir / "on_page_markdown.tracemalloc.txt").exists()
+    assert (reports_dir / "on_post_build.prof").exists()
+
+
+def test_build_sites_with_shards(tmp_path: Path) -> None:
+    """Test that separately built sub-projects can be combined through shards."""
+    for name in ("api", "guide"):
+        project_dir = tmp_path / name
+        (project_dir / "docs").mkdir(parents=True)
+        (project_dir / "mkdocs.yml").write_text(
+            snick.dedent(
+                f"""
+                site_name: {name}
+                plugins:
+                  - editor-notes:
+                      emit_shard: ../shards/{name}.jsonl
+                      shard_prefix: {name}
+                """
+            )
+        )
+        (project_dir / "docs" / "index.md").write_text(
+            f"# {name}\n\nNote[^todo:{name}].\n\n[^todo:{name}]: In {name}\n"
+        )
+        build.build(config.load_config(str(project_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+
+    assert (tmp_path / "shards" / "api.jsonl").exists()
+
+    hub_dir = tmp_path / "hub"
+    (hub_dir / "docs").mkdir(parents=True)
+    (hub_dir / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: hub
+            plugins:
+              - editor-notes:
+                  merge_shards: ["../shards/*.jsonl"]
+            """
+        )
+    )
+    (hub_dir / "docs" / "index.md").write_text("# Hub\n\nLocal[^todo:hub].\n\n[^todo:hub]: In hub\n")
+    build.build(config.load_config(str(hub_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+
+    aggregator_html = (hub_dir / "site" / "editor-notes" / "index.html").read_text()
+    assert "agg-todo-hub" in aggregator_html
+    assert 'href="../api/#ref-todo-api"' in aggregator_html
+    assert 'href="../guide/#ref-todo-guide"' in aggregator_html
+
+
+def test_build_site_renders_note_markdown(temp_site: tuple[Path, Path]) -> None:
+    """Test that note bodies are rendered as Markdown on the aggregator page."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (docs_dir / "index.md").write_text(
+        snick.dedent(
+            """
+            # Home
+
+            Styled note[^todo:styled].
+
+            [^todo:styled]: Check `build()` in the [guide](https://example.com) *soon*
+            """
+        )
+    )
+
+    cfg = config.load_config(str(site_dir / "mkdocs.yml"))  # pyright: ignore[reportUnknownMemberType]
+    build.build(cfg)
+
+    aggregator_html = (site_dir / "site" / "editor-notes" / "index.html").read_text()
+    assert "<code>build()</code>" in aggregator_html
+    assert '<a href="https://example.com">guide</a>' in aggregator_html
+    assert "<em>soon</em>" in aggregator_html
+    assert not (site_dir / ".cache").exists()
+
+    (site_dir / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  build_cache: true
+            """
+        )
+    )
+    build.build(config.load_config(str(site_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+    assert (site_dir / ".cache" / "editor-notes" / "rendered-notes.json").exists()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_build_site_with_git_blame(tmp_path: Path) -> None:
+    """Test that aggregator entries show the author and date of each note from git blame."""
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: Blamed
+            plugins:
+              - editor-notes:
+                  git_blame: true
+            """
+        )
+    )
+    (tmp_path / "docs" / "index.md").write_text("# Home\n\nText[^todo:home].\n\n[^todo:home]: Home note\n")
+    env = dict(
+        GIT_AUTHOR_NAME="Ann & Bob",
+        GIT_AUTHOR_EMAIL="author@example.com",
+        GIT_AUTHOR_DATE="2024-05-06T12:00:00+00:00",
+        GIT_COMMITTER_NAME="Ann",
+        GIT_COMMITTER_EMAIL="author@example.com",
+        HOME=str(tmp_path),
+        PATH=os.environ["PATH"],
+    )
+    for args in (["init", "-q"], ["add", "docs", "mkdocs.yml"], ["commit", "-q", "-m", "Add docs"]):
+        subprocess.run(["git", *args], cwd=tmp_path, env=env, check=True)
+
+    build.build(config.load_config(str(tmp_path / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+
+    aggregator_html = (tmp_path / "site" / "editor-notes" / "index.html").read_text()
+    assert '<span class="editor-note-meta">Ann &amp; Bob, 2024-05-06</span>' in aggregator_html
+    assert (tmp_path / ".cache" / "editor-notes" / "blame.json").exists()
+
+
+def test_rebuild_keeps_unchanged_outputs(temp_site: tuple[Path, Path]) -> None:
+    """Test that a rebuild leaves unchanged note outputs with their previous modification times."""
+    site_dir: Path
+    docs_dir: Path
+    site_dir, docs_dir = temp_site
+
+    (site_dir / "mkdocs.yml").write_text(
+        snick.dedent(
+            """
+            site_name: Test Site
+            plugins:
+              - editor-notes:
+                  precompress: true
+                  build_cache: true
+
+            nav:
+              - Home: index.md
+            """
+        )
+    )
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:stable].\n\n[^todo:stable]: Stable note\n")
+    site_output = site_dir / "site"
+    outputs = [
+        site_output / "editor-notes" / "index.html",
+        site_output / "editor-notes" / "index.html.gz",
+        site_output / "editor-notes-index.json",
+    ]
+
+    build.build(config.load_config(str(site_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+    for path in outputs:
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    manifest = json.loads((site_dir / ".cache" / "editor-notes" / "outputs.json").read_text())
+    for key in manifest:
+        manifest[key]["mtime_ns"] = 1_000_000_000
+    (site_dir / ".cache" / "editor-notes" / "outputs.json").write_text(json.dumps(manifest))
+
+    build.build(config.load_config(str(site_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+    assert [path.stat().st_mtime_ns for path in outputs] == [1_000_000_000] * 3
+
+    (docs_dir / "index.md").write_text("# Home\n\nNote[^todo:stable].\n\n[^todo:stable]: Edited note\n")
+    build.build(config.load_config(str(site_dir / "mkdocs.yml")))  # pyright: ignore[reportUnknownMemberType]
+    assert all(path.stat().st_mtime_ns != 1_000_000_000 for path in outputs)
@@ -2,6 +2,7 @@ from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
+import snick
 from mkdocs.structure.pages import Page
 from mkdocs_editor_notes.manager import EditorNotesManager
 from mkdocs_editor_notes.note import EditorNote
@@ -481,3 +482,139 @@ class TestGetAggregatorUrlEdgeCases:
 
         # Path.stem removes only the last extension
         assert result == "../notes.backup"
+
+
+def test_manager__aggregator_order_is_independent_of_processing_order():
+    notes = [
+        EditorNote(note_type="todo", label="b", text="B", source_page=Path("guide/b.md"), line_number=3),
+        EditorNote(note_type="todo", label="a", text="A", source_page=Path("guide/b.md"), line_number=9),
+        EditorNote(note_type="ponder", label="c", text="C", source_page=Path("index.md"), line_number=1),
+        EditorNote(note_type="todo", label="d", text="D", source_page=Path("about.md"), line_number=5),
+    ]
+    forward = EditorNotesManager()
+    backward = EditorNotesManager()
+    for note in notes:
+        forward.add(note)
+    for note in reversed(notes):
+        backward.add(note)
+
+    assert [note.label for note in forward.sorted_notes()] == ["c", "d", "b", "a"]
+    assert forward.build_aggregator_markdown(lambda _: "*") == backward.build_aggregator_markdown(lambda _: "*")
+    assert forward.build_search_index().dumps() == backward.build_search_index().dumps()
+
+
+def test_manager__every_reference_gets_its_own_anchor():
+    manager = EditorNotesManager()
+    page = Mock()
+    page.url = "guide/"
+    page.file.src_uri = "guide.md"
+    markdown = "# Twice[^todo:a]\n\nOne[^todo:a] two[^todo:a] [^todo:missing]\n\n[^todo:a]: A\n"
+
+    result = manager.process_page_markdown(markdown, page, "")
+
+    assert result.startswith('#<span id="ref-todo-a"></span> Twice\n')
+    assert '<span id="ref-2-todo-a"></span><span id="ref-3-todo-a"></span>One two ' in result
+    assert [str(occurrence) for occurrence in manager.occurrences.get("todo:a")] == [
+        "guide.md:1:8",
+        "guide.md:3:4",
+        "guide.md:3:17",
+    ]
+    assert "todo:missing" not in manager.occurrences
+    note = manager.get("todo", "a")
+    assert note is not None and note.line_number == 5
+
+
+@pytest.mark.parametrize("engine", ["process_page_markdown", "process_page_markdown_streaming"])
+def test_manager__occurrences_point_at_the_reference_in_the_page(engine: str):
+    manager = EditorNotesManager()
+    page = Mock()
+    page.url = "guide/"
+    page.file.src_uri = "guide.md"
+    markdown = snick.dedent(
+        """
+        Intro[^todo:a]
+
+        [^todo:a]: A note
+        that spans lines
+
+
+
+        ```
+        code
+        ``` then[^todo:a]
+
+        - item ```inline``` and[^todo:a]
+        """
+    )
+
+    getattr(manager, engine)(markdown, page, "")
+
+    occurrences = manager.occurrences.get("todo:a")
+    lines = markdown.split("\n")
+    assert [(occurrence.line, occurrence.column) for occurrence in occurrences] == [(1, 6), (10, 9), (12, 24)]
+    for occurrence in occurrences:
+        assert lines[occurrence.line - 1][occurrence.column - 1 :].startswith("[^todo:a]")
+    note = manager.get("todo", "a")
+    assert note is not None
+    assert '<a href="../guide/#ref-3-todo-a">guide.md:12:24</a>' in manager.build_aggregator_entry(note)
+
+
+def test_manager__aggregator_entry_lists_every_reference_site():
+    manager = EditorNotesManager()
+    note = EditorNote(note_type="todo", label="a", text="A", source_page=Path("index.md"), line_number=5)
+    manager.add(note)
+    manager.occurrences.add("todo:a", "index.md", "", 2, 3)
+    manager.occurrences.add("todo:a", "guide.md", "guide/", 7, 1)
+
+    entry = manager.build_aggregator_entry(note)
+
+    assert 'a (<a href="../#ref-todo-a">index.md:2:3</a>)' in entry
+    assert (
+        snick.dedent(
+            """
+        <ul class="editor-note-references">
+                <li><a href="../#ref-todo-a">index.md:2:3</a></li>
+                <li><a href="../guide/#ref-2-todo-a">guide.md:7:1</a></li>
+            </ul>
+        """
+        )
+        in entry
+    )
+
+
+def test_build_note_previews__renders_each_note():
+    manager = EditorNotesManager()
+    manager.add(EditorNote(note_type="todo", label="b", text="Use `code`", source_page=Path("index.md")))
+    manager.add(EditorNote(note_type="ponder", label="a", text="Why?", source_page=Path("index.md")))
+
+    assert manager.build_note_previews() == {
+        "ponder:a": "<p>Why?</p>",
+        "todo:b": "<p>Use <code>code</code></p>",
+    }
+
+
+def test_manager__aggregator_lists_changes_since_previous_build():
+    from mkdocs_editor_notes.history import NoteDiff
+
+    manager = EditorNotesManager()
+    manager.add(EditorNote(note_type="todo", label="a", text="A", source_page=Path("index.md")))
+    manager.changes = NoteDiff(added=["todo:a"], resolved=["ponder:gone", "todo:old"])
+
+    html = manager.build_aggregator_html(lambda _: "*")
+
+    assert (
+        snick.dedent(
+            """
+        <h2>Changes since the previous build</h2>
+        <ul class="editor-notes-changes">
+            <li>Added (1): <a href="#agg-todo-a">todo:a</a></li>
+            <li>Resolved (2): <code>ponder:gone</code>, <code>todo:old</code></li>
+        </ul>
+        """
+        )
+        in html
+    )
+    assert html.index("editor-notes-changes") < html.index('id="agg-todo-a"')
+
+    manager.changes = NoteDiff()
+    assert "editor-notes-changes" not in manager.build_aggregator_html(lambda _: "*")
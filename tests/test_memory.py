@@ -0,0 +1,144 @@
+"""Peak memory budgets for large note volumes and large pages, measured with tracemalloc.
+
+The budgets leave about 25% of headroom over the measured footprint, so a change to the `EditorNote` layout, the
+index structures, the occurrence table or the copies made while processing a page fails here instead of going
+unnoticed. The million note case takes over a minute, so it only runs when `EDITOR_NOTES_MEMORY_FULL` is set.
+"""
+
+import gc
+import os
+import re
+import tracemalloc
+from collections.abc import Callable, Generator
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from mkdocs_editor_notes.manager import EditorNotesManager
+
+NOTES_PER_PAGE = 1_000
+
+NOTE_BUDGET = 750
+SEARCH_INDEX_BUDGET = 300
+# The regex pipeline also keeps a source map, a few machine words per line and per rewritten span
+PAGE_BYTE_BUDGET = 9
+STREAMING_PAGE_BYTE_BUDGET = 4
+REFERENCE_BUDGET = 26
+
+full_only = pytest.mark.skipif(
+    not os.environ.get("EDITOR_NOTES_MEMORY_FULL"), reason="set EDITOR_NOTES_MEMORY_FULL to run"
+)
+
+
+def make_page(number: int) -> Mock:
+    page = Mock()
+    page.url = f"guide/page-{number}/"
+    page.file.src_uri = f"guide/page-{number}.md"
+    return page
+
+
+def replace_reference(_match: re.Match[str]) -> str:
+    return "<sup>note</sup>"
+
+
+def iter_pages(note_count: int) -> Generator[tuple[Mock, str], None, None]:
+    """Generate pages that reference and define their share of the notes, built lazily to keep them out of the peak."""
+    for number in range(note_count // NOTES_PER_PAGE):
+        labels = [f"note-{number}-{index}" for index in range(NOTES_PER_PAGE)]
+        references = "".join(f"Text about {label}[^todo:{label}].\n\n" for label in labels)
+        definitions = "".join(f"[^todo:{label}]: Note text for {label}\n" for label in labels)
+        yield make_page(number), references + definitions
+
+
+def peak_bytes(function: Callable[[], Any]) -> tuple[Any, int]:
+    """Run a function and return its result with the peak memory it allocated on top of what was already in use."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def lowest_peak_bytes(function: Callable[[], Any], runs: int = 2) -> tuple[Any, int]:
+    """Like `peak_bytes`, but keep the run with the lowest peak.
+
+    Interning note keys and types can make Python grow its process-wide table of interned strings in the middle of a
+    run, a one-off allocation of a few megabytes that is not part of what is measured.
+    """
+    return min((peak_bytes(function) for _ in range(runs)), key=lambda run: run[1])
+
+
+def retained_bytes(function: Callable[[], Any]) -> tuple[Any, int]:
+    """Run a function and return its result with the memory it left allocated, transient copies excluded."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = function()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def build_manager(note_count: int) -> EditorNotesManager:
+    manager = EditorNotesManager()
+    for page, markdown in iter_pages(note_count):
+        manager.process_page_markdown(markdown, page, "")
+    return manager
+
+
+@pytest.mark.parametrize("note_count", [10_000, 100_000, pytest.param(1_000_000, marks=full_only)])
+def test_memory__notes_within_budget(note_count: int):
+    # One-time allocations (compiled patterns, lazy imports, coverage data) would skew the smaller cases
+    build_manager(NOTES_PER_PAGE).build_search_index()
+
+    manager, peak = lowest_peak_bytes(lambda: build_manager(note_count))
+
+    assert len(manager.store) == note_count
+    assert peak / note_count < NOTE_BUDGET
+
+    index, peak = peak_bytes(manager.build_search_index)
+
+    assert len(index) == note_count
+    assert peak / note_count < SEARCH_INDEX_BUDGET
+
+
+@pytest.mark.parametrize(
+    "engine, budget",
+    [
+        ("process_page_markdown", PAGE_BYTE_BUDGET),
+        ("process_page_markdown_streaming", STREAMING_PAGE_BYTE_BUDGET),
+    ],
+)
+def test_memory__large_page_within_budget(engine: str, budget: int):
+    section = (
+        "## Section\n\nSome paragraph text that mentions a note[^todo:big] once.\n\n- item[^ponder:other]\n\n"
+        "```\ncode [^todo:big]\n```\n\n"
+    )
+    markdown = section * 4_000 + "[^todo:big]: The big note\n[^ponder:other]: Other\n"
+    process = getattr(EditorNotesManager(), engine)
+
+    output, peak = lowest_peak_bytes(lambda: process(markdown, make_page(0), replace_reference))
+
+    assert output.count("<sup>note</sup>") == 8_000
+    assert peak / len(markdown) < budget
+
+
+def test_memory__heavily_referenced_note_within_budget():
+    reference_count = 100_000
+    manager = EditorNotesManager()
+    manager.process_page_markdown("[^todo:busy]: Referenced everywhere\n", make_page(0), "")
+
+    def reference_everywhere() -> None:
+        for number in range(reference_count // NOTES_PER_PAGE):
+            markdown = "".join(f"Line {index} mentions it[^todo:busy].\n" for index in range(NOTES_PER_PAGE))
+            manager.process_page_markdown(markdown, make_page(number), "")
+
+    _, retained = retained_bytes(reference_everywhere)
+
+    assert manager.occurrences.count("todo:busy") == reference_count
+    assert retained / reference_count < REFERENCE_BUDGET
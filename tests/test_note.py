@@ -20,6 +20,8 @@ def test_note__properties():
     assert note.line_number == 10
 
     assert note.ref_id == "ref-todo-fix-bug"
+    assert note.occurrence_ref_id(0) == "ref-todo-fix-bug"
+    assert note.occurrence_ref_id(2) == "ref-3-todo-fix-bug"
     assert note.ref_url == "../#ref-todo-fix-bug"  # Relative path from aggregator
     assert note.agg_id == "agg-todo-fix-bug"
     assert note.hover_text == "todo: fix-bug"
@@ -35,3 +37,34 @@ def test_note__properties():
     )
 
     assert note_with_url.ref_url == "../features/#ref-ponder-question"
+
+
+def test_note__dict_round_trip():
+    note = EditorNote(
+        note_type="todo",
+        label="fix-bug",
+        text="Fix the bug",
+        source_page=Path("guide/index.md"),
+        source_url="guide/",
+        line_number=7,
+    )
+
+    data = note.to_dict()
+    assert data["source_page"] == "guide/index.md"
+    assert EditorNote.from_dict(data) == note
+
+
+def test_note__authored_date():
+    note = EditorNote(note_type="todo", label="old", text="Old", source_page=Path("index.md"))
+    assert note.authored_date == ""
+
+    note.author = "Ann Author"
+    note.author_time = 1714996800
+    assert note.authored_date == "2024-05-06"
+    assert EditorNote.from_dict(note.to_dict()) == note
+
+
+def test_note__from_dict_without_blame_fields():
+    data = dict(note_type="todo", label="a", text="A", source_page="index.md", source_url="", line_number=1)
+
+    assert EditorNote.from_dict(data).author == ""
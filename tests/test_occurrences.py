@@ -0,0 +1,50 @@
+from mkdocs_editor_notes.occurrences import NoteOccurrence, OccurrenceTable
+
+
+def test_occurrences__add_returns_index_per_note():
+    table = OccurrenceTable()
+
+    assert table.add("todo:a", "index.md", "", 3, 7) == 0
+    assert table.add("todo:b", "guide.md", "guide/", 1, 1) == 0
+    assert table.add("todo:a", "guide.md", "guide/", 9, 2) == 1
+
+    assert table.count("todo:a") == 2
+    assert table.count("todo:missing") == 0
+    assert len(table) == 3
+    assert "todo:b" in table
+    assert "todo:missing" not in table
+
+
+def test_occurrences__get_rebuilds_rows_in_recorded_order():
+    table = OccurrenceTable()
+    table.add("todo:a", "index.md", "", 3, 7)
+    table.add("todo:a", "guide.md", "guide/", 9, 2)
+    table.add("todo:a", "index.md", "")
+
+    assert table.get("todo:a") == [
+        NoteOccurrence("index.md", "", 3, 7),
+        NoteOccurrence("guide.md", "guide/", 9, 2),
+        NoteOccurrence("index.md", "", 0, 0),
+    ]
+    assert table.get("todo:missing") == []
+    assert table.pages == ["index.md", "guide.md"]
+
+
+def test_occurrences__str_shows_known_position():
+    assert str(NoteOccurrence("index.md", "", 3, 7)) == "index.md:3:7"
+    assert str(NoteOccurrence("index.md", "", 3, 0)) == "index.md:3"
+    assert str(NoteOccurrence("index.md", "", 0, 0)) == "index.md"
+
+
+def test_occurrences__rows_share_integer_columns():
+    table = OccurrenceTable()
+    for line in range(1, 5_001):
+        table.add("todo:busy", f"page-{line % 10}.md", "", line, 1)
+        table.add("todo:other", "index.md", "", line, 2)
+
+    assert table.count("todo:busy") == 5_000
+    assert len(table.row_lines) == len(table) == 10_000
+    assert all(column.typecode == "I" for column in [table.row_pages, table.row_lines, table.row_previous])
+    assert len(table.pages) == 11
+    assert [occurrence.line for occurrence in table.get("todo:busy")] == list(range(1, 5_001))
+    assert list(table) == ["todo:busy", "todo:other"]
@@ -1,6 +1,10 @@
 """Tests for markdown parsing utilities."""
 
+import re
+from unittest.mock import Mock
+
 from mkdocs_editor_notes.manager import EditorNotesManager, LineType
+from mkdocs_editor_notes.parser import strip_notes
 
 
 class TestLineType:
@@ -318,3 +322,59 @@ class TestEdgeCases:
         result2 = EditorNotesManager.insert_anchor_in_line(result1, '<span id="2"></span>')
         # Second insertion still classifies as heading after lstrip(), so anchor goes after #
         assert result2 == '#<span id="2"></span><span id="1"></span> Heading'
+
+
+class TestRestoreCodeBlocks:
+    """Tests for putting protected code blocks back."""
+
+    def test_round_trip_with_many_blocks(self):
+        markdown = "".join(f"Text {index}\n```\ncode {index}\n```\n" for index in range(12))
+        code_blocks: list[str] = []
+
+        protected = EditorNotesManager.protect_code_blocks(markdown, code_blocks)
+
+        assert len(code_blocks) == 12
+        assert EditorNotesManager.restore_code_blocks(protected, code_blocks) == markdown
+
+    def test_leaves_placeholder_lookalikes_without_block(self):
+        result = EditorNotesManager.restore_code_blocks("<<<CODE_BLOCK_0>>> <<<CODE_BLOCK_7>>>", ["```x```"])
+        assert result == "```x``` <<<CODE_BLOCK_7>>>"
+
+
+class TestStripNotes:
+    """Tests for the single removal pass used in strip mode."""
+
+    def test_page_without_notes_is_returned_as_is(self):
+        markdown = "# Title\n\nText with [a link](x.md) and a [^footnote].\n"
+        assert strip_notes(markdown) is markdown
+
+    def test_removes_definitions_and_references(self):
+        markdown = (
+            "# Title[^todo:a]\n\nText[^ponder:b] here.\n\n[^todo:a]: First\nstill first\n[^ponder:b]: Second\n\nEnd\n"
+        )
+        assert strip_notes(markdown) == "# Title\n\nText here.\n\nEnd\n"
+
+    def test_keeps_code_blocks(self):
+        markdown = "Text[^todo:a]\n\n```md\nText[^todo:a]\n\n[^todo:a]: Example\n```\n\n[^todo:a]: Real\n"
+        assert strip_notes(markdown) == "Text\n\n```md\nText[^todo:a]\n\n[^todo:a]: Example\n```\n\n"
+
+    def test_keeps_literal_placeholder_text(self):
+        markdown = "see <<<CODE_BLOCK_5>>> here[^todo:a]\n\n```\nx\n```\n"
+        assert strip_notes(markdown) == "see <<<CODE_BLOCK_5>>> here\n\n```\nx\n```\n"
+
+    def test_matches_full_pipeline_without_anchors(self):
+        markdown = (
+            "# Title[^todo:a]\n\n"
+            "- Item[^ponder:b] and[^todo:a]\n\n"
+            "[^todo:a]: Note with code\n"
+            "~~~\ncode\n\nmore code\n~~~\n\n"
+            "[^ponder:b]:\n\nSpaced\n\n"
+            "Para[^todo:missing] end[^todo:a]:\n"
+        )
+        page = Mock()
+        page.file.src_uri = "index.md"
+        page.url = ""
+
+        full = EditorNotesManager().process_page_markdown(markdown, page, "")
+
+        assert strip_notes(markdown) == re.sub(r'<span id="ref-[^"]+"></span>', "", full)
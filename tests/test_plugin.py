@@ -1,10 +1,12 @@
 from pathlib import Path
+from typing import cast
 
 import pytest
 import snick
 from mkdocs_editor_notes.constants import NOTE_DEF_PATTERN, NOTE_REF_PATTERN
 from mkdocs_editor_notes.note import EditorNote
 from mkdocs_editor_notes.plugin import EditorNotesPlugin
+from mkdocs_editor_notes.view import NoteIndexView
 
 
 def test_plugin_initialization():
@@ -244,6 +246,28 @@ def test_marker_links__use_agg_id():
     assert 'href="notes#agg-todo-test-label"' in result
     assert "ref-todo-test-label" not in result
     assert f'title="{note.hover_text}"' in result
+    assert "data-note" not in result
+
+
+def test_marker_links__name_note_for_previews():
+    """Verify that markers carry only the note key when note previews are enabled."""
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(show_markers=True, note_previews=True))
+    plugin.note_manager.add(EditorNote(note_type="todo", label="peek", text="Long text", source_page=Path("index.md")))
+
+    from unittest.mock import Mock
+
+    mock_page = Mock()
+    mock_page.url = ""
+
+    replacer = plugin.get_ref_replacer(mock_page)
+    assert callable(replacer)
+    match = NOTE_REF_PATTERN.search("Text[^todo:peek]")
+    assert match
+
+    result = replacer(match)
+    assert 'data-note="todo:peek"' in result
+    assert "Long text" not in result
 
 
 def test_plugin_config__custom_highlight_durations():
@@ -292,6 +316,9 @@ def test_undefined_note_reference__logs_warning(caplog: pytest.LogCaptureFixture
     )
 
     plugin.on_page_markdown(markdown, mock_page, mock_config, mock_files)
+    assert len(caplog.records) == 0
+
+    plugin.on_env(Mock(), mock_config, mock_files)
 
     assert len(caplog.records) == 1
     assert caplog.records[0].levelname == "WARNING"
@@ -300,6 +327,76 @@ def test_undefined_note_reference__logs_warning(caplog: pytest.LogCaptureFixture
     assert "test.md" in caplog.records[0].message
 
 
+def test_diagnostics__grouped_report_and_strict_mode(caplog: pytest.LogCaptureFixture, tmp_path: Path) -> None:
+    """Verify that every note problem is reported once, together, and that strict mode fails the build afterwards."""
+    import logging
+    from unittest.mock import Mock
+
+    from mkdocs.exceptions import PluginError
+
+    caplog.set_level(logging.INFO)
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(strict=True, search_index=False, cache_dir=str(tmp_path / "cache")))
+
+    first_page = Mock()
+    first_page.url = "first/"
+    first_page.file.src_uri = "first.md"
+    second_page = Mock()
+    second_page.url = "second/"
+    second_page.file.src_uri = "second.md"
+
+    first = snick.dedent(
+        """
+        Uses[^todo:used] and[^todo:missing] and again[^todo:missing].
+
+        [^todo:used]: Used note
+        [^todo:unused]: Never referenced
+        [^todo:twice]: First definition
+        """
+    )
+    second = snick.dedent(
+        """
+        Refers to[^todo:twice].
+
+        [^todo:twice]: Second definition
+        """
+    )
+
+    plugin.on_page_markdown(first, first_page, Mock(), Mock())
+    plugin.on_page_markdown(second, second_page, Mock(), Mock())
+    plugin.on_env(Mock(), Mock(), Mock())
+
+    assert plugin.note_manager.notes_map["todo:twice"].text == "First definition"
+    # Unused notes are valid, so they are kept out of the warning that would fail `mkdocs build --strict`
+    assert [(record.levelname, record.getMessage()) for record in caplog.records] == [
+        (
+            "WARNING",
+            snick.dedent(
+                """
+                mkdocs_editor_notes: Editor notes found 2 problem(s):
+                  Undefined note references (1):
+                    [^todo:missing] at first.md:1, first.md:1
+                  Duplicate note definitions (1):
+                    [^todo:twice] defined at first.md:5, second.md:3 (the first one is kept)
+                """
+            ),
+        ),
+        (
+            "INFO",
+            snick.dedent(
+                """
+                mkdocs_editor_notes: Editor notes found 1 unused note definition(s):
+                  [^todo:unused] defined at first.md:4
+                """
+            ),
+        ),
+    ]
+
+    with pytest.raises(PluginError, match="found 3 problem"):
+        plugin.on_post_build(Mock(site_dir=str(tmp_path / "site")))
+
+
 def test_note_refs_in_headings():
     """Verify that note refs in headings don't break heading rendering."""
     from unittest.mock import Mock
@@ -394,3 +491,316 @@ def test_note_refs_in_lists():
     assert result is not None
     assert '- <span id="ref-todo-fixit"></span>Item two' in result
     assert '2. <span id="ref-bug-issue"></span>Second' in result
+
+
+def test_on_page_markdown__streams_pages_over_threshold():
+    from unittest.mock import Mock, patch
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(show_markers=True, streaming_threshold=100))
+
+    mock_page = Mock()
+    mock_page.url = "test/"
+    mock_page.file.src_uri = "test.md"
+    small = "Short[^todo:small]\n\n[^todo:small]: Small page\n"
+    large = "Long page[^todo:large]\n\n" + "Filler text.\n" * 10 + "\n[^todo:large]: Large page\n"
+
+    manager = plugin.note_manager
+    with patch.object(manager, "process_page_markdown_streaming", wraps=manager.process_page_markdown_streaming) as spy:
+        small_result = plugin.on_page_markdown(small, mock_page, Mock(), Mock())
+        large_result = plugin.on_page_markdown(large, mock_page, Mock(), Mock())
+
+    assert spy.call_count == 1
+    assert spy.call_args.args[0] == large
+    assert small_result is not None and 'id="ref-todo-small"' in small_result
+    assert large_result is not None and '<span id="ref-todo-large"></span>Long page' in large_result
+    assert "[^todo:large]:" not in large_result
+
+
+def test_on_page_markdown__falls_back_to_streaming_over_time_budget(caplog: pytest.LogCaptureFixture) -> None:
+    import logging
+    import re
+    from unittest.mock import Mock, patch
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(show_markers=True, page_time_budget=0.05))
+    caplog.set_level(logging.WARNING)
+
+    mock_page = Mock()
+    mock_page.url = "test/"
+    mock_page.file.src_uri = "test.md"
+    markdown = "Slow page[^todo:slow]\n\n[^todo:slow]: Pathological page\n"
+
+    def backtrack(markdown: str, *_: object) -> str:
+        re.match(r"(a+)+$", "a" * 64 + "b")
+        return markdown
+
+    manager = plugin.note_manager
+    with patch.object(manager, "protect_code_blocks", side_effect=backtrack):
+        result = plugin.on_page_markdown(markdown, mock_page, Mock(), Mock())
+
+    assert result is not None and '<span id="ref-todo-slow"></span>Slow page' in result
+    assert "[^todo:slow]:" not in result
+    assert [note.label for note in manager] == ["slow"]
+    assert len(caplog.records) == 1
+    assert "test.md (55 characters) went over the 0.05s page time budget in the code_blocks stage" in caplog.text
+
+
+def test_on_page_markdown__reports_slow_stage_it_cannot_abandon(caplog: pytest.LogCaptureFixture) -> None:
+    import logging
+    import time
+    from unittest.mock import Mock, patch
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(page_time_budget=0.01))
+    caplog.set_level(logging.WARNING)
+
+    mock_page = Mock()
+    mock_page.url = "test/"
+    mock_page.file.src_uri = "test.md"
+
+    def slow_references(markdown: str, *_: object) -> str:
+        time.sleep(0.05)
+        return markdown
+
+    with patch.object(plugin.note_manager, "parse_note_references", side_effect=slow_references):
+        result = plugin.on_page_markdown("Text[^todo:a]\n\n[^todo:a]: A\n", mock_page, Mock(), Mock())
+
+    assert result == "Text\n\n"
+    assert "over the 0.01s page time budget, mostly in the references stage" in caplog.text
+
+
+def test_merge_shard_notes__records_duplicates(tmp_path: Path) -> None:
+    from mkdocs_editor_notes.diagnostics import NoteLocation
+    from mkdocs_editor_notes.shard import write_shard
+
+    for name, text in (("first", "From first"), ("second", "From second")):
+        write_shard(
+            tmp_path / f"{name}.jsonl",
+            name,
+            [
+                EditorNote(note_type="todo", label="shared", text=text, source_page=Path("index.md")),
+                EditorNote(note_type="todo", label="local", text=text, source_page=Path("index.md"), line_number=7),
+            ],
+            prefix=name,
+        )
+    (tmp_path / "mkdocs.yml").touch()
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(merge_shards=["*.jsonl"]), config_file_path=str(tmp_path / "mkdocs.yml"))
+    plugin.note_manager.define(
+        EditorNote(note_type="todo", label="local", text="Local", source_page=Path("local.md")), line_number=3
+    )
+
+    plugin.merge_shard_notes()
+
+    assert plugin.note_manager.notes_map["todo:shared"].text == "From first"
+    assert plugin.note_manager.notes_map["todo:local"].text == "Local"
+    assert plugin.note_manager.diagnostics.duplicates == {
+        "todo:local": [NoteLocation("local.md", 3), NoteLocation("shard 'first'"), NoteLocation("shard 'second'")],
+        "todo:shared": [NoteLocation("shard 'first'"), NoteLocation("shard 'second'")],
+    }
+
+
+def test_blame_notes__warns_outside_git(caplog: pytest.LogCaptureFixture, tmp_path: Path) -> None:
+    import logging
+    import shutil
+    from unittest.mock import Mock
+
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+
+    caplog.set_level(logging.WARNING)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.md").write_text("[^todo:a]: A\n")
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(git_blame=True, cache_dir=str(tmp_path / "cache")))
+    plugin.note_manager.add(EditorNote(note_type="todo", label="a", text="A", source_page=Path("index.md")))
+
+    plugin.blame_notes(Mock(docs_dir=str(tmp_path / "docs")))
+
+    assert "Skipping git blame for editor notes" in caplog.text
+    assert plugin.note_manager.notes_map["todo:a"].author == ""
+
+
+def test_on_startup__keeps_fragments_across_rebuilds(tmp_path: Path) -> None:
+    from mkdocs.config import load_config  # pyright: ignore[reportUnknownVariableType]
+
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "mkdocs.yml").write_text("site_name: Serve\nplugins:\n  - editor-notes\n")
+
+    first = load_config(str(tmp_path / "mkdocs.yml"))
+    plugin = cast(EditorNotesPlugin, first.plugins["editor-notes"])
+
+    # MkDocs serve reloads the config for every rebuild but reuses plugins that define on_startup
+    reloaded = load_config(str(tmp_path / "mkdocs.yml"))
+    assert reloaded.plugins["editor-notes"] is plugin
+
+    plugin.on_config(first)
+    fragments = plugin.note_manager.fragments
+    plugin.on_config(reloaded)
+    assert plugin.note_manager.fragments is fragments
+
+
+def test_on_nav__moves_aggregator_page_last(tmp_path: Path) -> None:
+    from unittest.mock import Mock
+
+    from mkdocs.structure.files import File, Files
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(aggregator_page="notes.md"))
+    files = Files(
+        [
+            File(name, src_dir=str(tmp_path), dest_dir=str(tmp_path / "site"), use_directory_urls=True)
+            for name in ["a.md", "notes.md", "z.md"]
+        ]
+    )
+
+    nav = Mock()
+    assert plugin.on_nav(nav, config=Mock(), files=files) is nav
+    assert [file.src_uri for file in files.documentation_pages()] == ["a.md", "z.md", "notes.md"]
+
+
+def test_aggregator_page__rendered_again_when_pages_follow_it(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Verify that the aggregator is built in-band, and rebuilt in on_env only if a page was processed after it."""
+    import logging
+    from unittest.mock import Mock
+
+    from mkdocs_editor_notes import blame
+
+    caplog.set_level(logging.INFO)
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    plugin = EditorNotesPlugin()
+    plugin.load_config(
+        dict(
+            aggregator_page="notes.md",
+            cache_dir=str(tmp_path / "cache"),
+            git_blame=True,
+            merge_shards=["missing-shards/*.jsonl"],
+        )
+    )
+    blamed: list[list[str]] = []
+
+    def record_blame(paths: list[Path], **_: object) -> dict[Path, blame.FileBlame]:
+        blamed.append(sorted(path.name for path in paths))
+        return {}
+
+    monkeypatch.setattr(blame, "blame_definitions", record_blame)
+    config = Mock(docs_dir=str(docs_dir))
+
+    def make_page(src_uri: str) -> Mock:
+        (docs_dir / src_uri).write_text("")
+        page = Mock()
+        page.url = src_uri.removesuffix(".md") + "/"
+        page.file.src_uri = src_uri
+        page.content = None
+        return page
+
+    first_page = make_page("first.md")
+    aggregator_page = make_page("notes.md")
+    late_page = make_page("late.md")
+
+    plugin.on_page_markdown("A[^todo:early]\n\n[^todo:early]: Early note\n", first_page, config, Mock())
+    markdown = plugin.on_page_markdown("", aggregator_page, config, Mock())
+    assert markdown is not None
+    assert "## ✅ todo" in markdown
+    assert "Early note" in markdown
+
+    plugin.on_env(Mock(), config, Mock())
+    assert aggregator_page.content is None
+    assert blamed == [["first.md"]]
+
+    plugin.on_page_markdown("B[^todo:late]\n\n[^todo:late]: Late note\n", late_page, config, Mock())
+    plugin.on_env(Mock(), config, Mock())
+    assert aggregator_page.content is not None
+    assert "Early note" in aggregator_page.content
+    assert "Late note" in aggregator_page.content
+
+    # Only the late page is blamed again, and the stale shards are reported
+    assert blamed == [["first.md"], ["late.md"]]
+    assert [record.getMessage() for record in caplog.records if record.levelname == "INFO"][-2:] == [
+        "mkdocs_editor_notes: Pages were processed after the editor notes aggregator page, so it is rendered again: "
+        + "late.md",
+        "mkdocs_editor_notes: The shard emitted and the shards merged for this build miss the notes of: late.md",
+    ]
+
+
+def test_note_index__published_to_subscribers_once_notes_are_collected(tmp_path: Path) -> None:
+    from unittest.mock import Mock
+
+    from mkdocs.config import load_config  # pyright: ignore[reportUnknownVariableType]
+
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "mkdocs.yml").write_text("site_name: Test\nplugins:\n  - editor-notes\n")
+    config = load_config(str(tmp_path / "mkdocs.yml"))
+    plugin = cast(EditorNotesPlugin, config.plugins["editor-notes"])
+
+    received: list[NoteIndexView] = []
+    plugin.subscribe(received.append)
+    plugin.subscribe(received.append)
+    plugin.on_config(config)
+    assert plugin.note_index is None
+
+    page = Mock()
+    page.url = ""
+    page.file.src_uri = "index.md"
+    plugin.on_page_markdown("Text[^todo:a]\n\n[^todo:a]: A note\n", page, config, Mock())
+    plugin.on_env(Mock(), config, Mock())
+
+    assert received == [plugin.note_index]
+    assert plugin.note_index is not None
+    assert plugin.note_index.by_key["todo:a"].text == "A note"
+    assert plugin.note_index.stats.references == 1
+
+
+def test_strip_mode__registers_only_the_removal_pass() -> None:
+    from unittest.mock import Mock
+
+    from mkdocs.plugins import PluginCollection
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(mode="strip", show_markers=True))
+    collection = PluginCollection()
+    collection["editor-notes"] = plugin
+
+    registered = {event for event, methods in collection.events.items() if methods}  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+    assert registered == {"page_markdown"}
+    result = collection.on_page_markdown("Text[^todo:a]\n\n[^todo:a]: Note\n", page=Mock(), config=Mock(), files=Mock())
+    assert result == "Text\n\n"
+
+    # A reused instance gets its regular hooks back when the config no longer asks for strip mode
+    plugin.load_config(dict())
+    collection = PluginCollection()
+    collection["editor-notes"] = plugin
+    assert collection.events["files"] == [plugin.on_files]  # pyright: ignore[reportUnknownMemberType]
+    assert collection.events["page_markdown"] == [plugin.on_page_markdown]  # pyright: ignore[reportUnknownMemberType]
+
+
+def test_on_files__adds_generated_aggregator_page(tmp_path: Path) -> None:
+    from mkdocs.config import load_config  # pyright: ignore[reportUnknownVariableType]
+    from mkdocs.structure.files import File, Files
+
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (tmp_path / "mkdocs.yml").write_text(
+        "site_name: Test\nplugins:\n  - editor-notes:\n      aggregator_page: notes/editor-notes.md\n"
+    )
+    config = load_config(str(tmp_path / "mkdocs.yml"))
+
+    files = config.plugins.on_files(Files([]), config=config)
+
+    generated = files.get_file_from_path("notes/editor-notes.md")
+    assert generated is not None
+    assert generated.generated_by == "editor-notes"
+    assert generated.url == "notes/editor-notes/"
+    assert list(docs_dir.iterdir()) == []
+
+    # An aggregator page the docs already provide is kept as it is
+    own_page = File("notes/editor-notes.md", src_dir=str(docs_dir), dest_dir=config.site_dir, use_directory_urls=True)
+    files = config.plugins.on_files(Files([own_page]), config=config)
+    assert list(files)[0] is own_page
+    assert [file.src_uri for file in files.documentation_pages()] == ["notes/editor-notes.md"]
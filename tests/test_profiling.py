@@ -0,0 +1,84 @@
+import pstats
+from pathlib import Path
+
+import pytest
+from mkdocs_editor_notes.constants import PROFILE_ENV_VAR, ProfileMode
+from mkdocs_editor_notes.plugin import EditorNotesPlugin
+from mkdocs_editor_notes.profiling import HookProfiler, parse_modes
+
+
+def test_parse_modes():
+    assert parse_modes(["cprofile"]) == {ProfileMode.CPROFILE}
+    assert parse_modes([" TraceMalloc ", ""]) == {ProfileMode.TRACEMALLOC}
+    assert parse_modes(["all"]) == set(ProfileMode)
+    assert parse_modes([]) == set()
+
+    with pytest.raises(ValueError):
+        parse_modes(["perf"])
+
+
+def test_hook_profiler__writes_reports(tmp_path: Path):
+    profiler = HookProfiler(set(ProfileMode), tmp_path / "profile")
+
+    def on_page_markdown(markdown: str) -> str:
+        return "".join([markdown] * 1000)
+
+    def on_post_build() -> None:
+        pass
+
+    wrapped = profiler.wrap("on_page_markdown", on_page_markdown)
+    assert wrapped("x") == "x" * 1000
+    assert wrapped("y") == "y" * 1000
+    assert wrapped.__name__ == "on_page_markdown"
+
+    profiler.wrap("on_post_build", on_post_build, finalize=True)()
+
+    reports = sorted(p.name for p in (tmp_path / "profile").iterdir())
+    assert reports == [
+        "on_page_markdown.prof",
+        "on_page_markdown.tracemalloc.txt",
+        "on_post_build.prof",
+        "on_post_build.tracemalloc.txt",
+    ]
+    profile = pstats.Stats(str(tmp_path / "profile" / "on_page_markdown.prof")).get_stats_profile()
+    assert profile.func_profiles["on_page_markdown"].ncalls == "2"
+    summary = (tmp_path / "profile" / "on_page_markdown.tracemalloc.txt").read_text()
+    assert summary.startswith("on_page_markdown: 2 calls")
+
+
+def test_plugin__hooks_untouched_when_profiling_is_off(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict())
+
+    assert "on_page_markdown" not in vars(plugin)
+
+
+def test_plugin__wraps_hooks_from_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    plugin = EditorNotesPlugin()
+    errors, _ = plugin.load_config(dict(profile=["cprofile"], cache_dir=str(tmp_path)))
+
+    assert errors == []
+    assert {"on_config", "on_files", "on_page_markdown", "on_env", "on_post_page", "on_post_build"} <= set(vars(plugin))
+
+    plugin.load_config(dict(profile=["cprofile"], cache_dir=str(tmp_path)))
+    assert vars(plugin)["on_page_markdown"].__wrapped__.__func__ is EditorNotesPlugin.on_page_markdown
+
+
+def test_plugin__wraps_hooks_from_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(PROFILE_ENV_VAR, "tracemalloc")
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(cache_dir=str(tmp_path)))
+
+    assert "on_page_markdown" in vars(plugin)
+
+
+def test_plugin__warns_on_invalid_env_mode(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(PROFILE_ENV_VAR, "perf")
+    plugin = EditorNotesPlugin()
+    errors, warnings = plugin.load_config(dict())
+
+    assert errors == []
+    assert warnings[0][0] == "profile"
+    assert "on_page_markdown" not in vars(plugin)
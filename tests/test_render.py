@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from mkdocs_editor_notes.render import NoteTextRenderer
+
+
+def test_renderer__renders_markdown():
+    renderer = NoteTextRenderer()
+
+    assert renderer.render("Plain text") == "<p>Plain text</p>"
+    assert renderer.render("See [docs](https://example.com) and `code`") == (
+        '<p>See <a href="https://example.com">docs</a> and <code>code</code></p>'
+    )
+
+
+def test_renderer__memoizes_by_text():
+    renderer = NoteTextRenderer()
+
+    first = renderer.render("*emphasis*")
+    second = renderer.render("*emphasis*")
+
+    assert first == second == "<p><em>emphasis</em></p>"
+    assert renderer.misses == 1
+
+
+def test_renderer__key_depends_on_extension_config():
+    plain = NoteTextRenderer()
+    with_tables = NoteTextRenderer(["tables"])
+    with_toc = NoteTextRenderer(["toc"], {"toc": {"permalink": True}})
+
+    assert len({plain.key("text"), with_tables.key("text"), with_toc.key("text")}) == 3
+
+
+def test_renderer__persists_used_entries(tmp_path: Path):
+    cache_path = tmp_path / "cache" / "rendered-notes.json"
+    renderer = NoteTextRenderer(cache_path=cache_path)
+    renderer.render("kept")
+    renderer.render("dropped")
+    renderer.save()
+
+    next_build = NoteTextRenderer(cache_path=cache_path)
+    assert next_build.render("kept") == "<p>kept</p>"
+    assert next_build.misses == 0
+    next_build.save()
+
+    last_build = NoteTextRenderer(cache_path=cache_path)
+    assert last_build.render("dropped") == "<p>dropped</p>"
+    assert last_build.misses == 1
+
+
+def test_renderer__save_without_cache_path_is_noop():
+    renderer = NoteTextRenderer()
+    renderer.render("text")
+    renderer.save()
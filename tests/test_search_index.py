@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.search_index import NoteSearchIndex
+
+
+def test_search_index__tokenize():
+    assert NoteSearchIndex.tokenize("Fix the `parse()` bug in guide/intro.md!") == {
+        "fix",
+        "the",
+        "parse",
+        "bug",
+        "in",
+        "guide",
+        "intro",
+        "md",
+    }
+
+
+def test_search_index__built_in_aggregator_order():
+    manager = EditorNotesManager()
+    manager.add(EditorNote(note_type="todo", label="fix-bug", text="Fix the parser", source_page=Path("index.md")))
+    manager.add(EditorNote(note_type="ponder", label="why", text="Why the parser?", source_page=Path("guide/a.md")))
+    manager.add(EditorNote(note_type="todo", label="docs", text="Write docs", source_page=Path("guide/a.md")))
+
+    index = manager.build_search_index()
+    assert len(index) == 3
+    assert index.entries == ["agg-ponder-why", "agg-todo-docs", "agg-todo-fix-bug"]
+    assert index.types == {"ponder": [0], "todo": [1, 2]}
+    assert index.pages == {"guide/a.md": [0, 1], "index.md": [2]}
+    assert index.tokens["parser"] == [0, 2]
+    assert index.tokens["guide"] == [0, 1]
+    assert index.tokens["todo"] == [1, 2]
+    assert index.tokens["bug"] == [2]
+
+
+def test_search_index__dumps_compact_json():
+    index = NoteSearchIndex()
+    index.add(EditorNote(note_type="todo", label="a", text="Alpha", source_page=Path("index.md")))
+
+    dumped = index.dumps()
+    assert " " not in dumped
+    assert json.loads(dumped) == dict(
+        entries=["agg-todo-a"],
+        types={"todo": [0]},
+        pages={"index.md": [0]},
+        tokens={"a": [0], "alpha": [0], "index": [0], "md": [0], "todo": [0]},
+    )
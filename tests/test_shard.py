@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.shard import merge_shards, prefix_note, read_shard, write_shard
+
+
+def make_note(note_type: str, label: str, text: str = "", page: str = "index.md", url: str = "") -> EditorNote:
+    return EditorNote(note_type=note_type, label=label, text=text, source_page=Path(page), source_url=url)
+
+
+def test_prefix_note():
+    note = make_note("todo", "a", page="guide/intro.md", url="guide/intro/")
+
+    prefixed = prefix_note(note, "/api/")
+    assert prefixed.source_page == Path("api/guide/intro.md")
+    assert prefixed.source_url == "api/guide/intro/"
+    assert note.source_url == "guide/intro/"
+
+    assert prefix_note(note, "") is note
+
+
+def test_write_and_read_shard__sorted_by_key(tmp_path: Path):
+    shard_path = tmp_path / "shards" / "api.jsonl"
+    notes = [make_note("todo", "zeta"), make_note("bug", "alpha"), make_note("todo", "beta")]
+
+    assert write_shard(shard_path, "api", notes, prefix="api") == 3
+
+    entries = list(read_shard(shard_path))
+    assert [entry.key for entry in entries] == ["bug:alpha", "todo:beta", "todo:zeta"]
+    assert {entry.shard for entry in entries} == {"api"}
+    assert entries[0].note.source_page == Path("api/index.md")
+
+
+def test_read_shard__rejects_other_files(tmp_path: Path):
+    path = tmp_path / "notes.json"
+    path.write_text("{}\n")
+
+    with pytest.raises(ValueError, match="is not a version 1 editor notes shard"):
+        list(read_shard(path))
+
+
+def test_merge_shards__k_way_merge_with_duplicates(tmp_path: Path):
+    write_shard(tmp_path / "a.jsonl", "a", [make_note("todo", "one", "from a"), make_note("todo", "three")])
+    write_shard(tmp_path / "b.jsonl", "b", [make_note("todo", "two"), make_note("todo", "one", "from b")])
+    write_shard(tmp_path / "c.jsonl", "c", [make_note("bug", "four"), make_note("todo", "one", "from c")])
+
+    result = merge_shards([tmp_path / "a.jsonl", tmp_path / "b.jsonl", tmp_path / "c.jsonl"])
+
+    assert [f"{n.note_type}:{n.label}" for n in result.notes] == ["bug:four", "todo:one", "todo:three", "todo:two"]
+    assert result.notes[1].text == "from a"
+    assert result.duplicates == {"todo:one": ["a", "b", "c"]}
+
+
+def test_merge_shards__no_shards():
+    result = merge_shards([])
+    assert result.notes == []
+    assert result.duplicates == {}
@@ -0,0 +1,133 @@
+import sqlite3
+from collections.abc import Generator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.store import MemoryNoteStore, NoteStore, SqliteNoteStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> Generator[NoteStore, None, None]:
+    if request.param == "memory":
+        yield MemoryNoteStore()
+    else:
+        sqlite_store = SqliteNoteStore(tmp_path / "cache" / "notes.db")
+        yield sqlite_store
+        sqlite_store.close()
+
+
+def make_notes() -> list[EditorNote]:
+    return [
+        EditorNote(note_type="todo", label="fix-bug", text="Fix it", source_page=Path("index.md"), line_number=3),
+        EditorNote(note_type="ponder", label="why", text="Why?", source_page=Path("guide/a.md"), source_url="guide/a/"),
+        EditorNote(note_type="todo", label="add-docs", text="Docs", source_page=Path("guide/a.md")),
+    ]
+
+
+def test_store__add_and_get(store: NoteStore):
+    for note in make_notes():
+        store.add(EditorNotesManager.key(note.note_type, note.label), note)
+
+    assert len(store) == 3
+    assert "todo:fix-bug" in store
+    assert "todo:missing" not in store
+    assert store.get("ponder:why") == make_notes()[1]
+    assert store.get("ponder:missing") is None
+
+
+def test_store__iteration_keeps_insertion_order(store: NoteStore):
+    for note in make_notes():
+        store.add(EditorNotesManager.key(note.note_type, note.label), note)
+
+    assert list(store) == make_notes()
+
+
+def test_store__queries_by_type_and_page(store: NoteStore):
+    for note in make_notes():
+        store.add(EditorNotesManager.key(note.note_type, note.label), note)
+
+    assert sorted(store.types()) == ["ponder", "todo"]
+    assert [n.label for n in store.by_type("todo")] == ["fix-bug", "add-docs"]
+    assert [n.label for n in store.by_page(Path("guide/a.md"))] == ["why", "add-docs"]
+    assert list(store.by_page(Path("nope.md"))) == []
+
+
+def test_store__update_persists_changes(store: NoteStore):
+    note = make_notes()[0]
+    store.add("todo:fix-bug", note)
+
+    note.line_number = 42
+    store.update("todo:fix-bug", note)
+
+    updated = store.get("todo:fix-bug")
+    assert updated is not None
+    assert updated.line_number == 42
+
+
+def test_store__maps(store: NoteStore):
+    for note in make_notes():
+        store.add(EditorNotesManager.key(note.note_type, note.label), note)
+
+    assert list(store.notes_map.keys()) == ["todo:fix-bug", "ponder:why", "todo:add-docs"]
+    assert store.type_map == {"todo": {"todo:fix-bug", "todo:add-docs"}, "ponder": {"ponder:why"}}
+
+
+def test_sqlite_store__persists_after_flush_and_resets_on_open(tmp_path: Path):
+    db_path = tmp_path / "notes.db"
+    store = SqliteNoteStore(db_path)
+    store.add("todo:fix-bug", make_notes()[0])
+    store.close()
+
+    with closing(sqlite3.connect(db_path)) as reader:
+        assert reader.execute("SELECT note_key FROM notes").fetchall() == [("todo:fix-bug",)]
+
+    fresh = SqliteNoteStore(db_path)
+    assert len(fresh) == 0
+    fresh.close()
+
+
+def test_manager__uses_given_store(tmp_path: Path):
+    manager = EditorNotesManager(SqliteNoteStore(tmp_path / "notes.db"))
+    for note in make_notes():
+        manager.add(note)
+
+    with pytest.raises(ValueError, match=r"Note with key 'todo:fix-bug' already exists"):
+        manager.add(make_notes()[0])
+
+    assert manager.get("todo", "add-docs") == make_notes()[2]
+    assert list(manager.types) == ["ponder", "todo"]
+    manager.store.close()
+
+
+def test_memory_store__queries_visit_only_matching_notes():
+    store = MemoryNoteStore()
+    for note in make_notes():
+        store.add(EditorNotesManager.key(note.note_type, note.label), note)
+    # A note left out of the indexes would show up in a full scan, but not in an indexed query
+    store.notes_map["ponder:hidden"] = EditorNote(note_type="ponder", label="hidden", text="", source_page=Path("x.md"))
+
+    assert [n.label for n in store.by_type("ponder")] == ["why"]
+    assert list(store.by_page(Path("x.md"))) == []
+    assert list(store.by_type("missing")) == []
+
+
+def test_sqlite_store__closed_when_the_build_fails(tmp_path: Path):
+    from unittest.mock import Mock
+
+    from mkdocs_editor_notes.plugin import EditorNotesPlugin
+
+    plugin = EditorNotesPlugin()
+    plugin.load_config(dict(note_store="sqlite", cache_dir=str(tmp_path / "cache")))
+    plugin.on_config(Mock(markdown_extensions=[], mdx_configs={}))
+    store = plugin.note_manager.store
+    assert isinstance(store, SqliteNoteStore)
+
+    plugin.on_build_error(error=RuntimeError("boom"))
+
+    assert store.closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.connection.execute("SELECT 1")
+    store.close()
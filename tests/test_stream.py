@@ -0,0 +1,147 @@
+import re
+import tracemalloc
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import snick
+from mkdocs_editor_notes.diagnostics import NoteLocation
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.stream import (
+    NoteDefinition,
+    iter_definitions,
+    iter_file_chunks,
+    iter_logical_lines,
+    iter_output_lines,
+    iter_text_chunks,
+)
+
+SAMPLE = snick.dedent(
+    """
+    # Title[^todo:title]
+
+    Intro paragraph[^ponder:intro] with a second ref[^todo:title].
+
+
+
+    ```python
+    # [^todo:not-a-ref] inside code
+
+    [^todo:not-a-def]: inside code
+    ```
+
+    - item[^improve:item]
+    1. numbered ~~~inline~~~ code[^todo:title]
+
+    [^todo:title]: Fix the title
+    [^ponder:intro]:
+
+        Spans a blank line
+    and continues
+    [^improve:item]: Item text with ```inline``` code
+    trailing text
+    """
+)
+
+
+@pytest.fixture
+def page() -> Mock:
+    page = Mock()
+    page.url = "sample/"
+    page.file.src_uri = "sample.md"
+    return page
+
+
+def replacer(match: re.Match[str]) -> str:
+    return f"<{match.group('type')}:{match.group('label')}>"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64, 1 << 20])
+def test_stream__matches_regex_pipeline(page: Mock, chunk_size: int):
+    regex_manager = EditorNotesManager()
+    streaming_manager = EditorNotesManager()
+
+    expected = regex_manager.process_page_markdown(SAMPLE, page, replacer)
+    actual = streaming_manager.process_page_markdown_streaming(SAMPLE, page, replacer, chunk_size=chunk_size)
+
+    assert actual == expected
+    assert [note.to_dict() for note in streaming_manager] == [note.to_dict() for note in regex_manager]
+    assert streaming_manager.diagnostics == regex_manager.diagnostics
+
+
+def test_stream__fences_split_across_chunks():
+    lines = list(iter_logical_lines(iter_text_chunks("a ``", 1)))
+    assert [line.text for line in lines] == ["a ``"]
+
+    lines = list(iter_logical_lines(iter_text_chunks("before\n```\ncode\n```after\nnext", 1)))
+
+    assert [line.text for line in lines] == ["before", "<<<CODE_BLOCK_0>>>after", "next"]
+    assert lines[1].code_blocks == ["```\ncode\n```"]
+    assert lines[1].restore() == "```\ncode\n```after"
+
+
+def test_stream__definitions_across_chunks():
+    markdown = "[^todo:one]: First line\nsecond line\n\n[^ponder:two]: Two\n[^todo:three]:\n\n\nThree\n"
+
+    definitions = list(iter_definitions(iter_text_chunks(markdown, 4)))
+
+    assert definitions == [
+        NoteDefinition(note_type="todo", label="one", text="First line\nsecond line", line_number=1),
+        NoteDefinition(note_type="ponder", label="two", text="Two", line_number=4),
+        NoteDefinition(note_type="todo", label="three", text="Three", line_number=5),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_stream__locates_notes_in_the_page_after_fences_and_definitions(page: Mock, chunk_size: int):
+    markdown = "# Title\n\n```python\none\ntwo\nthree\n```\n\n[^todo:a]: First\n\n\n\nSee[^todo:a] and[^todo:missing]\n"
+    manager = EditorNotesManager()
+
+    manager.process_page_markdown_streaming(markdown, page, "", chunk_size=chunk_size)
+
+    note = manager.get("todo", "a")
+    assert note is not None and note.line_number == 9
+    assert manager.diagnostics.definitions == {"todo:a": NoteLocation("sample.md", 9)}
+    assert manager.diagnostics.undefined == {"todo:missing": [NoteLocation("sample.md", 13)]}
+
+
+def test_stream__unclosed_fence_runs_to_end():
+    markdown = "text\n```\n[^todo:hidden]: not a definition\n"
+
+    assert list(iter_definitions(iter_text_chunks(markdown))) == []
+    assert "".join(line.restore() + "\n" for line in iter_output_lines(iter_text_chunks(markdown))) == markdown + "\n"
+
+
+def test_stream__file_chunks_decode_split_characters(tmp_path: Path):
+    path = tmp_path / "page.md"
+    path.write_text("[^todo:emoji]: Ünïcödé ✏️ text\n", encoding="utf-8")
+
+    assert "".join(iter_file_chunks(path, chunk_size=1)) == path.read_text(encoding="utf-8")
+    assert list(iter_definitions(iter_file_chunks(path, chunk_size=3))) == [
+        NoteDefinition(note_type="todo", label="emoji", text="Ünïcödé ✏️ text", line_number=1),
+    ]
+
+
+def test_stream__empty_file(tmp_path: Path):
+    path = tmp_path / "empty.md"
+    path.touch()
+
+    assert list(iter_file_chunks(path)) == []
+
+
+def test_stream__lower_peak_memory_than_regex_pipeline(page: Mock):
+    section = "Some paragraph text that mentions a note[^todo:big] once.\n\n```\ncode\n```\n\n"
+    markdown = section * 4_000 + "[^todo:big]: The big note\n"
+
+    peaks: list[int] = []
+    for process in (
+        EditorNotesManager().process_page_markdown,
+        EditorNotesManager().process_page_markdown_streaming,
+    ):
+        tracemalloc.start()
+        process(markdown, page, "")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    regex_peak, streaming_peak = peaks
+    assert streaming_peak < regex_peak / 2
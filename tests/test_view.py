@@ -0,0 +1,66 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from mkdocs_editor_notes.manager import EditorNotesManager
+from mkdocs_editor_notes.note import EditorNote
+from mkdocs_editor_notes.occurrences import NoteOccurrence
+from mkdocs_editor_notes.store import SqliteNoteStore
+from mkdocs_editor_notes.view import NoteIndexStats
+
+
+def collect(manager: EditorNotesManager) -> EditorNotesManager:
+    page = Mock()
+    page.url = "guide/"
+    page.file.src_uri = "guide.md"
+    manager.add(EditorNote(note_type="todo", label="a", text="First", source_page=Path("index.md")))
+    manager.add(EditorNote(note_type="todo", label="b", text="Second", source_page=Path("guide.md")))
+    manager.add(EditorNote(note_type="bug", label="c", text="Third", source_page=Path("index.md")))
+    manager.parse_note_references("See[^todo:a] and[^todo:a] but not[^todo:missing].", page)
+    return manager
+
+
+def test_view__maps_notes_by_key_type_and_page():
+    view = collect(EditorNotesManager()).index_view()
+
+    assert list(view.by_key) == ["todo:a", "todo:b", "bug:c"]
+    assert view.by_key["todo:b"].text == "Second"
+    assert set(view.by_type["todo"]) == {"todo:a", "todo:b"}
+    assert "bug:c" in view.by_type["bug"]
+    assert len(view.by_type) == 2
+    assert view.by_page == {"index.md": ("todo:a", "bug:c"), "guide.md": ("todo:b",)}
+    assert view.occurrences("todo:a") == [
+        NoteOccurrence("guide.md", "guide/", 1, 4),
+        NoteOccurrence("guide.md", "guide/", 1, 17),
+    ]
+    assert view.stats == NoteIndexStats(notes=3, types=2, pages=2, references=2, problems=1)
+
+
+def test_view__shares_the_memory_store_without_copying():
+    manager = collect(EditorNotesManager())
+    view = manager.index_view()
+
+    manager.add(EditorNote(note_type="todo", label="late", text="Late", source_page=Path("index.md")))
+
+    assert "todo:late" in view.by_key
+    assert "todo:late" in view.by_type["todo"]
+
+
+def test_view__is_read_only():
+    view = collect(EditorNotesManager()).index_view()
+
+    with pytest.raises(TypeError):
+        view.by_key["todo:z"] = EditorNote(note_type="todo", label="z", text="", source_page=Path("index.md"))  # type: ignore[index]  # pyright: ignore[reportIndexIssue]
+    with pytest.raises(TypeError):
+        view.by_page["index.md"] = ()  # type: ignore[index]  # pyright: ignore[reportIndexIssue]
+    assert not hasattr(view.by_type["todo"], "add")
+
+
+def test_view__reads_sqlite_store(tmp_path: Path):
+    manager = collect(EditorNotesManager(SqliteNoteStore(tmp_path / "notes.db")))
+    view = manager.index_view()
+
+    assert view.by_key["bug:c"].text == "Third"
+    assert set(view.by_type["todo"]) == {"todo:a", "todo:b"}
+    assert view.stats.notes == 3
+    manager.store.close()